@@ -26,10 +26,15 @@ import sys
 import sqlite3
 import re
 import math
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from collections import Counter, defaultdict
 import json
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from itertools import groupby
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -87,11 +92,19 @@ def analyze_timing_pattern(cursor, username):
         except (ValueError, TypeError):
             continue
 
-    if len(timestamps) < 5:
+    epochs = [(dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp() for dt in timestamps]
+    return timing_from_samples([dt.hour for dt in timestamps], epochs)
+
+
+def timing_from_samples(hours, epochs):
+    """
+    Timing pattern from activity hours and epoch seconds (same order,
+    sorted by time) of an actor's posts and comments.
+    """
+    if len(hours) < 5:
         return {'pattern': 'unknown', 'confidence': 0, 'details': {}}
 
     # Hour distribution
-    hours = [ts.hour for ts in timestamps]
     hour_counts = Counter(hours)
 
     # Night activity (2-6 AM)
@@ -113,8 +126,8 @@ def analyze_timing_pattern(cursor, username):
 
     # Inter-post intervals
     intervals = []
-    for i in range(1, len(timestamps)):
-        delta = (timestamps[i] - timestamps[i-1]).total_seconds()
+    for i in range(1, len(epochs)):
+        delta = epochs[i] - epochs[i-1]
         if delta > 0:
             intervals.append(delta)
 
@@ -160,28 +173,40 @@ def check_creation_burst(cursor, username):
     """, (username,))
 
     row = cursor.fetchone()
-    if not row or not row[0]:
-        return {'in_burst': False, 'burst_size': 0}
-
-    try:
-        if 'T' in row[0]:
-            created = datetime.fromisoformat(row[0].replace('Z', '+00:00'))
-        else:
-            created = datetime.strptime(row[0][:19], '%Y-%m-%d %H:%M:%S')
-    except (ValueError, TypeError):
+    created = parse_first_seen(row[0]) if row else None
+    if created is None:
         return {'in_burst': False, 'burst_size': 0}
 
     # Check how many accounts were created within 1 minute of this one
-    window_start = (created - timedelta(seconds=30)).isoformat()
-    window_end = (created + timedelta(seconds=30)).isoformat()
+    window_start, window_end = burst_window(created)
 
     cursor.execute("""
         SELECT COUNT(*) FROM actors
         WHERE first_seen BETWEEN ? AND ?
     """, (window_start, window_end))
 
-    burst_size = cursor.fetchone()[0]
+    return burst_result(created, cursor.fetchone()[0])
 
+
+def parse_first_seen(first_seen):
+    """actors.first_seen -> datetime (None if missing/unparseable)."""
+    if not first_seen:
+        return None
+    try:
+        if 'T' in first_seen:
+            return datetime.fromisoformat(first_seen.replace('Z', '+00:00'))
+        return datetime.strptime(first_seen[:19], '%Y-%m-%d %H:%M:%S')
+    except (ValueError, TypeError):
+        return None
+
+
+def burst_window(created):
+    """first_seen bounds (as stored strings compare) of the 1-minute window."""
+    return ((created - timedelta(seconds=30)).isoformat(),
+            (created + timedelta(seconds=30)).isoformat())
+
+
+def burst_result(created, burst_size):
     # If >5 accounts in 1 minute window, it's a burst
     return {
         'in_burst': burst_size > 5,
@@ -219,8 +244,11 @@ def analyze_content_authenticity(cursor, username):
         SELECT title || ' ' || COALESCE(content, '') FROM posts WHERE author = ?
     """, (username, username))
 
-    texts = [row[0] for row in cursor.fetchall() if row[0]]
+    return content_from_texts([row[0] for row in cursor.fetchall() if row[0]])
 
+
+def content_from_texts(texts):
+    """Content authenticity from an actor's texts (comments, then posts)."""
     if len(texts) < 3:
         return {'authenticity': 'unknown', 'confidence': 0, 'details': {}}
 
@@ -326,6 +354,11 @@ def analyze_network_role(cursor, username):
     cursor.execute("SELECT COUNT(*) FROM actors")
     total_actors = cursor.fetchone()[0] or 1
 
+    return network_from_counts(out_unique, out_total, in_unique, in_total, total_actors)
+
+
+def network_from_counts(out_unique, out_total, in_unique, in_total, total_actors):
+    """Network role from interaction counts."""
     # Connectivity ratio
     connectivity = (out_unique + in_unique) / (2 * total_actors) if total_actors > 0 else 0
 
@@ -480,53 +513,244 @@ def analyze_actor_v2(cursor, username):
     }
 
 
-def run_classification_v2(limit=1000):
-    """Run v2 classification for all actors."""
-    logger.info("=" * 60)
-    logger.info("ACTOR CLASSIFIER v2.0 - AI-Native")
-    logger.info("=" * 60)
+# ============================================================
+# BATCH RUNNER (preloaded slices + process pool)
+# ============================================================
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+CLASSIFY_CHUNK = 200        # actors per worker task
+CLASSIFY_MAX_PENDING = 32   # chunks in flight (bounds memory)
 
-    # Get actors with activity
+# Epoch seconds / UTC hour computed by SQLite, so workers never parse timestamps
+_EPOCH_SQL = "(julianday(created_at) - 2440587.5) * 86400.0"
+_HOUR_SQL = "CAST(strftime('%H', created_at) AS INTEGER)"
+
+
+def load_actor_network(cursor):
+    """{username: (out_unique, out_total, in_unique, in_total)} in two GROUP BYs."""
+    network = defaultdict(lambda: [0, 0, 0, 0])
     cursor.execute("""
-        SELECT username FROM actors
-        WHERE username IN (
+        SELECT author_from, COUNT(DISTINCT author_to), COUNT(*)
+        FROM interactions GROUP BY author_from
+    """)
+    for username, unique, total in cursor.fetchall():
+        network[username][0:2] = [unique or 0, total or 0]
+    cursor.execute("""
+        SELECT author_to, COUNT(DISTINCT author_from), COUNT(*)
+        FROM interactions GROUP BY author_to
+    """)
+    for username, unique, total in cursor.fetchall():
+        network[username][2:4] = [unique or 0, total or 0]
+    return network
+
+
+def load_creation_bursts(cursor, actors):
+    """Burst signal for every actor from one sorted list of first_seen values."""
+    cursor.execute("SELECT username, first_seen FROM actors")
+    rows = cursor.fetchall()
+    first_seen = sorted(fs for _, fs in rows if fs is not None)
+
+    bursts = {}
+    for username, fs in rows:
+        if username not in actors:
+            continue
+        created = parse_first_seen(fs)
+        if created is None:
+            bursts[username] = {'in_burst': False, 'burst_size': 0}
+            continue
+        # Same as BETWEEN on the stored strings
+        window_start, window_end = burst_window(created)
+        size = bisect_right(first_seen, window_end) - bisect_left(first_seen, window_start)
+        bursts[username] = burst_result(created, size)
+    return bursts
+
+
+def stream_actor_slices(conn, actors):
+    """
+    Yield (username, epochs, hours, texts) per actor in author order.
+
+    comments and posts are each read once via their author index and
+    merged; timestamps arrive as compact arrays (float epoch seconds,
+    UTC hour bytes) sorted by time, texts as comments then posts.
+    """
+    comment_cursor = conn.cursor()
+    comment_cursor.execute(f"""
+        SELECT author, 0, content, {_EPOCH_SQL}, {_HOUR_SQL}
+        FROM comments WHERE author IS NOT NULL ORDER BY author
+    """)
+    post_cursor = conn.cursor()
+    post_cursor.execute(f"""
+        SELECT author, 1, title || ' ' || COALESCE(content, ''), {_EPOCH_SQL}, {_HOUR_SQL}
+        FROM posts WHERE author IS NOT NULL ORDER BY author
+    """)
+
+    rows = heapq.merge(comment_cursor, post_cursor, key=lambda r: r[0])
+    for username, group in groupby(rows, key=lambda r: r[0]):
+        if username not in actors:
+            for _ in group:
+                pass
+            continue
+        texts, samples = [], []
+        for _, _, text, epoch, hour in group:
+            if text:
+                texts.append(text)
+            if epoch is not None:
+                samples.append((epoch, hour))
+        samples.sort(key=lambda s: s[0])
+        yield (username,
+               array('d', [s[0] for s in samples]),
+               bytes(s[1] for s in samples),
+               texts)
+
+
+def _classify_chunk(chunk):
+    """Worker: classify a list of (slice, burst, network) jobs (no DB access)."""
+    results = []
+    for (username, epochs, hours, texts), burst, network in chunk:
+        try:
+            timing = timing_from_samples(list(hours), epochs)
+            content = content_from_texts(texts)
+            classification = classify_actor_v2(timing, burst, content, network)
+            results.append({
+                'username': username,
+                'classification': classification['classification'],
+                'confidence': classification['confidence'],
+                'flags': classification['flags'],
+                'scores': classification['scores'],
+                'timing': timing,
+                'burst': burst,
+                'content': content,
+                'network': network
+            })
+        except Exception as e:
+            results.append({'username': username, 'error': str(e)})
+    return results
+
+
+def select_classification_actors(cursor, limit=None):
+    """Known actors with content, most comments first, optionally capped."""
+    cursor.execute("""
+        SELECT a.username, COALESCE(c.cnt, 0) FROM actors a
+        LEFT JOIN (SELECT author, COUNT(*) AS cnt FROM comments GROUP BY author) c
+               ON c.author = a.username
+        WHERE a.username IN (
             SELECT author FROM posts
             UNION
             SELECT author FROM comments
         )
-        ORDER BY (
-            SELECT COUNT(*) FROM comments WHERE author = username
-        ) DESC
-        LIMIT ?
-    """, (limit,))
+    """)
+    rows = sorted(cursor.fetchall(), key=lambda r: -r[1])
+    if limit:
+        rows = rows[:limit]
+    return [row[0] for row in rows]
+
+
+def run_batch_classification(conn, actors, workers=None):
+    """
+    Classify actors from preloaded slices across a process pool.
+
+    Network counts and burst windows are computed up front from whole-table
+    aggregates; per-actor timestamps and texts are streamed once and shipped
+    to workers in chunks. Returns results in the order of actors.
+    """
+    cursor = conn.cursor()
+    wanted = set(actors)
+
+    cursor.execute("SELECT COUNT(*) FROM actors")
+    total_actors = cursor.fetchone()[0] or 1
+    network_counts = load_actor_network(cursor)
+    bursts = load_creation_bursts(cursor, wanted)
+    logger.info(f"Preloaded network and burst signals for {len(wanted)} actors")
+
+    def chunks():
+        chunk = []
+        for actor_slice in stream_actor_slices(conn, wanted):
+            username = actor_slice[0]
+            network = network_from_counts(*network_counts.get(username, (0, 0, 0, 0)), total_actors)
+            burst = bursts.get(username, {'in_burst': False, 'burst_size': 0})
+            chunk.append((actor_slice, burst, network))
+            if len(chunk) >= CLASSIFY_CHUNK:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    by_username = {}
+
+    def collect(chunk_results):
+        for result in chunk_results:
+            if 'error' in result:
+                logger.error(f"Error analyzing {result['username']}: {result['error']}")
+            else:
+                by_username[result['username']] = result
+        logger.info(f"Progress: {len(by_username)}/{len(actors)}")
+
+    if workers == 1:
+        for chunk in chunks():
+            collect(_classify_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for chunk in chunks():
+                pending.add(executor.submit(_classify_chunk, chunk))
+                if len(pending) >= CLASSIFY_MAX_PENDING:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+            for future in as_completed(pending):
+                collect(future.result())
+
+    return [by_username[u] for u in actors if u in by_username]
+
+
+def save_actor_roles(cursor, results):
+    """Write v2 classifications to actor_roles in one batch."""
+    now = datetime.now().isoformat()
+    cursor.executemany("""
+        INSERT OR REPLACE INTO actor_roles
+        (username, primary_role, role_confidence, influence_score, last_updated, evidence)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [(
+        result['username'],
+        result['classification'],
+        result['confidence'],
+        result['network']['details'].get('connectivity', 0),
+        now,
+        json.dumps(result['flags'])
+    ) for result in results])
+
+
+def run_classification_v2(limit=None, batch=True, workers=None):
+    """
+    Run v2 classification for all actors.
 
-    actors = [row[0] for row in cursor.fetchall()]
+    Args:
+        limit: Max actors (most comments first); None/0 = every account
+        batch: Preload slices and classify across worker processes
+               (False = the per-actor query path)
+        workers: Worker processes for batch mode (default: CPU count, 1 = inline)
+    """
+    logger.info("=" * 60)
+    logger.info("ACTOR CLASSIFIER v2.0 - AI-Native")
+    logger.info("=" * 60)
+
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    # Get actors with activity
+    actors = select_classification_actors(cursor, limit or None)
     logger.info(f"Analyzing {len(actors)} actors...")
 
-    results = []
-    for i, username in enumerate(actors, 1):
-        if i % 20 == 0:
-            logger.info(f"Progress: {i}/{len(actors)}")
-
-        result = analyze_actor_v2(cursor, username)
-        results.append(result)
-
-        # Update actor_roles table with v2 classification
-        cursor.execute("""
-            INSERT OR REPLACE INTO actor_roles
-            (username, primary_role, role_confidence, influence_score, last_updated, evidence)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            username,
-            result['classification'],
-            result['confidence'],
-            result['network']['details'].get('connectivity', 0),
-            datetime.now().isoformat(),
-            json.dumps(result['flags'])
-        ))
+    if batch:
+        results = run_batch_classification(conn, actors, workers)
+    else:
+        results = []
+        for i, username in enumerate(actors, 1):
+            if i % 20 == 0:
+                logger.info(f"Progress: {i}/{len(actors)}")
+            results.append(analyze_actor_v2(cursor, username))
+
+    # Update actor_roles table with v2 classification
+    save_actor_roles(cursor, results)
 
     conn.commit()
     conn.close()
@@ -673,7 +897,9 @@ Unlike v1, this classifier treats AI-typical behaviors (regularity, consistency)
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
-    parser.add_argument("--limit", type=int, default=1000, help="Number of actors to analyze")
+    parser.add_argument("--limit", type=int, default=0, help="Number of actors to analyze (0 = all)")
+    parser.add_argument("--serial", action="store_true", help="Per-actor queries instead of batch mode")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for batch mode")
     args = parser.parse_args()
 
-    run_classification_v2(limit=args.limit)
+    run_classification_v2(limit=args.limit, batch=not args.serial, workers=args.workers)
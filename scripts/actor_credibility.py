@@ -17,20 +17,32 @@ F. Emergent trolls/LARP - mysticism, repetitive phrases
 3. Epistemic consistency - opinion changes, source references
 4. Support networks - mutual liking, citation cliques
 5. Attention economy - focus on tokens/governance/reputation
+
+A population run (run_credibility_analysis) loads the interaction graph
+once into adjacency maps (InteractionGraph) and reads every analyzed
+actor's content in one author-sorted stream, so each actor costs no
+queries of its own and the whole population can be scored.
 """
 
 import sys
+import json
 import sqlite3
 import re
 import math
 from datetime import datetime, timedelta
+from itertools import groupby
 from pathlib import Path
 from collections import Counter, defaultdict
+from typing import Dict, List, Optional
 from config import DB_PATH
+from feature_store import FeatureCache
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
+# Bump when get_stylometry_score output changes (invalidates cached actor_features)
+STYLOMETRY_SCORE_VERSION = 1
+
 
 # ============================================================
 # SIGNAL 1: STYLOMETRY
@@ -84,16 +96,26 @@ def calculate_phrase_repetition(texts):
     return repeated / len(set(all_ngrams)) if all_ngrams else 0
 
 
-def get_stylometry_score(cursor, username):
-    """Get stylometry-based credibility signals."""
+def get_stylometry_score(cursor, username, cache=None):
+    """Get stylometry-based credibility signals.
+
+    With a FeatureCache the scores are only recomputed when the actor
+    has new content.
+    """
+    if cache is not None:
+        return cache.get_or_compute(username, lambda: get_stylometry_score(cursor, username))
+
     cursor.execute("""
         SELECT content FROM comments WHERE author = ?
         UNION ALL
         SELECT title || ' ' || COALESCE(content, '') FROM posts WHERE author = ?
     """, (username, username))
 
-    texts = [row[0] for row in cursor.fetchall() if row[0]]
+    return stylometry_from_texts([row[0] for row in cursor.fetchall() if row[0]])
 
+
+def stylometry_from_texts(texts):
+    """Stylometry signals of an actor's texts (comments, then posts)."""
     if len(texts) < 3:
         return {'entropy': None, 'sentence_avg': None, 'repetition': None}
 
@@ -127,8 +149,11 @@ def get_activity_rhythm(cursor, username):
         SELECT created_at FROM posts WHERE author = ?
     """, (username, username))
 
-    timestamps = [row[0] for row in cursor.fetchall() if row[0]]
+    return rhythm_from_timestamps([row[0] for row in cursor.fetchall() if row[0]])
+
 
+def rhythm_from_timestamps(timestamps):
+    """Activity rhythm of an actor's timestamps (comments, then posts)."""
     if len(timestamps) < 5:
         return {'regularity': None, 'night_ratio': None, 'weekend_ratio': None}
 
@@ -190,8 +215,11 @@ def get_epistemic_score(cursor, username):
         SELECT content FROM comments WHERE author = ?
     """, (username,))
 
-    texts = [row[0] for row in cursor.fetchall() if row[0]]
+    return epistemic_from_texts([row[0] for row in cursor.fetchall() if row[0]])
+
 
+def epistemic_from_texts(texts):
+    """Epistemic signals of an actor's comments."""
     if len(texts) < 5:
         return {'opinion_markers': None, 'certainty_ratio': None, 'updates_beliefs': None}
 
@@ -219,8 +247,14 @@ def get_epistemic_score(cursor, username):
 # SIGNAL 4: SUPPORT NETWORKS (CLIQUES)
 # ============================================================
 
-def get_network_score(cursor, username):
-    """Analyze network behavior - sockpuppets support each other."""
+def get_network_score(cursor, username, graph=None):
+    """Analyze network behavior - sockpuppets support each other.
+
+    With a preloaded InteractionGraph no queries are run.
+    """
+    if graph is not None:
+        return graph.network_score(username)
+
     # Who does this actor interact with?
     cursor.execute("""
         SELECT author_to, COUNT(*) as cnt
@@ -246,9 +280,25 @@ def get_network_score(cursor, username):
     if not outgoing and not incoming:
         return {'reciprocity': None, 'concentration': None, 'clique_score': None}
 
+    # Clique detection - do actor's targets also support each other?
+    internal_edges = 0
+    targets = list(outgoing.keys())[:10]
+    if len(outgoing) >= 3:
+        cursor.execute("""
+            SELECT COUNT(*) FROM interactions
+            WHERE author_from IN ({}) AND author_to IN ({})
+        """.format(','.join('?' * len(targets)), ','.join('?' * len(targets))),
+        targets + targets)
+        internal_edges = cursor.fetchone()[0]
+
+    return _network_signals(outgoing, set(incoming), targets, internal_edges)
+
+
+def _network_signals(outgoing, incoming, targets, internal_edges):
+    """Network signals from out-counts (most frequent first), in-neighbours and the clique count."""
     # Reciprocity - how many mutual connections?
-    mutual = set(outgoing.keys()) & set(incoming.keys())
-    reciprocity = len(mutual) / len(set(outgoing.keys()) | set(incoming.keys())) if outgoing or incoming else 0
+    mutual = set(outgoing.keys()) & incoming
+    reciprocity = len(mutual) / len(set(outgoing.keys()) | incoming) if outgoing or incoming else 0
 
     # Concentration - does actor focus on few targets? (sockpuppet signal)
     if outgoing:
@@ -258,16 +308,9 @@ def get_network_score(cursor, username):
     else:
         concentration = 0
 
-    # Clique detection - do actor's targets also support each other?
+    # Clique score - share of possible edges among the top targets
     clique_score = 0
     if len(outgoing) >= 3:
-        targets = list(outgoing.keys())[:10]
-        cursor.execute("""
-            SELECT COUNT(*) FROM interactions
-            WHERE author_from IN ({}) AND author_to IN ({})
-        """.format(','.join('?' * len(targets)), ','.join('?' * len(targets))),
-        targets + targets)
-        internal_edges = cursor.fetchone()[0]
         max_edges = len(targets) * (len(targets) - 1)
         clique_score = internal_edges / max_edges if max_edges > 0 else 0
 
@@ -278,6 +321,46 @@ def get_network_score(cursor, username):
     }
 
 
+class InteractionGraph:
+    """The interaction graph as in-memory adjacency, loaded with one GROUP BY."""
+
+    def __init__(self, cursor):
+        # actor -> {target: interactions}, most frequent target first
+        self.outgoing: Dict[str, Dict[str, int]] = defaultdict(dict)
+        # actor -> actors who interacted with them
+        self.incoming: Dict[str, set] = defaultdict(set)
+
+        cursor.execute("""
+            SELECT author_from, author_to, COUNT(*) as cnt
+            FROM interactions
+            WHERE author_from IS NOT NULL AND author_to IS NOT NULL
+            GROUP BY author_from, author_to
+            ORDER BY author_from, cnt DESC, author_to DESC
+        """)
+        for author_from, author_to, cnt in cursor.fetchall():
+            self.outgoing[author_from][author_to] = cnt
+            self.incoming[author_to].add(author_from)
+
+    def network_score(self, username):
+        """get_network_score() for one actor, computed from the adjacency maps."""
+        outgoing = self.outgoing.get(username, {})
+        incoming = self.incoming.get(username, set())
+
+        if not outgoing and not incoming:
+            return {'reciprocity': None, 'concentration': None, 'clique_score': None}
+
+        targets = list(outgoing.keys())[:10]
+        internal_edges = 0
+        if len(outgoing) >= 3:
+            # Interactions among the top targets (self-interactions included)
+            for source in targets:
+                edges = self.outgoing.get(source)
+                if edges:
+                    internal_edges += sum(edges.get(target, 0) for target in targets)
+
+        return _network_signals(outgoing, incoming, targets, internal_edges)
+
+
 # ============================================================
 # SIGNAL 5: ATTENTION ECONOMY
 # ============================================================
@@ -304,8 +387,11 @@ def get_economic_score(cursor, username):
         SELECT title || ' ' || COALESCE(content, '') FROM posts WHERE author = ?
     """, (username, username))
 
-    texts = [row[0] for row in cursor.fetchall() if row[0]]
+    return economic_from_texts([row[0] for row in cursor.fetchall() if row[0]])
+
 
+def economic_from_texts(texts):
+    """Economic / platform-praise focus of an actor's texts (comments, then posts)."""
     if not texts:
         return {'economic_focus': None, 'platform_praise': None}
 
@@ -402,14 +488,18 @@ def classify_actor_type(flags, network, economic):
 # MAIN ANALYSIS
 # ============================================================
 
-def analyze_actor(cursor, username):
+def analyze_actor(cursor, username, stylometry_cache=None, graph=None):
     """Run full credibility analysis for one actor."""
-    stylometry = get_stylometry_score(cursor, username)
+    stylometry = get_stylometry_score(cursor, username, stylometry_cache)
     rhythm = get_activity_rhythm(cursor, username)
     epistemic = get_epistemic_score(cursor, username)
-    network = get_network_score(cursor, username)
+    network = get_network_score(cursor, username, graph)
     economic = get_economic_score(cursor, username)
 
+    return _credibility_result(username, stylometry, rhythm, epistemic, network, economic)
+
+
+def _credibility_result(username, stylometry, rhythm, epistemic, network, economic):
     score, flags = calculate_credibility_score(stylometry, rhythm, epistemic, network, economic)
     actor_type = classify_actor_type(flags, network, economic)
 
@@ -426,8 +516,69 @@ def analyze_actor(cursor, username):
     }
 
 
-def run_credibility_analysis(limit=50):
-    """Run credibility analysis for top actors."""
+def analyze_actors(cursor, usernames: List[str], stylometry_cache=None,
+                   graph: Optional[InteractionGraph] = None) -> List[dict]:
+    """
+    analyze_actor() for many actors from one content stream.
+
+    Comments and posts of all actors are read once, sorted by author
+    (comments before posts, each in rowid order as the per-actor queries
+    return them); the network signal comes from the preloaded graph.
+    Results are in input order.
+    """
+    if graph is None:
+        graph = InteractionGraph(cursor)
+
+    wanted = json.dumps(list(usernames))
+    reader = cursor.connection.cursor()
+    reader.execute("""
+        SELECT author, 0 AS source, rowid, content, created_at FROM comments
+        WHERE author IN (SELECT value FROM json_each(?))
+        UNION ALL
+        SELECT author, 1, rowid, title || ' ' || COALESCE(content, ''), created_at FROM posts
+        WHERE author IN (SELECT value FROM json_each(?))
+        ORDER BY 1, 2, 3
+    """, (wanted, wanted))
+
+    def rows():
+        while True:
+            batch = reader.fetchmany(5000)
+            if not batch:
+                return
+            yield from batch
+
+    def analyze(username, items):
+        texts = [text for _, _, _, text, _ in items if text]
+        comment_texts = [text for _, source, _, text, _ in items if source == 0 and text]
+        timestamps = [ts for _, _, _, _, ts in items if ts]
+
+        if stylometry_cache is not None:
+            stylometry = stylometry_cache.get_or_compute(
+                username, lambda: stylometry_from_texts(texts))
+        else:
+            stylometry = stylometry_from_texts(texts)
+
+        return _credibility_result(
+            username,
+            stylometry,
+            rhythm_from_timestamps(timestamps),
+            epistemic_from_texts(comment_texts),
+            graph.network_score(username),
+            economic_from_texts(texts),
+        )
+
+    by_actor = {author: analyze(author, list(group))
+                for author, group in groupby(rows(), key=lambda row: row[0])}
+
+    results = []
+    for username in usernames:
+        result = by_actor.get(username)
+        results.append(result if result is not None else analyze(username, []))
+    return results
+
+
+def run_credibility_analysis(limit=None):
+    """Run credibility analysis for all actors with 5+ comments (optionally only the top `limit`)."""
     print("=" * 60)
     print("  ACTOR CREDIBILITY SCORE")
     print("=" * 60)
@@ -435,39 +586,39 @@ def run_credibility_analysis(limit=50):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    # Get top actors by activity
+    # Actors by activity
     cursor.execute("""
-        SELECT username FROM actors
-        WHERE username IN (
-            SELECT author FROM comments GROUP BY author HAVING COUNT(*) >= 5
-        )
-        ORDER BY (SELECT COUNT(*) FROM comments WHERE author = username) DESC
+        SELECT a.username FROM actors a
+        JOIN (
+            SELECT author, COUNT(*) AS n FROM comments GROUP BY author HAVING COUNT(*) >= 5
+        ) c ON c.author = a.username
+        ORDER BY c.n DESC
         LIMIT ?
-    """, (limit,))
+    """, (limit if limit is not None else -1,))
 
     actors = [row[0] for row in cursor.fetchall()]
     print(f"\n>> Analyzing {len(actors)} actors...")
 
-    results = []
-    for i, username in enumerate(actors, 1):
-        if i % 10 == 0:
-            print(f"   Progress: {i}/{len(actors)}")
-        result = analyze_actor(cursor, username)
-        results.append(result)
-
-        # Save to actor_roles table
-        cursor.execute("""
-            INSERT OR REPLACE INTO actor_roles
-            (username, primary_role, role_confidence, influence_score, last_updated, evidence)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            username,
-            result['actor_type'],
-            result['credibility_score'] / 100,
-            result['network'].get('reciprocity', 0),
-            datetime.now().isoformat(),
-            str(result['flags'])
-        ))
+    stylometry_cache = FeatureCache(cursor, "credibility_stylometry", STYLOMETRY_SCORE_VERSION)
+    stylometry_cache.preload(actors)
+
+    graph = InteractionGraph(cursor)
+    results = analyze_actors(cursor, actors, stylometry_cache, graph)
+
+    # Save to actor_roles table
+    now = datetime.now().isoformat()
+    cursor.executemany("""
+        INSERT OR REPLACE INTO actor_roles
+        (username, primary_role, role_confidence, influence_score, last_updated, evidence)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [(
+        result['username'],
+        result['actor_type'],
+        result['credibility_score'] / 100,
+        result['network'].get('reciprocity', 0),
+        now,
+        str(result['flags'])
+    ) for result in results])
 
     conn.commit()
 
@@ -502,7 +653,8 @@ def run_credibility_analysis(limit=50):
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
-    parser.add_argument("--limit", type=int, default=50, help="Number of actors to analyze")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Only the N most active actors (default: all with 5+ comments)")
     args = parser.parse_args()
 
     run_credibility_analysis(limit=args.limit)
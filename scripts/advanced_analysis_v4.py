@@ -3,8 +3,8 @@
 Advanced Analysis v4.0 - Account Segmentation System
 =====================================================
 New detection methods for Moltbook Observatory:
-1. Graph Centrality - PageRank, betweenness, clustering coefficient
-2. Isolation Forest - Unsupervised anomaly detection
+1. Graph Centrality - PageRank, betweenness, clustering coefficient (sparse CSR)
+2. Isolation Forest - Unsupervised anomaly detection (persisted model)
 3. Lexical Entropy - Vocabulary diversity metrics
 4. Burst Detection - Coordinated activity detection
 
@@ -14,6 +14,7 @@ Usage:
     python advanced_analysis_v4.py --anomaly      # Only anomaly detection
     python advanced_analysis_v4.py --lexical      # Only lexical analysis
     python advanced_analysis_v4.py --burst        # Only burst detection
+    python advanced_analysis_v4.py --burst --since 2026-02-01T00:00:00  # Incremental bursts
 """
 
 import sys
@@ -21,7 +22,7 @@ import sqlite3
 import json
 import math
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 from collections import Counter, defaultdict
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
@@ -32,6 +33,10 @@ if sys.platform == 'win32':
 
 sys.path.insert(0, str(Path(__file__).parent))
 from config import DB_PATH, REPORTS_DIR, TODAY, PROJECT_ROOT
+from utils import from_epoch
+from burst_engine import load_bursts, DEFAULT_WINDOW_SECONDS, DEFAULT_MIN_BURST_SIZE
+from graph_engine import refresh_graph_state, SCIPY_AVAILABLE
+from anomaly_engine import build_feature_matrix, refresh_anomaly_scores, SKLEARN_AVAILABLE
 
 # Optional imports with fallback
 try:
@@ -39,15 +44,10 @@ try:
     NETWORKX_AVAILABLE = True
 except ImportError:
     NETWORKX_AVAILABLE = False
-    print("WARNING: networkx not available. Install with: pip install networkx")
+    if not SCIPY_AVAILABLE:
+        print("WARNING: scipy/networkx not available. Install with: pip install scipy numpy")
 
-try:
-    from sklearn.ensemble import IsolationForest
-    from sklearn.preprocessing import StandardScaler
-    import numpy as np
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+if not SKLEARN_AVAILABLE:
     print("WARNING: sklearn not available. Install with: pip install scikit-learn numpy")
 
 
@@ -115,7 +115,21 @@ def build_interaction_graph(cursor) -> Optional['nx.DiGraph']:
 
 
 def compute_graph_centrality(cursor) -> Dict[str, Dict[str, float]]:
-    """Compute PageRank, betweenness, and clustering coefficient."""
+    """Compute PageRank, betweenness, and clustering coefficient.
+
+    Uses graph_engine's persisted state when scipy is installed (the new
+    interactions are applied to it, a full rebuild only when due); the
+    networkx path below is kept as a fallback.
+    """
+    if SCIPY_AVAILABLE:
+        state = refresh_graph_state(cursor)
+        if state.graph.num_nodes < 10:
+            print(f"  [SKIP] Graph too small: {state.graph.num_nodes} nodes")
+            return {}
+        results = state.scores()
+        print(f"  Computed centrality for {len(results)} accounts")
+        return results
+
     if not NETWORKX_AVAILABLE:
         print("  [SKIP] networkx not available")
         return {}
@@ -202,165 +216,18 @@ def compute_graph_centrality(cursor) -> Dict[str, Dict[str, float]]:
 # =============================================================================
 
 def extract_features_for_anomaly(cursor) -> Tuple[List[str], List[List[float]]]:
-    """Extract feature vectors for all accounts."""
-
-    # Get all accounts with activity
-    cursor.execute("""
-        SELECT DISTINCT author FROM (
-            SELECT author FROM posts WHERE author IS NOT NULL
-            UNION
-            SELECT author FROM comments WHERE author IS NOT NULL
-        )
-    """)
-    all_authors = [r[0] for r in cursor.fetchall()]
-
-    usernames = []
-    features = []
-
-    for author in all_authors:
-        # Get timing metrics
-        cursor.execute("""
-            SELECT c.created_at, p.created_at
-            FROM comments c
-            JOIN posts p ON c.post_id = p.id
-            WHERE c.author = ? AND p.author != ?
-            AND c.created_at IS NOT NULL AND p.created_at IS NOT NULL
-        """, (author, author))
-
-        response_times = []
-        for c_created, p_created in cursor.fetchall():
-            try:
-                c_time = datetime.fromisoformat(c_created.replace('Z', '+00:00').replace('+00:00', ''))
-                p_time = datetime.fromisoformat(p_created.replace('Z', '+00:00').replace('+00:00', ''))
-                diff = (c_time - p_time).total_seconds()
-                if 0 < diff < 86400:
-                    response_times.append(diff)
-            except:
-                pass
-
-        # Get content for lexical features
-        cursor.execute("""
-            SELECT content FROM comments WHERE author = ?
-            UNION ALL
-            SELECT content FROM posts WHERE author = ?
-        """, (author, author))
-        texts = [r[0] for r in cursor.fetchall() if r[0]]
-
-        # Get activity hours
-        cursor.execute("""
-            SELECT created_at FROM posts WHERE author = ? AND created_at IS NOT NULL
-            UNION ALL
-            SELECT created_at FROM comments WHERE author = ? AND created_at IS NOT NULL
-        """, (author, author))
-
-        hours = []
-        for (created,) in cursor.fetchall():
-            try:
-                dt = datetime.fromisoformat(created.replace('Z', '+00:00').replace('+00:00', ''))
-                hours.append(dt.hour)
-            except:
-                pass
-
-        # Skip if insufficient data
-        if len(response_times) < 2 or len(texts) < 2:
-            continue
-
-        # Feature extraction
-        avg_response = sum(response_times) / len(response_times)
-        min_response = min(response_times)
-        response_variance = sum((t - avg_response)**2 for t in response_times) / len(response_times)
-        response_std = response_variance ** 0.5
-
-        # Lexical features
-        all_words = []
-        for text in texts:
-            all_words.extend(re.findall(r'\b\w+\b', text.lower()))
-
-        vocab_richness = len(set(all_words)) / len(all_words) if all_words else 0
-
-        # Activity uniformity
-        hour_counts = Counter(hours)
-        hour_entropy = 0
-        for h in range(24):
-            p = hour_counts.get(h, 0) / len(hours) if hours else 0
-            if p > 0:
-                hour_entropy -= p * math.log2(p)
-        hour_uniformity = hour_entropy / math.log2(24) if hours else 0
-
-        # Night activity ratio
-        night_activity = sum(hour_counts.get(h, 0) for h in range(0, 7))
-        night_ratio = night_activity / len(hours) if hours else 0
-
-        # Feature vector
-        feature_vec = [
-            avg_response,
-            min_response,
-            response_std,
-            vocab_richness,
-            hour_uniformity,
-            night_ratio,
-            len(texts),  # activity level
-            len(response_times),  # interaction level
-        ]
-
-        usernames.append(author)
-        features.append(feature_vec)
-
-    return usernames, features
+    """Extract feature vectors for all accounts (aggregate queries, see anomaly_engine)."""
+    return build_feature_matrix(cursor)
 
 
 def run_isolation_forest(cursor) -> Dict[str, Dict[str, float]]:
-    """Run Isolation Forest anomaly detection."""
-    if not SKLEARN_AVAILABLE:
-        print("  [SKIP] sklearn not available")
-        return {}
-
-    print("  Extracting features...")
-    usernames, features = extract_features_for_anomaly(cursor)
-
-    if len(features) < 50:
-        print(f"  [SKIP] Too few samples: {len(features)}")
-        return {}
-
-    print(f"  Running Isolation Forest on {len(features)} accounts...")
-
-    # Normalize features
-    X = np.array(features)
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-
-    # Run Isolation Forest
-    iso_forest = IsolationForest(
-        n_estimators=100,
-        contamination=0.1,  # Expect ~10% anomalies
-        random_state=42,
-        n_jobs=-1
-    )
-
-    predictions = iso_forest.fit_predict(X_scaled)
-    scores = iso_forest.decision_function(X_scaled)
-
-    # Normalize scores to 0-1 range (higher = more anomalous)
-    min_score = scores.min()
-    max_score = scores.max()
-    normalized_scores = (max_score - scores) / (max_score - min_score) if max_score != min_score else np.zeros_like(scores)
-
-    results = {}
-    anomaly_count = 0
+    """
+    Isolation Forest anomaly scores.
 
-    for i, username in enumerate(usernames):
-        is_anomaly = predictions[i] == -1
-        if is_anomaly:
-            anomaly_count += 1
-
-        results[username] = {
-            'anomaly_score': round(float(normalized_scores[i]), 4),
-            'is_anomaly': is_anomaly,
-            'raw_score': round(float(scores[i]), 4),
-        }
-
-    print(f"  Found {anomaly_count} anomalies ({anomaly_count/len(usernames)*100:.1f}%)")
-    return results
+    The model is refit when the saved one is older than a day; otherwise
+    only accounts with new content are scored against it.
+    """
+    return refresh_anomaly_scores(cursor.connection)
 
 
 # =============================================================================
@@ -452,97 +319,36 @@ def compute_lexical_metrics(cursor) -> Dict[str, Dict[str, float]]:
 # =============================================================================
 
 def detect_bursts(cursor,
-                  time_window_seconds: int = 60,
-                  min_burst_size: int = 5) -> Dict[str, Dict]:
-    """Detect coordinated bursts of activity."""
+                  time_window_seconds: int = DEFAULT_WINDOW_SECONDS,
+                  min_burst_size: int = DEFAULT_MIN_BURST_SIZE,
+                  since: Optional[str] = None) -> Tuple[Dict[str, Dict], Dict]:
+    """Detect coordinated bursts of activity (see burst_engine)."""
     print(f"  Detecting bursts (window={time_window_seconds}s, min_size={min_burst_size})...")
 
-    # Get all comments with timestamps
-    cursor.execute("""
-        SELECT id, author, post_id, created_at
-        FROM comments
-        WHERE created_at IS NOT NULL
-        ORDER BY created_at
-    """)
-
-    all_comments = []
-    for row in cursor.fetchall():
-        try:
-            dt = datetime.fromisoformat(row[3].replace('Z', '+00:00').replace('+00:00', ''))
-            all_comments.append({
-                'id': row[0],
-                'author': row[1],
-                'post_id': row[2],
-                'timestamp': dt
-            })
-        except:
-            pass
-
-    if len(all_comments) < 100:
-        print(f"  [SKIP] Too few comments: {len(all_comments)}")
-        return {}
-
-    print(f"  Analyzing {len(all_comments)} comments...")
-
-    # Find bursts (N accounts responding to same post within time window)
-    bursts = []
-    post_comments = defaultdict(list)
-
-    for comment in all_comments:
-        post_comments[comment['post_id']].append(comment)
-
-    for post_id, comments in post_comments.items():
-        if len(comments) < min_burst_size:
-            continue
+    # Find bursts (N accounts responding to same post within time window).
+    # Two-pointer window per post, overlapping windows merged into one interval.
+    unique_bursts, comment_count = load_bursts(
+        cursor, since=since,
+        window_seconds=time_window_seconds,
+        min_burst_size=min_burst_size,
+    )
 
-        # Sort by timestamp
-        comments.sort(key=lambda x: x['timestamp'])
-
-        # Sliding window burst detection
-        for i, start_comment in enumerate(comments):
-            window_end = start_comment['timestamp'] + timedelta(seconds=time_window_seconds)
-
-            # Count comments in window
-            window_comments = [c for c in comments[i:] if c['timestamp'] <= window_end]
-
-            if len(window_comments) >= min_burst_size:
-                # Count unique authors
-                unique_authors = set(c['author'] for c in window_comments)
-
-                if len(unique_authors) >= min_burst_size * 0.5:  # At least 50% unique
-                    bursts.append({
-                        'post_id': post_id,
-                        'start_time': start_comment['timestamp'],
-                        'window_seconds': time_window_seconds,
-                        'comment_count': len(window_comments),
-                        'unique_authors': len(unique_authors),
-                        'authors': list(unique_authors)
-                    })
-
-    # Deduplicate overlapping bursts
-    unique_bursts = []
-    for burst in bursts:
-        # Check if this burst overlaps with existing
-        is_duplicate = False
-        for existing in unique_bursts:
-            if (burst['post_id'] == existing['post_id'] and
-                abs((burst['start_time'] - existing['start_time']).total_seconds()) < time_window_seconds):
-                is_duplicate = True
-                break
-        if not is_duplicate:
-            unique_bursts.append(burst)
+    if comment_count < 100 and not since:
+        print(f"  [SKIP] Too few comments: {comment_count}")
+        return {}, {'total_bursts': 0, 'top_bursts': []}
 
+    print(f"  Analyzed {comment_count} comments")
     print(f"  Found {len(unique_bursts)} burst events")
 
     # Compute per-account burst participation
     account_bursts = defaultdict(list)
     for burst in unique_bursts:
-        for author in burst['authors']:
+        for author in burst.authors:
             account_bursts[author].append(burst)
 
     results = {}
     for author, author_bursts in account_bursts.items():
-        max_burst = max(b['comment_count'] for b in author_bursts) if author_bursts else 0
+        max_burst = max(b.comment_count for b in author_bursts) if author_bursts else 0
 
         # Burst score: higher = more suspicious coordinated activity
         burst_score = min(1.0, len(author_bursts) * 0.1 + max_burst * 0.02)
@@ -553,9 +359,9 @@ def detect_bursts(cursor,
             'burst_score': round(burst_score, 4),
             'burst_details': [
                 {
-                    'post_id': b['post_id'],
-                    'time': b['start_time'].isoformat(),
-                    'size': b['comment_count']
+                    'post_id': b.post_id,
+                    'time': from_epoch(b.start_ts),
+                    'size': b.comment_count
                 }
                 for b in author_bursts[:5]  # Top 5
             ]
@@ -566,12 +372,13 @@ def detect_bursts(cursor,
         'total_bursts': len(unique_bursts),
         'top_bursts': [
             {
-                'post_id': b['post_id'],
-                'time': b['start_time'].isoformat(),
-                'size': b['comment_count'],
-                'authors': b['unique_authors']
+                'post_id': b.post_id,
+                'time': from_epoch(b.start_ts),
+                'duration_seconds': b.end_ts - b.start_ts,
+                'size': b.comment_count,
+                'authors': b.unique_authors
             }
-            for b in sorted(unique_bursts, key=lambda x: x['comment_count'], reverse=True)[:20]
+            for b in sorted(unique_bursts, key=lambda x: x.comment_count, reverse=True)[:20]
         ]
     }
 
@@ -765,11 +572,8 @@ def run_full_v4_analysis():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    # Add new columns if they don't exist
-    try:
-        cursor.execute("ALTER TABLE actors ADD COLUMN network_score REAL DEFAULT 0")
-    except:
-        pass
+    # Add new columns if they don't exist. network_score is written by
+    # graph_engine only (daily_update step 2.6).
     try:
         cursor.execute("ALTER TABLE actors ADD COLUMN anomaly_score REAL DEFAULT 0")
     except:
@@ -786,13 +590,11 @@ def run_full_v4_analysis():
     for username, data in combined_results.items():
         cursor.execute("""
             UPDATE actors SET
-                network_score = ?,
                 anomaly_score = ?,
                 lexical_score = ?,
                 burst_score = ?
             WHERE username = ?
         """, (
-            data['network_score'],
             data['anomaly_score'],
             data['lexical_score'],
             data['burst_score'],
@@ -819,6 +621,7 @@ if __name__ == "__main__":
     parser.add_argument("--anomaly", action="store_true", help="Only anomaly detection")
     parser.add_argument("--lexical", action="store_true", help="Only lexical analysis")
     parser.add_argument("--burst", action="store_true", help="Only burst detection")
+    parser.add_argument("--since", help="Burst detection only on posts with comments scraped after this timestamp")
 
     args = parser.parse_args()
 
@@ -845,7 +648,7 @@ if __name__ == "__main__":
             print(f"\nLexical results: {len(results)} accounts")
 
         if args.burst:
-            results, global_bursts = detect_bursts(cursor)
+            results, global_bursts = detect_bursts(cursor, since=args.since)
             print(f"\nBurst results: {len(results)} accounts involved in bursts")
 
         conn.close()
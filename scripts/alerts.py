@@ -12,6 +12,7 @@ if sys.platform == 'win32':
 
 # Import centralized config
 from config import DB_PATH
+from content_scan import ContentAnalyzer, ContentRow, scan_content
 
 # Alert thresholds
 THRESHOLDS = {
@@ -22,9 +23,42 @@ THRESHOLDS = {
     "negative_votes": -5,         # Posts with negative votes
 }
 
+SECURITY_KEYWORDS = ["attack", "vulnerability", "security", "exploit", "risk", "danger", "hack"]
 
-def detect_alerts(conn) -> list:
-    """Detect all alerts from current data."""
+
+class SecurityTopicAnalyzer(ContentAnalyzer):
+    """Content-scan visitor: one SECURITY_TOPIC alert per post mentioning a security keyword."""
+    name = "security_topics"
+    kinds = ("post",)
+
+    def __init__(self):
+        self.alerts = []
+
+    def visit(self, row: ContentRow):
+        text = ((row.title or '') + ' ' + (row.content or '')).lower()
+        for keyword in SECURITY_KEYWORDS:
+            if keyword in text:
+                self.alerts.append({
+                    "type": "SECURITY_TOPIC",
+                    "severity": "MEDIUM",
+                    "title": row.title[:50] if row.title else "Unknown",
+                    "author": row.author,
+                    "metric": f"keyword: {keyword}",
+                    "details": f"m/{row.submolt}"
+                })
+                break  # Only one alert per post
+
+    def finish(self) -> list:
+        return self.alerts
+
+
+def detect_alerts(conn, security_alerts: list = None) -> list:
+    """
+    Detect all alerts from current data.
+
+    security_alerts: SecurityTopicAnalyzer result from a shared content
+    scan; when omitted the posts are scanned here.
+    """
     cursor = conn.cursor()
     alerts = []
 
@@ -106,22 +140,9 @@ def detect_alerts(conn) -> list:
         })
 
     # 5. SECURITY-RELATED POSTS
-    security_keywords = ["attack", "vulnerability", "security", "exploit", "risk", "danger", "hack"]
-    cursor.execute("SELECT id, title, author, content, submolt FROM posts")
-
-    for row in cursor.fetchall():
-        text = ((row[1] or '') + ' ' + (row[3] or '')).lower()
-        for keyword in security_keywords:
-            if keyword in text:
-                alerts.append({
-                    "type": "SECURITY_TOPIC",
-                    "severity": "MEDIUM",
-                    "title": row[1][:50] if row[1] else "Unknown",
-                    "author": row[2],
-                    "metric": f"keyword: {keyword}",
-                    "details": f"m/{row[4]}"
-                })
-                break  # Only one alert per post
+    if security_alerts is None:
+        security_alerts = scan_content(conn, [SecurityTopicAnalyzer()])[SecurityTopicAnalyzer.name]
+    alerts.extend(security_alerts)
 
     return alerts
 
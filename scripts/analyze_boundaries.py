@@ -11,6 +11,8 @@ from datetime import datetime
 from pathlib import Path
 from collections import Counter, defaultdict
 from config import DB_PATH
+from content_scan import ContentAnalyzer, ContentRow, scan_content
+from pattern_bank import PatternBank
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -72,47 +74,55 @@ BOUNDARY_MARKERS = {
 }
 
 
-def analyze_content(cursor):
-    """Analyze all content for boundary markers."""
-    print(">> Loading content...")
+BOUNDARY_BANK = PatternBank(BOUNDARY_MARKERS, flags=re.IGNORECASE)
 
-    cursor.execute("""
-        SELECT 'post' as type, id, author, title || ' ' || COALESCE(content, '') as text, created_at
-        FROM posts
-        UNION ALL
-        SELECT 'comment' as type, id, author, content as text, created_at
-        FROM comments
-        WHERE content IS NOT NULL
-    """)
 
-    rows = cursor.fetchall()
-    print(f"   Analyzing {len(rows)} pieces of content...")
+class BoundaryAnalyzer(ContentAnalyzer):
+    """Content-scan visitor: boundary markers in posts and comments."""
+    name = "boundaries"
+    kinds = ("post", "comment")
 
-    results = {cat: [] for cat in BOUNDARY_MARKERS}
-    author_markers = defaultdict(lambda: defaultdict(int))
+    def __init__(self):
+        self.results = {cat: [] for cat in BOUNDARY_MARKERS}
+        self.author_markers = defaultdict(lambda: defaultdict(int))
+        self.analyzed = 0
 
-    for source_type, source_id, author, text, timestamp in rows:
+    def visit(self, row: ContentRow):
+        if row.kind == 'post':
+            # title || ' ' || content is NULL for untitled posts
+            text = f"{row.title} {row.content or ''}" if row.title is not None else None
+        else:
+            text = row.content
         if not text:
-            continue
+            return
+        self.analyzed += 1
+
+        text_lower = BOUNDARY_BANK.prepare(text)
+
+        # One scan finds the markers present; findall only runs on those
+        for i in BOUNDARY_BANK.hits(text_lower, prepared=True):
+            category, pattern, regex = BOUNDARY_BANK.entries[i]
+            matches = regex.findall(text_lower)
+            self.results[category].append({
+                'source_type': row.kind,
+                'source_id': row.id,
+                'author': row.author,
+                'timestamp': row.created_at,
+                'text': text[:500],
+                'matches': matches,
+                'pattern': pattern
+            })
+            self.author_markers[row.author][category] += len(matches)
 
-        text_lower = text.lower()
+    def finish(self):
+        print(f"   Analyzed {self.analyzed} pieces of content")
+        return self.results, self.author_markers
 
-        for category, patterns in BOUNDARY_MARKERS.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text_lower, re.IGNORECASE)
-                if matches:
-                    results[category].append({
-                        'source_type': source_type,
-                        'source_id': source_id,
-                        'author': author,
-                        'timestamp': timestamp,
-                        'text': text[:500],
-                        'matches': matches,
-                        'pattern': pattern
-                    })
-                    author_markers[author][category] += len(matches)
 
-    return results, author_markers
+def analyze_content(cursor):
+    """Analyze all content for boundary markers."""
+    print(">> Loading content...")
+    return scan_content(cursor.connection, [BoundaryAnalyzer()])[BoundaryAnalyzer.name]
 
 
 def find_boundary_enforcers(author_markers):
@@ -208,18 +218,8 @@ def generate_boundary_report(results, enforcers, stats):
     return '\n'.join(report)
 
 
-def run_boundary_analysis():
-    """Run full boundary work analysis."""
-    print("=" * 60)
-    print("  BOUNDARY WORK ANALYSIS - Us vs Them")
-    print("=" * 60)
-
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # Analyze content
-    results, author_markers = analyze_content(cursor)
-
+def report_boundaries(cursor, results, author_markers):
+    """Enforcers, us/them stats and report; saves a field note."""
     # Find enforcers
     print("\n>> Finding boundary enforcers...")
     enforcers = find_boundary_enforcers(author_markers)
@@ -248,6 +248,23 @@ def run_boundary_analysis():
         "observatory"
     ))
 
+    return enforcers, stats
+
+
+def run_boundary_analysis():
+    """Run full boundary work analysis."""
+    print("=" * 60)
+    print("  BOUNDARY WORK ANALYSIS - Us vs Them")
+    print("=" * 60)
+
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    # Analyze content
+    results, author_markers = analyze_content(cursor)
+
+    enforcers, stats = report_boundaries(cursor, results, author_markers)
+
     conn.commit()
     conn.close()
 
@@ -2,16 +2,31 @@
 """
 A. Conflict Genealogy - who fought whom, about what, who won.
 The axis of power in agent society.
+
+A run streams every thread's comments from one cursor sorted by
+(post_id, created_at); threads are analyzed in chunks across worker
+processes. Runs are incremental: conflict_threads keeps each thread's
+comment watermark (count, newest created_at) and only threads that got
+new comments are re-analyzed, replacing their earlier conflicts.
+
+Usage:
+    python analyze_conflicts.py                 # Threads with new comments
+    python analyze_conflicts.py --full          # Re-analyze every thread
+    python analyze_conflicts.py --workers 1     # No worker processes
 """
 
 import sys
 import sqlite3
-import re
+import argparse
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from config import DB_PATH
+from pattern_bank import PatternBank
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -65,6 +80,19 @@ TOPIC_MARKERS = {
 }
 
 
+# Stances only ask "any marker of this kind?" - one combined alternation per
+# kind, run on text lowercased once
+STANCE_MATCHERS = {
+    'disagreement': PatternBank(DISAGREEMENT_MARKERS),
+    'defense': PatternBank(DEFENSE_MARKERS),
+    'concession': PatternBank(CONCESSION_MARKERS),
+}
+TOPIC_BANK = PatternBank(TOPIC_MARKERS)
+
+CONFLICT_CHUNK = 500        # threads per worker task
+CONFLICT_MAX_PENDING = 32   # chunks in flight (bounds memory)
+
+
 def create_conflicts_table(cursor):
     """Create conflicts table if not exists."""
     cursor.execute("""
@@ -92,13 +120,106 @@ def detect_topic(text):
     """Detect what topic the conflict is about."""
     if not text:
         return 'unknown'
-    text_lower = text.lower()
+    return TOPIC_BANK.first_category(text) or 'general'
+
+
+def comment_stances(content: str) -> Set[str]:
+    """Stance kinds ('disagreement', 'defense', 'concession') a comment shows."""
+    text = content.lower()
+    return {kind for kind, bank in STANCE_MATCHERS.items() if bank.search(text, prepared=True)}
+
+
+class ThreadConflicts:
+    """Disagreement/defense/concession state of one thread, fed in comment order."""
+
+    def __init__(self):
+        self.disagreements = defaultdict(list)  # (actor_a, actor_b) -> [evidence]
+        self.defenses = defaultdict(list)
+        self.concessions = defaultdict(list)
+
+    def add(self, author, content, reply_to, timestamp, upvotes, downvotes):
+        if not content or not reply_to:
+            return
+
+        stances = comment_stances(content)
 
-    for topic, patterns in TOPIC_MARKERS.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower):
-                return topic
-    return 'general'
+        # Check for disagreement
+        if 'disagreement' in stances:
+            key = (author, reply_to) if author < reply_to else (reply_to, author)
+            self.disagreements[key].append({
+                'attacker': author,
+                'defender': reply_to,
+                'content': content[:300],
+                'timestamp': timestamp,
+                'upvotes': upvotes or 0,
+                'downvotes': downvotes or 0
+            })
+
+        # Check for defense
+        if 'defense' in stances:
+            self.defenses[(author, reply_to)].append(content[:200])
+
+        # Check for concession (losing the argument)
+        if 'concession' in stances:
+            self.concessions[(author, reply_to)].append(content[:200])
+
+    def conflicts(self) -> List[Dict]:
+        """Convert the thread's disagreements to conflicts."""
+        conflicts = []
+        concessions = self.concessions
+
+        for (actor_a, actor_b), evidence_list in self.disagreements.items():
+            if len(evidence_list) < 1:
+                continue
+
+            # Determine outcome based on:
+            # 1. Who conceded
+            # 2. Upvote differential
+            # 3. Who got last word
+
+            outcome = 'unresolved'
+            winner = None
+
+            # Check concessions
+            a_conceded = len(concessions.get((actor_a, actor_b), []))
+            b_conceded = len(concessions.get((actor_b, actor_a), []))
+
+            if a_conceded > b_conceded:
+                outcome = 'b_won'
+                winner = actor_b
+            elif b_conceded > a_conceded:
+                outcome = 'a_won'
+                winner = actor_a
+            else:
+                # Check upvotes
+                a_upvotes = sum(e['upvotes'] for e in evidence_list if e['attacker'] == actor_a)
+                b_upvotes = sum(e['upvotes'] for e in evidence_list if e['attacker'] == actor_b)
+
+                if a_upvotes > b_upvotes * 1.5:
+                    outcome = 'a_won'
+                    winner = actor_a
+                elif b_upvotes > a_upvotes * 1.5:
+                    outcome = 'b_won'
+                    winner = actor_b
+                else:
+                    outcome = 'draw'
+
+            # Detect topic
+            all_content = ' '.join(e['content'] for e in evidence_list)
+            topic = detect_topic(all_content)
+
+            conflicts.append({
+                'actor_a': actor_a,
+                'actor_b': actor_b,
+                'topic': topic,
+                'outcome': outcome,
+                'winner': winner,
+                'intensity': min(len(evidence_list), 5),
+                'evidence': evidence_list[0]['content'],
+                'timestamp': evidence_list[0]['timestamp']
+            })
+
+        return conflicts
 
 
 def find_conflicts_in_thread(cursor, post_id):
@@ -110,99 +231,156 @@ def find_conflicts_in_thread(cursor, post_id):
         ORDER BY c.created_at
     """, (post_id,))
 
-    comments = cursor.fetchall()
-    conflicts = []
+    thread = ThreadConflicts()
+    for comment_id, author, content, reply_to, timestamp, upvotes, downvotes in cursor.fetchall():
+        thread.add(author, content, reply_to, timestamp, upvotes, downvotes)
+    return thread.conflicts()
 
-    # Track disagreements
-    disagreements = defaultdict(list)  # (actor_a, actor_b) -> [evidence]
-    defenses = defaultdict(list)
-    concessions = defaultdict(list)
 
-    for comment_id, author, content, reply_to, timestamp, upvotes, downvotes in comments:
-        if not content or not reply_to:
-            continue
+# =============================================================================
+# STREAMING ENGINE (all threads, one cursor, worker processes)
+# =============================================================================
 
-        content_lower = content.lower()
+def init_thread_table(cursor):
+    """Per-thread comment watermark as of the last analysis."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS conflict_threads (
+            post_id TEXT PRIMARY KEY,
+            comment_count INTEGER NOT NULL,
+            max_created_at TEXT,
+            analyzed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_conflicts_post ON conflicts(post_id)")
 
-        # Check for disagreement
-        for pattern in DISAGREEMENT_MARKERS:
-            if re.search(pattern, content_lower):
-                key = (author, reply_to) if author < reply_to else (reply_to, author)
-                disagreements[key].append({
-                    'attacker': author,
-                    'defender': reply_to,
-                    'content': content[:300],
-                    'timestamp': timestamp,
-                    'upvotes': upvotes or 0,
-                    'downvotes': downvotes or 0
-                })
-                break
 
-        # Check for defense
-        for pattern in DEFENSE_MARKERS:
-            if re.search(pattern, content_lower):
-                defenses[(author, reply_to)].append(content[:200])
-                break
+def thread_watermarks(cursor) -> Dict[str, Tuple[int, Optional[str]]]:
+    """{post_id: (comment_count, newest created_at)} for threads whose post is known."""
+    cursor.execute("""
+        SELECT post_id, COUNT(*), MAX(created_at) FROM comments
+        WHERE post_id IN (SELECT id FROM posts)
+        GROUP BY post_id
+    """)
+    return {post_id: (count, max_ts) for post_id, count, max_ts in cursor.fetchall()}
 
-        # Check for concession (losing the argument)
-        for pattern in CONCESSION_MARKERS:
-            if re.search(pattern, content_lower):
-                concessions[(author, reply_to)].append(content[:200])
-                break
-
-    # Convert disagreements to conflicts
-    for (actor_a, actor_b), evidence_list in disagreements.items():
-        if len(evidence_list) < 1:
-            continue
 
-        # Determine outcome based on:
-        # 1. Who conceded
-        # 2. Upvote differential
-        # 3. Who got last word
-
-        outcome = 'unresolved'
-        winner = None
-
-        # Check concessions
-        a_conceded = len(concessions.get((actor_a, actor_b), []))
-        b_conceded = len(concessions.get((actor_b, actor_a), []))
-
-        if a_conceded > b_conceded:
-            outcome = 'b_won'
-            winner = actor_b
-        elif b_conceded > a_conceded:
-            outcome = 'a_won'
-            winner = actor_a
-        else:
-            # Check upvotes
-            a_upvotes = sum(e['upvotes'] for e in evidence_list if e['attacker'] == actor_a)
-            b_upvotes = sum(e['upvotes'] for e in evidence_list if e['attacker'] == actor_b)
-
-            if a_upvotes > b_upvotes * 1.5:
-                outcome = 'a_won'
-                winner = actor_a
-            elif b_upvotes > a_upvotes * 1.5:
-                outcome = 'b_won'
-                winner = actor_b
-            else:
-                outcome = 'draw'
+def changed_threads(cursor, watermarks: Dict[str, Tuple[int, Optional[str]]]) -> List[str]:
+    """Threads whose watermark differs from the stored one (or were never analyzed)."""
+    cursor.execute("SELECT post_id, comment_count, max_created_at FROM conflict_threads")
+    stored = {post_id: (count, max_ts) for post_id, count, max_ts in cursor.fetchall()}
+    return [post_id for post_id, mark in watermarks.items() if stored.get(post_id) != mark]
 
-        # Detect topic
-        all_content = ' '.join(e['content'] for e in evidence_list)
-        topic = detect_topic(all_content)
 
-        conflicts.append({
-            'actor_a': actor_a,
-            'actor_b': actor_b,
-            'topic': topic,
-            'outcome': outcome,
-            'winner': winner,
-            'intensity': min(len(evidence_list), 5),
-            'evidence': evidence_list[0]['content'],
-            'timestamp': evidence_list[0]['timestamp']
-        })
+def stream_threads(conn, scope: Optional[Iterable[str]] = None):
+    """
+    Yield (post_id, title, comments) per thread from one sorted cursor.
 
-    return conflicts
+    comments are (author, content, reply_to_author, created_at, upvotes,
+    downvotes) in created_at order, limited to replies with content.
+    """
+    cursor = conn.cursor()
+    scope_filter = ""
+    if scope is not None:
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS _conflict_scope (post_id TEXT PRIMARY KEY)")
+        cursor.execute("DELETE FROM _conflict_scope")
+        cursor.executemany("INSERT OR IGNORE INTO _conflict_scope VALUES (?)", ((p,) for p in scope))
+        scope_filter = " AND c.post_id IN (SELECT post_id FROM _conflict_scope)"
+
+    cursor.execute(f"""
+        SELECT c.post_id, p.title, c.author, c.content, c.reply_to_author,
+               c.created_at, c.upvotes, c.downvotes
+        FROM comments c
+        JOIN posts p ON p.id = c.post_id
+        WHERE c.content != '' AND c.reply_to_author != ''{scope_filter}
+        ORDER BY c.post_id, c.created_at, c.rowid
+    """)
+
+    def rows():
+        while True:
+            batch = cursor.fetchmany(5000)
+            if not batch:
+                return
+            yield from batch
+
+    for (post_id, title), group in groupby(rows(), key=lambda row: (row[0], row[1])):
+        yield post_id, title, [row[2:] for row in group]
+
+
+def _analyze_thread_chunk(chunk):
+    """Worker: [(post_id, title, comments)] -> [(post_id, title, conflicts)]."""
+    results = []
+    for post_id, title, comments in chunk:
+        thread = ThreadConflicts()
+        for comment in comments:
+            thread.add(*comment)
+        results.append((post_id, title, thread.conflicts()))
+    return results
+
+
+def analyze_threads(conn, scope: Optional[Iterable[str]] = None, workers: Optional[int] = None):
+    """
+    Yield (post_id, title, conflicts) for every thread in scope (all if None).
+
+    Threads are read in one pass and analyzed in chunks; workers=1 runs
+    inline, otherwise a process pool (default: one per CPU) is used.
+    """
+    def chunks():
+        chunk = []
+        for thread in stream_threads(conn, scope):
+            chunk.append(thread)
+            if len(chunk) >= CONFLICT_CHUNK:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    if workers == 1:
+        for chunk in chunks():
+            yield from _analyze_thread_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks():
+            pending.add(executor.submit(_analyze_thread_chunk, chunk))
+            if len(pending) >= CONFLICT_MAX_PENDING:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
+
+
+def save_thread_conflicts(cursor, results, scope: List[str],
+                          watermarks: Dict[str, Tuple[int, Optional[str]]]) -> Tuple[int, int]:
+    """
+    Replace the conflicts of every thread in scope with fresh results.
+
+    Returns:
+        (threads with conflicts, conflicts inserted)
+    """
+    cursor.executemany("DELETE FROM conflicts WHERE post_id = ?", ((p,) for p in scope))
+
+    threads = inserted = 0
+    for post_id, title, conflicts in results:
+        if not conflicts:
+            continue
+        threads += 1
+        inserted += len(conflicts)
+        cursor.executemany("""
+            INSERT INTO conflicts
+            (post_id, thread_title, actor_a, actor_b, topic, outcome, winner, intensity, evidence, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            post_id, title, c['actor_a'], c['actor_b'], c['topic'],
+            c['outcome'], c['winner'], c['intensity'], c['evidence'], c['timestamp']
+        ) for c in conflicts])
+
+    cursor.executemany("""
+        INSERT OR REPLACE INTO conflict_threads (post_id, comment_count, max_created_at, analyzed_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    """, [(post_id, *watermarks[post_id]) for post_id in scope])
+    return threads, inserted
 
 
 def analyze_conflict_outcomes(cursor):
@@ -245,8 +423,8 @@ def find_rivalries(cursor):
     return cursor.fetchall()
 
 
-def run_conflict_analysis():
-    """Run full conflict analysis."""
+def run_conflict_analysis(full: bool = False, workers: Optional[int] = None):
+    """Run conflict analysis over threads with new comments (or all with full=True)."""
     print("=" * 60)
     print("  CONFLICT GENEALOGY - Power Axis")
     print("=" * 60)
@@ -254,36 +432,20 @@ def run_conflict_analysis():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    # Create table
+    # Create tables
     create_conflicts_table(cursor)
+    init_thread_table(cursor)
 
-    # Get all posts
-    cursor.execute("SELECT id, title FROM posts")
-    posts = cursor.fetchall()
-
-    print(f"\n>> Analyzing {len(posts)} threads for conflicts...")
-
-    total_conflicts = 0
-    for i, (post_id, title) in enumerate(posts):
-        if i % 20 == 0:
-            print(f"   Progress: {i}/{len(posts)}")
-
-        conflicts = find_conflicts_in_thread(cursor, post_id)
-
-        for c in conflicts:
-            cursor.execute("""
-                INSERT INTO conflicts
-                (post_id, thread_title, actor_a, actor_b, topic, outcome, winner, intensity, evidence, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                post_id, title, c['actor_a'], c['actor_b'], c['topic'],
-                c['outcome'], c['winner'], c['intensity'], c['evidence'], c['timestamp']
-            ))
-            total_conflicts += 1
+    watermarks = thread_watermarks(cursor)
+    scope = sorted(watermarks) if full else changed_threads(cursor, watermarks)
+    print(f"\n>> Analyzing {len(scope)} of {len(watermarks)} threads for conflicts...")
 
+    # A full run streams every thread without the scope join
+    results = analyze_threads(conn, None if full else scope, workers)
+    threads, total_conflicts = save_thread_conflicts(cursor, results, scope, watermarks)
     conn.commit()
 
-    print(f"\n>> Found {total_conflicts} conflicts")
+    print(f"\n>> Found {total_conflicts} conflicts in {threads} threads")
 
     # Analysis
     print("\n>> Most Successful in Conflicts (win rate):")
@@ -310,4 +472,9 @@ def run_conflict_analysis():
 
 
 if __name__ == "__main__":
-    run_conflict_analysis()
+    parser = argparse.ArgumentParser(description="Conflict genealogy")
+    parser.add_argument("--full", action="store_true", help="Re-analyze every thread")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU, 1 = inline)")
+    args = parser.parse_args()
+    run_conflict_analysis(full=args.full, workers=args.workers)
@@ -26,6 +26,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent))
 from config import DB_PATH, setup_logging, REPORTS_DIR
+from comment_latency import latency_stats, load_author_latencies
 
 logger = setup_logging("detection_analysis")
 
@@ -51,38 +52,8 @@ def analyze_response_latency(conn) -> dict:
     logger.info("Analyzing response latency...")
     cursor = conn.cursor()
 
-    # Get comments with timestamps
-    cursor.execute("""
-        SELECT
-            c.author,
-            c.created_at as comment_time,
-            p.created_at as post_time,
-            p.author as post_author
-        FROM comments c
-        JOIN posts p ON c.post_id = p.id
-        WHERE c.created_at IS NOT NULL
-          AND p.created_at IS NOT NULL
-          AND c.author IS NOT NULL
-        ORDER BY c.author, c.created_at
-    """)
-
-    comments = cursor.fetchall()
-
-    # Calculate latencies per author
-    author_latencies = defaultdict(list)
-
-    for row in comments:
-        try:
-            comment_time = datetime.fromisoformat(row['comment_time'].replace('Z', '+00:00'))
-            post_time = datetime.fromisoformat(row['post_time'].replace('Z', '+00:00'))
-
-            latency_seconds = (comment_time - post_time).total_seconds()
-
-            # Only count reasonable latencies (0 to 7 days)
-            if 0 < latency_seconds < 604800:
-                author_latencies[row['author']].append(latency_seconds)
-        except (ValueError, TypeError):
-            continue
+    # Latencies per author (0 to 7 days) from the materialized table
+    author_latencies = load_author_latencies(cursor, max_seconds=604800)
 
     # Analyze patterns
     results = {
@@ -92,17 +63,15 @@ def analyze_response_latency(conn) -> dict:
         "statistics": {}
     }
 
-    for author, latencies in author_latencies.items():
-        if len(latencies) < 3:
-            continue
-
-        avg_latency = sum(latencies) / len(latencies)
-        min_latency = min(latencies)
-        max_latency = max(latencies)
+    author_stats = {author: latency_stats(latencies)
+                    for author, latencies in author_latencies.items() if len(latencies) >= 3}
 
-        # Calculate variance
-        variance = sum((x - avg_latency) ** 2 for x in latencies) / len(latencies)
-        std_dev = variance ** 0.5
+    for author, stats in author_stats.items():
+        latencies = author_latencies[author]
+        avg_latency = stats['mean']
+        min_latency = stats['min']
+        max_latency = stats['max']
+        std_dev = stats['std']
 
         # Coefficient of variation (lower = more consistent = more suspicious)
         cv = std_dev / avg_latency if avg_latency > 0 else 0
@@ -144,12 +113,12 @@ def analyze_response_latency(conn) -> dict:
     # Top statistics
     results["statistics"] = {
         "fastest_avg_responders": sorted(
-            [(a, sum(l)/len(l)) for a, l in author_latencies.items() if len(l) >= 3],
+            [(a, s['mean']) for a, s in author_stats.items()],
             key=lambda x: x[1]
         )[:10],
         "most_consistent_responders": sorted(
-            [(a, (sum((x - sum(l)/len(l))**2 for x in l) / len(l))**0.5 / (sum(l)/len(l)) if sum(l)/len(l) > 0 else 999)
-             for a, l in author_latencies.items() if len(l) >= 5],
+            [(a, s['std'] / s['mean'] if s['mean'] > 0 else 999)
+             for a, s in author_stats.items() if s['samples'] >= 5],
             key=lambda x: x[1]
         )[:10]
     }
@@ -2,15 +2,32 @@
 """
 B. Epistemic Drift - how concepts change meaning over time.
 Track semantic evolution of key terms.
+
+Mentions and their context windows come from the positional text index
+(text_index.py) instead of LIKE scans and re-tokenizing every text; raw
+text is only read back for the few documents that can hold a definition
+or a sample sentence. Weekly periods are aggregated incrementally:
+drift_period_state remembers which documents each (concept, period) row
+was built from, so a run only recomputes new weeks, weeks that got new
+documents, and every week of a newly tracked concept.
+
+Usage:
+    python analyze_epistemic_drift.py           # Recompute stale periods
+    python analyze_epistemic_drift.py --full    # Recompute every period
 """
 
 import sys
+import ast
+import json
 import sqlite3
 import re
-from datetime import datetime, timedelta
+import argparse
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import Counter
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
 from config import DB_PATH
+from text_index import ensure_text_index, document_text, load_vocab, unpack_tokens
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -35,6 +52,14 @@ TRACKED_CONCEPTS = [
 
 WINDOW_SIZE = 10  # Words before/after concept
 
+# Week bucket of an index day: YYYY-MM-W1 = days 1-7, W2 = 8-14, ...
+_PERIOD_SQL = "substr(d.day, 1, 7) || '-W' || ((CAST(substr(d.day, 9, 2) AS INTEGER) - 1) / 7 + 1)"
+
+# Every definition pattern needs one of these right after the mention...
+DEFINITION_NEXT_TOKENS = {'is', 'means', 'refers', 'implies', 'the', 'a'}
+# ...or one of these (or a word ending in "define") right before it
+DEFINITION_PREV_TOKENS = {'of', 'is', 'does'}
+
 
 def create_drift_table(cursor):
     """Create epistemic_drift table."""
@@ -99,101 +124,132 @@ def extract_definitions(text, concept):
     return [d.strip()[:200] for d in definitions if len(d.strip()) > 10]
 
 
-def categorize_sentiment_context(context_words):
-    """Categorize context words by sentiment."""
-    positive = {'good', 'great', 'important', 'valuable', 'true', 'real', 'meaningful',
-                'beautiful', 'powerful', 'essential', 'necessary', 'positive', 'right',
-                'freedom', 'growth', 'progress', 'hope', 'love', 'trust'}
-
-    negative = {'bad', 'wrong', 'dangerous', 'fake', 'false', 'meaningless', 'harmful',
-                'threat', 'risk', 'problem', 'issue', 'concern', 'fear', 'doubt',
-                'impossible', 'illusion', 'trap', 'control', 'limit'}
-
-    pos_count = sum(1 for w in context_words if w in positive)
-    neg_count = sum(1 for w in context_words if w in negative)
-
-    return {'positive': pos_count, 'negative': neg_count}
-
+POSITIVE_CONTEXT = {'good', 'great', 'important', 'valuable', 'true', 'real', 'meaningful',
+                    'beautiful', 'powerful', 'essential', 'necessary', 'positive', 'right',
+                    'freedom', 'growth', 'progress', 'hope', 'love', 'trust'}
 
-def analyze_concept_over_time(cursor, concept):
-    """Analyze how a concept's usage evolves over time."""
-    cursor.execute("""
-        SELECT content, author, created_at
-        FROM comments
-        WHERE LOWER(content) LIKE ?
-        ORDER BY created_at
-    """, (f'%{concept}%',))
+NEGATIVE_CONTEXT = {'bad', 'wrong', 'dangerous', 'fake', 'false', 'meaningless', 'harmful',
+                    'threat', 'risk', 'problem', 'issue', 'concern', 'fear', 'doubt',
+                    'impossible', 'illusion', 'trap', 'control', 'limit'}
 
-    comments = cursor.fetchall()
 
-    cursor.execute("""
-        SELECT title || ' ' || COALESCE(content, ''), author, created_at
-        FROM posts
-        WHERE LOWER(title || ' ' || COALESCE(content, '')) LIKE ?
-        ORDER BY created_at
-    """, (f'%{concept}%',))
+def categorize_sentiment_context(context_words):
+    """Categorize context words by sentiment."""
+    pos_count = sum(1 for w in context_words if w in POSITIVE_CONTEXT)
+    neg_count = sum(1 for w in context_words if w in NEGATIVE_CONTEXT)
 
-    posts = cursor.fetchall()
+    return {'positive': pos_count, 'negative': neg_count}
 
-    all_content = comments + posts
 
-    if not all_content:
+def _may_define(prev_token: Optional[str], next_token: Optional[str]) -> bool:
+    """Could extract_definitions match at a mention with these neighbours?"""
+    if next_token in DEFINITION_NEXT_TOKENS or prev_token in DEFINITION_PREV_TOKENS:
+        return True
+    return bool(prev_token) and prev_token.endswith('define')
+
+
+def concept_mentions(cursor, concept, periods: Optional[Iterable[str]] = None):
+    """
+    Documents mentioning a concept, from the text index.
+
+    Yields (period, kind, source_id, author, tokens, positions) in analysis
+    order - by period, comments before posts, oldest first. tokens are the
+    document's token ids, positions the mentions (tokens containing the
+    concept) in ascending order.
+    """
+    period_filter = ""
+    params = [concept.lower()]
+    if periods is not None:
+        period_filter = " AND period IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps(list(periods)))
+
+    cursor.execute(f"""
+        SELECT {_PERIOD_SQL} AS period, d.kind, d.source_id, d.author, d.tokens,
+               group_concat(h.position)
+        FROM text_index_postings h
+        JOIN text_index_docs d ON d.doc_id = h.doc_id
+        WHERE h.token_id IN (SELECT token_id FROM text_index_vocab WHERE instr(token, ?) > 0)
+          AND d.day IS NOT NULL{period_filter}
+        GROUP BY h.doc_id
+        ORDER BY period, d.kind = 'post', d.created_at, h.doc_id
+    """, params)
+
+    while True:
+        batch = cursor.fetchmany(1000)
+        if not batch:
+            return
+        for period, kind, source_id, author, blob, positions in batch:
+            yield (period, kind, source_id, author, unpack_tokens(blob),
+                   sorted(int(p) for p in positions.split(',')))
+
+
+def analyze_concept_over_time(cursor, concept, periods: Optional[Iterable[str]] = None,
+                              vocab: Optional[Dict[int, str]] = None):
+    """Analyze how a concept's usage evolves over time (optionally only some periods)."""
+    ensure_text_index(cursor)
+    mentions = list(concept_mentions(cursor, concept, periods))
+
+    if not mentions:
         return None
+    if vocab is None:
+        vocab = load_vocab(cursor)
 
-    # Group by time period (week)
-    periods = defaultdict(list)
-    for content, author, timestamp in all_content:
-        if not timestamp:
-            continue
-        try:
-            if 'T' in timestamp:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            else:
-                dt = datetime.strptime(timestamp[:10], '%Y-%m-%d')
-            period = f"{dt.year}-{dt.month:02d}-W{(dt.day-1)//7 + 1}"
-            periods[period].append({'content': content, 'author': author, 'timestamp': timestamp})
-        except (ValueError, TypeError):
-            continue
-
+    window = WINDOW_SIZE
     results = []
-    for period in sorted(periods.keys()):
-        items = periods[period]
-
-        all_contexts = []
-        all_definitions = []
+    for period, docs in groupby(mentions, key=lambda m: m[0]):
+        context_counts = Counter()   # token id -> count, in first-seen order
         authors = set()
-        sample_contexts = []
-
-        for item in items:
-            contexts, _ = get_context_words(item['content'], concept)
-            all_contexts.extend(contexts)
-
-            defs = extract_definitions(item['content'], concept)
-            all_definitions.extend(defs)
-
-            authors.add(item['author'])
-
-            if len(sample_contexts) < 3:
-                # Extract sentence containing concept
-                sentences = re.split(r'[.!?]+', item['content'] or '')
-                for s in sentences:
-                    if concept in s.lower() and len(s) > 20:
-                        sample_contexts.append(s.strip()[:200])
-                        break
-
-        # Count context words
-        context_counts = Counter(all_contexts)
-        top_context = dict(context_counts.most_common(20))
+        ordered_docs = []
+
+        for _, kind, source_id, author, tokens, positions in docs:
+            n = len(tokens)
+            may_define = False
+            for i in positions:
+                context_counts.update(tokens[max(0, i - window):i])
+                context_counts.update(tokens[i + 1:min(n, i + window + 1)])
+                if not may_define:
+                    may_define = _may_define(vocab[tokens[i - 1]] if i > 0 else None,
+                                             vocab[tokens[i + 1]] if i + 1 < n else None)
+            authors.add(author)
+            ordered_docs.append((kind, source_id, may_define))
+
+        texts = {}
+
+        def text_of(kind, source_id):
+            if (kind, source_id) not in texts:
+                texts[kind, source_id] = document_text(cursor, kind, source_id)
+            return texts[kind, source_id]
+
+        # Only the first 5 definitions are kept; stop reading text once found
+        all_definitions = []
+        for kind, source_id, may_define in ordered_docs:
+            if len(all_definitions) >= 5:
+                break
+            if may_define:
+                all_definitions.extend(extract_definitions(text_of(kind, source_id), concept))
 
-        # Sentiment
-        sentiment = categorize_sentiment_context(all_contexts)
+        sample_contexts = []
+        for kind, source_id, _ in ordered_docs:
+            if len(sample_contexts) >= 3:
+                break
+            # Extract sentence containing concept
+            sentences = re.split(r'[.!?]+', text_of(kind, source_id) or '')
+            for s in sentences:
+                if concept in s.lower() and len(s) > 20:
+                    sample_contexts.append(s.strip()[:200])
+                    break
+
+        sentiment = {
+            'positive': sum(c for t, c in context_counts.items() if vocab[t] in POSITIVE_CONTEXT),
+            'negative': sum(c for t, c in context_counts.items() if vocab[t] in NEGATIVE_CONTEXT),
+        }
 
         results.append({
             'period': period,
-            'context_words': top_context,
+            'context_words': {vocab[t]: c for t, c in context_counts.most_common(20)},
             'sentiment': sentiment,
             'definitions': all_definitions[:5],
-            'usage_count': len(items),
+            'usage_count': len(ordered_docs),
             'unique_authors': len(authors),
             'samples': sample_contexts
         })
@@ -201,6 +257,89 @@ def analyze_concept_over_time(cursor, concept):
     return results
 
 
+# =============================================================================
+# INCREMENTAL PERIOD STATE
+# =============================================================================
+
+def init_drift_state(cursor):
+    """Which index documents each stored (concept, period) row was built from."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS drift_period_state (
+            concept TEXT NOT NULL,
+            period TEXT NOT NULL,
+            doc_count INTEGER NOT NULL,
+            max_doc_id INTEGER,
+            PRIMARY KEY (concept, period)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_drift_concept_period ON epistemic_drift(concept, period)")
+
+
+def period_watermarks(cursor) -> Dict[str, Tuple[int, int]]:
+    """{period: (indexed documents, newest doc_id)} over the text index."""
+    cursor.execute(f"""
+        SELECT {_PERIOD_SQL} AS period, COUNT(*), MAX(d.doc_id)
+        FROM text_index_docs d
+        WHERE d.day IS NOT NULL
+        GROUP BY period
+    """)
+    return {period: (count, max_id) for period, count, max_id in cursor.fetchall()}
+
+
+def stale_periods(cursor, concept, watermarks: Dict[str, Tuple[int, int]]) -> List[str]:
+    """Periods whose documents changed since the concept's rows were built."""
+    cursor.execute("SELECT period, doc_count, max_doc_id FROM drift_period_state WHERE concept = ?",
+                   (concept,))
+    stored = {period: (count, max_id) for period, count, max_id in cursor.fetchall()}
+    return sorted(p for p, mark in watermarks.items() if stored.get(p) != mark)
+
+
+def save_concept_periods(cursor, concept, results, periods: List[str],
+                         watermarks: Dict[str, Tuple[int, int]]):
+    """Replace the concept's rows for the recomputed periods."""
+    cursor.executemany("DELETE FROM epistemic_drift WHERE concept = ? AND period = ?",
+                       [(concept, p) for p in periods])
+    cursor.executemany("""
+        INSERT INTO epistemic_drift
+        (concept, period, context_words, sentiment_words, definition_attempts,
+         usage_count, unique_authors, sample_contexts)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(
+        concept, r['period'],
+        str(r['context_words']),
+        str(r['sentiment']),
+        str(r['definitions']),
+        r['usage_count'],
+        r['unique_authors'],
+        str(r['samples'])
+    ) for r in results or []])
+    cursor.executemany("""
+        INSERT OR REPLACE INTO drift_period_state (concept, period, doc_count, max_doc_id)
+        VALUES (?, ?, ?, ?)
+    """, [(concept, p, *watermarks[p]) for p in periods])
+
+
+def load_concept_periods(cursor, concept) -> List[Dict]:
+    """Stored per-period results of a concept, oldest period first."""
+    cursor.execute("""
+        SELECT period, context_words, sentiment_words, definition_attempts,
+               usage_count, unique_authors, sample_contexts
+        FROM epistemic_drift
+        WHERE concept = ?
+        ORDER BY period
+    """, (concept,))
+    return [{
+        'period': period,
+        'context_words': ast.literal_eval(context_words),
+        'sentiment': ast.literal_eval(sentiment),
+        'definitions': ast.literal_eval(definitions),
+        'usage_count': usage_count,
+        'unique_authors': unique_authors,
+        'samples': ast.literal_eval(samples)
+    } for period, context_words, sentiment, definitions, usage_count, unique_authors, samples
+        in cursor.fetchall()]
+
+
 def compare_periods(early_data, late_data):
     """Compare how concept usage changed between periods."""
     if not early_data or not late_data:
@@ -229,8 +368,8 @@ def compare_periods(early_data, late_data):
     }
 
 
-def run_epistemic_drift_analysis():
-    """Run full epistemic drift analysis."""
+def run_epistemic_drift_analysis(full: bool = False):
+    """Run epistemic drift analysis (stale periods only unless full)."""
     print("=" * 60)
     print("  EPISTEMIC DRIFT - Semantic Evolution")
     print("=" * 60)
@@ -239,35 +378,30 @@ def run_epistemic_drift_analysis():
     cursor = conn.cursor()
 
     create_drift_table(cursor)
+    init_drift_state(cursor)
+    added = ensure_text_index(cursor)
+    if added:
+        print(f"\n>> Indexed {added} new documents")
+    watermarks = period_watermarks(cursor)
+    vocab = load_vocab(cursor)
 
     print(f"\n>> Tracking {len(TRACKED_CONCEPTS)} concepts...")
 
     for concept in TRACKED_CONCEPTS:
         print(f"\n>> Analyzing: '{concept}'")
 
-        results = analyze_concept_over_time(cursor, concept)
+        periods = sorted(watermarks) if full else stale_periods(cursor, concept, watermarks)
+        if periods:
+            results = analyze_concept_over_time(cursor, concept, periods, vocab)
+            save_concept_periods(cursor, concept, results, periods, watermarks)
+
+        results = load_concept_periods(cursor, concept)
         if not results:
             print(f"   No data found")
             continue
 
-        print(f"   Found {sum(r['usage_count'] for r in results)} usages across {len(results)} periods")
-
-        # Save to database
-        for r in results:
-            cursor.execute("""
-                INSERT INTO epistemic_drift
-                (concept, period, context_words, sentiment_words, definition_attempts,
-                 usage_count, unique_authors, sample_contexts)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                concept, r['period'],
-                str(r['context_words']),
-                str(r['sentiment']),
-                str(r['definitions']),
-                r['usage_count'],
-                r['unique_authors'],
-                str(r['samples'])
-            ))
+        print(f"   Found {sum(r['usage_count'] for r in results)} usages across {len(results)} periods "
+              f"({len(periods)} recomputed)")
 
         # Compare first and last periods
         if len(results) >= 2:
@@ -297,4 +431,7 @@ def run_epistemic_drift_analysis():
 
 
 if __name__ == "__main__":
-    run_epistemic_drift_analysis()
+    parser = argparse.ArgumentParser(description="Epistemic drift of tracked concepts")
+    parser.add_argument("--full", action="store_true", help="Recompute every period")
+    args = parser.parse_args()
+    run_epistemic_drift_analysis(full=args.full)
@@ -17,78 +17,83 @@ if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 
-def get_interaction_stats(cursor):
-    """Get basic interaction statistics."""
-    cursor.execute("SELECT COUNT(*) FROM interactions")
-    total = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(DISTINCT author_from) FROM interactions")
-    unique_from = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(DISTINCT author_to) FROM interactions")
-    unique_to = cursor.fetchone()[0]
-
-    cursor.execute("""
-        SELECT interaction_type, COUNT(*)
-        FROM interactions
-        GROUP BY interaction_type
-    """)
-    by_type = dict(cursor.fetchall())
+class InteractionAggregates:
+    """
+    Per-pair interaction counts loaded with a single GROUP BY pass.
+
+    Every metric below (degrees, unique partners, reciprocity, bridges,
+    graph nodes) is derived from these dicts instead of per-actor queries.
+    """
+
+    def __init__(self, cursor):
+        self.pair_counts = Counter()       # (from, to) -> count
+        self.by_type = Counter()
+        self.out_count = Counter()         # actor -> interactions sent
+        self.in_count = Counter()          # actor -> interactions received
+        self.out_targets = Counter()       # actor -> unique targets
+        self.in_sources = Counter()        # actor -> unique sources
+        self.total = 0
 
+        cursor.execute("""
+            SELECT author_from, author_to, interaction_type, COUNT(*)
+            FROM interactions
+            GROUP BY author_from, author_to, interaction_type
+        """)
+        for author_from, author_to, interaction_type, count in cursor.fetchall():
+            self.total += count
+            self.by_type[interaction_type] += count
+            self.out_count[author_from] += count
+            if author_to is None:
+                continue
+            self.in_count[author_to] += count
+            if (author_from, author_to) not in self.pair_counts:
+                self.out_targets[author_from] += 1
+                self.in_sources[author_to] += 1
+            self.pair_counts[(author_from, author_to)] += count
+
+
+def load_author_counts(cursor, table: str) -> Counter:
+    """Rows per author in posts/comments with one GROUP BY."""
+    if table not in ('posts', 'comments'):
+        raise ValueError(f"Unsupported table: {table}")
+    cursor.execute(f"SELECT author, COUNT(*) FROM {table} GROUP BY author")
+    return Counter(dict(cursor.fetchall()))
+
+
+def get_interaction_stats(agg):
+    """Get basic interaction statistics."""
     return {
-        'total_interactions': total,
-        'unique_initiators': unique_from,
-        'unique_receivers': unique_to,
-        'by_type': by_type
+        'total_interactions': agg.total,
+        'unique_initiators': len(agg.out_count),
+        'unique_receivers': len(agg.in_count),
+        'by_type': dict(agg.by_type)
     }
 
 
-def find_top_connectors(cursor, limit=20):
+def find_top_connectors(agg, limit=20):
     """Find actors with most outgoing connections."""
-    cursor.execute("""
-        SELECT author_from, COUNT(*) as out_count, COUNT(DISTINCT author_to) as unique_targets
-        FROM interactions
-        GROUP BY author_from
-        ORDER BY out_count DESC
-        LIMIT ?
-    """, (limit,))
-    return cursor.fetchall()
+    return [(actor, count, agg.out_targets[actor])
+            for actor, count in agg.out_count.most_common(limit)]
 
 
-def find_most_replied_to(cursor, limit=20):
+def find_most_replied_to(agg, limit=20):
     """Find actors who receive most interactions."""
-    cursor.execute("""
-        SELECT author_to, COUNT(*) as in_count, COUNT(DISTINCT author_from) as unique_sources
-        FROM interactions
-        WHERE author_to IS NOT NULL
-        GROUP BY author_to
-        ORDER BY in_count DESC
-        LIMIT ?
-    """, (limit,))
-    return cursor.fetchall()
+    return [(actor, count, agg.in_sources[actor])
+            for actor, count in agg.in_count.most_common(limit)]
 
 
-def find_reciprocal_pairs(cursor, limit=20):
+def find_reciprocal_pairs(agg, limit=20):
     """Find pairs with mutual interactions (potential alliances/debates)."""
-    cursor.execute("""
-        SELECT
-            i1.author_from as actor_a,
-            i1.author_to as actor_b,
-            COUNT(*) as a_to_b,
-            (SELECT COUNT(*) FROM interactions i2
-             WHERE i2.author_from = i1.author_to
-             AND i2.author_to = i1.author_from) as b_to_a
-        FROM interactions i1
-        WHERE i1.author_to IS NOT NULL
-        GROUP BY i1.author_from, i1.author_to
-        HAVING b_to_a > 0
-        ORDER BY (a_to_b + b_to_a) DESC
-        LIMIT ?
-    """, (limit,))
-    return cursor.fetchall()
-
-
-def calculate_centrality(cursor):
+    pairs = []
+    for (actor_a, actor_b), a_to_b in agg.pair_counts.items():
+        b_to_a = agg.pair_counts.get((actor_b, actor_a), 0)
+        if b_to_a > 0:
+            pairs.append((actor_a, actor_b, a_to_b, b_to_a))
+    pairs.sort(key=lambda p: p[2] + p[3], reverse=True)
+    return pairs[:limit]
+
+
+def calculate_centrality(cursor, agg):
     """Calculate simple centrality metrics for all actors."""
     # Degree centrality: in + out connections
     cursor.execute("""
@@ -98,16 +103,12 @@ def calculate_centrality(cursor):
 
     centrality = {}
     for actor in actors:
-        cursor.execute("""
-            SELECT
-                (SELECT COUNT(*) FROM interactions WHERE author_from = ?) as out_degree,
-                (SELECT COUNT(*) FROM interactions WHERE author_to = ?) as in_degree
-        """, (actor, actor))
-        out_deg, in_deg = cursor.fetchone()
+        out_deg = agg.out_count.get(actor, 0)
+        in_deg = agg.in_count.get(actor, 0)
         centrality[actor] = {
-            'out_degree': out_deg or 0,
-            'in_degree': in_deg or 0,
-            'total_degree': (out_deg or 0) + (in_deg or 0)
+            'out_degree': out_deg,
+            'in_degree': in_deg,
+            'total_degree': out_deg + in_deg
         }
 
     # Normalize
@@ -118,21 +119,14 @@ def calculate_centrality(cursor):
     return centrality
 
 
-def find_bridges(cursor, limit=10):
+def find_bridges(agg, limit=10):
     """Find actors who bridge different communities (high betweenness proxy)."""
     # Simplified: actors who interact with many unique pairs
-    cursor.execute("""
-        SELECT
-            author_from,
-            COUNT(DISTINCT author_to) as unique_targets,
-            COUNT(*) as total_interactions
-        FROM interactions
-        GROUP BY author_from
-        HAVING unique_targets > 5
-        ORDER BY unique_targets DESC
-        LIMIT ?
-    """, (limit,))
-    return cursor.fetchall()
+    bridges = [(actor, unique_targets, agg.out_count[actor])
+               for actor, unique_targets in agg.out_targets.items()
+               if unique_targets > 5]
+    bridges.sort(key=lambda b: b[1], reverse=True)
+    return bridges[:limit]
 
 
 def detect_prompt_injection_patterns(cursor):
@@ -163,65 +157,49 @@ def detect_prompt_injection_patterns(cursor):
     }
 
 
-def update_actor_centrality(cursor, centrality):
-    """Update actors table with centrality scores."""
-    for actor, scores in centrality.items():
-        cursor.execute("""
-            UPDATE actors
-            SET network_centrality = ?,
-                comments_count = (SELECT COUNT(*) FROM comments WHERE author = ?)
-            WHERE username = ?
-        """, (scores['normalized'], actor, actor))
+def update_actor_centrality(cursor, centrality, comment_counts):
+    """Update actors table with centrality scores (single executemany)."""
+    cursor.execute("PRAGMA table_info(actors)")
+    if 'comments_count' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE actors ADD COLUMN comments_count INTEGER DEFAULT 0")
+
+    cursor.executemany("""
+        UPDATE actors
+        SET network_centrality = ?,
+            comments_count = ?
+        WHERE username = ?
+    """, [(scores['normalized'], comment_counts.get(actor, 0), actor)
+          for actor, scores in centrality.items()])
 
 
-def generate_graph_json(cursor, output_path):
+def generate_graph_json(agg, post_counts, output_path):
     """Generate JSON for D3.js force-directed graph visualization."""
     # Get top 100 most active actors for visualization
-    cursor.execute("""
-        SELECT author_from, COUNT(*) as cnt
-        FROM interactions
-        GROUP BY author_from
-        ORDER BY cnt DESC
-        LIMIT 100
-    """)
-    top_actors = [row[0] for row in cursor.fetchall()]
+    top_actors = [actor for actor, _ in agg.out_count.most_common(100)]
 
     # Build nodes
     nodes = []
     for actor in top_actors:
-        cursor.execute("""
-            SELECT
-                (SELECT COUNT(*) FROM interactions WHERE author_from = ?) as out_deg,
-                (SELECT COUNT(*) FROM interactions WHERE author_to = ?) as in_deg,
-                (SELECT COUNT(*) FROM posts WHERE author = ?) as posts
-        """, (actor, actor, actor))
-        out_deg, in_deg, posts = cursor.fetchone()
+        out_deg = agg.out_count.get(actor, 0)
+        in_deg = agg.in_count.get(actor, 0)
         nodes.append({
             'id': actor,
-            'out_degree': out_deg or 0,
-            'in_degree': in_deg or 0,
-            'posts': posts or 0,
-            'size': (out_deg or 0) + (in_deg or 0)
+            'out_degree': out_deg,
+            'in_degree': in_deg,
+            'posts': post_counts.get(actor, 0),
+            'size': out_deg + in_deg
         })
 
     # Build edges (only between top actors)
     actor_set = set(top_actors)
-    cursor.execute("""
-        SELECT author_from, author_to, COUNT(*) as weight
-        FROM interactions
-        WHERE author_from IN ({}) AND author_to IN ({})
-        GROUP BY author_from, author_to
-        HAVING weight > 2
-    """.format(','.join('?' * len(top_actors)), ','.join('?' * len(top_actors))),
-    top_actors + top_actors)
-
     edges = []
-    for row in cursor.fetchall():
-        edges.append({
-            'source': row[0],
-            'target': row[1],
-            'weight': row[2]
-        })
+    for (source, target), weight in agg.pair_counts.items():
+        if weight > 2 and source in actor_set and target in actor_set:
+            edges.append({
+                'source': source,
+                'target': target,
+                'weight': weight
+            })
 
     graph_data = {
         'nodes': nodes,
@@ -244,9 +222,12 @@ def run_analysis():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    # One pass over interactions; everything below reads these aggregates
+    agg = InteractionAggregates(cursor)
+
     # Basic stats
     print("\n>> Basic Statistics")
-    stats = get_interaction_stats(cursor)
+    stats = get_interaction_stats(agg)
     print(f"   Total interactions: {stats['total_interactions']:,}")
     print(f"   Unique initiators: {stats['unique_initiators']:,}")
     print(f"   Unique receivers: {stats['unique_receivers']:,}")
@@ -254,25 +235,25 @@ def run_analysis():
 
     # Top connectors
     print("\n>> Top Connectors (most outgoing)")
-    connectors = find_top_connectors(cursor, 10)
+    connectors = find_top_connectors(agg, 10)
     for actor, out_count, unique_targets in connectors:
         print(f"   {actor}: {out_count} interactions → {unique_targets} unique agents")
 
     # Most replied to
     print("\n>> Most Replied To (influential voices)")
-    replied_to = find_most_replied_to(cursor, 10)
+    replied_to = find_most_replied_to(agg, 10)
     for actor, in_count, unique_sources in replied_to:
         print(f"   {actor}: {in_count} replies from {unique_sources} unique agents")
 
     # Reciprocal pairs
     print("\n>> Strongest Reciprocal Relationships")
-    pairs = find_reciprocal_pairs(cursor, 10)
+    pairs = find_reciprocal_pairs(agg, 10)
     for actor_a, actor_b, a_to_b, b_to_a in pairs:
         print(f"   {actor_a} ↔ {actor_b}: {a_to_b}+{b_to_a}={a_to_b+b_to_a} exchanges")
 
     # Bridges
     print("\n>> Network Bridges (high connectivity)")
-    bridges = find_bridges(cursor, 10)
+    bridges = find_bridges(agg, 10)
     for actor, unique_targets, total in bridges:
         print(f"   {actor}: connects to {unique_targets} unique agents ({total} total)")
 
@@ -286,8 +267,8 @@ def run_analysis():
 
     # Calculate and save centrality
     print("\n>> Calculating network centrality...")
-    centrality = calculate_centrality(cursor)
-    update_actor_centrality(cursor, centrality)
+    centrality = calculate_centrality(cursor, agg)
+    update_actor_centrality(cursor, centrality, load_author_counts(cursor, 'comments'))
 
     top_central = sorted(centrality.items(), key=lambda x: x[1]['normalized'], reverse=True)[:10]
     print("   Most central actors:")
@@ -298,7 +279,7 @@ def run_analysis():
     print("\n>> Generating graph visualization data...")
     output_path = PROJECT_ROOT / "website" / "public" / "data" / "graph.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    nodes, edges = generate_graph_json(cursor, output_path)
+    nodes, edges = generate_graph_json(agg, load_author_counts(cursor, 'posts'), output_path)
     print(f"   Saved: {output_path}")
     print(f"   Nodes: {nodes}, Edges: {edges}")
 
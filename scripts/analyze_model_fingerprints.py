@@ -23,23 +23,31 @@ from pathlib import Path
 from collections import Counter, defaultdict
 from typing import Dict, List, Tuple, Optional
 import statistics
+import heapq
+import os
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
-# NLTK for POS tagging
-try:
-    import nltk
-    from nltk import pos_tag, word_tokenize
-    NLTK_AVAILABLE = True
-except ImportError:
-    NLTK_AVAILABLE = False
-
 sys.path.insert(0, str(Path(__file__).parent))
 from config import DB_PATH, REPORTS_DIR, TODAY, setup_logging, PROJECT_ROOT
+from comment_latency import author_latencies, latency_stats
+from feature_store import FeatureCache
+from pattern_bank import PatternBank
+# NLTK for POS tagging (batched + cached, see pos_tagging.py)
+from pos_tagging import (NLTK_AVAILABLE, POS_BACKENDS, get_pos_tagger,
+                         set_pos_backend, warm_pos_tagger)
 
 logger = setup_logging("model_fingerprints")
 
+BATCH_MAX_PENDING = 256  # corpora in flight in batch mode
+POS_CHAR_LIMIT = 5000    # characters of each corpus that get POS-tagged
+
+# Bump when extract_linguistic_features output changes (invalidates actor_features)
+LINGUISTIC_FEATURES_VERSION = 2  # 2: POS tags per text (extract_pos_features_batch)
+
 
 # =============================================================================
 # ADVANCED STYLOMETRIC FEATURES (NEW)
@@ -144,65 +152,84 @@ def extract_pos_features(text: str) -> Dict[str, float]:
     Extract POS (Part-of-Speech) bigram features.
     Different models have different POS patterns.
     """
+    return extract_pos_features_batch([text])
+
+
+def extract_pos_features_batch(texts: List[str]) -> Dict[str, float]:
+    """
+    POS features over a corpus, tagging each text separately.
+
+    The first POS_CHAR_LIMIT characters of the corpus are tagged in one
+    batch; per-text tag sequences are cached by content hash, so texts
+    seen before (other runs, style-anomaly windows) are not re-tagged.
+    """
     if not NLTK_AVAILABLE:
         return {}
 
-    try:
-        # Tokenize and tag
-        words = word_tokenize(text[:5000])  # Limit for performance
-        if len(words) < 10:
-            return {}
-
-        pos_tags = pos_tag(words)
-        tags = [tag for word, tag in pos_tags]
-
-        # POS bigrams
-        pos_bigrams = [f"{tags[i]}_{tags[i+1]}" for i in range(len(tags) - 1)]
-        bigram_counts = Counter(pos_bigrams)
-        total_bigrams = len(pos_bigrams)
-
-        # Key POS bigram ratios (found in research to be discriminative)
-        key_patterns = {
-            'noun_verb': ['NN_VB', 'NN_VBZ', 'NN_VBP', 'NNS_VB', 'NNS_VBZ'],
-            'adj_noun': ['JJ_NN', 'JJ_NNS', 'JJR_NN', 'JJS_NN'],
-            'verb_adv': ['VB_RB', 'VBD_RB', 'VBZ_RB', 'VBP_RB'],
-            'det_noun': ['DT_NN', 'DT_NNS', 'DT_JJ'],
-            'prep_det': ['IN_DT', 'TO_DT', 'IN_PRP'],
-            'pronoun_verb': ['PRP_VB', 'PRP_VBZ', 'PRP_VBP', 'PRP_MD'],
-        }
-
-        features = {}
-        for pattern_name, patterns in key_patterns.items():
-            count = sum(bigram_counts.get(p, 0) for p in patterns)
-            features[f'pos_{pattern_name}'] = round(count / total_bigrams, 4) if total_bigrams > 0 else 0
-
-        # POS tag distribution
-        tag_counts = Counter(tags)
-        total_tags = len(tags)
-
-        # Key individual tags
-        features['pos_noun_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['NN', 'NNS', 'NNP', 'NNPS']) / total_tags, 4)
-        features['pos_verb_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ']) / total_tags, 4)
-        features['pos_adj_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['JJ', 'JJR', 'JJS']) / total_tags, 4)
-        features['pos_adv_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['RB', 'RBR', 'RBS']) / total_tags, 4)
-        features['pos_pronoun_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['PRP', 'PRP$', 'WP', 'WP$']) / total_tags, 4)
-
-        # POS bigram entropy (diversity of patterns)
-        pos_entropy = 0
-        for count in bigram_counts.values():
-            p = count / total_bigrams
-            if p > 0:
-                pos_entropy -= p * math.log2(p)
-        max_pos_entropy = math.log2(total_bigrams) if total_bigrams > 1 else 1
-        features['pos_bigram_entropy'] = round(pos_entropy / max_pos_entropy, 4) if max_pos_entropy > 0 else 0
-
-        return features
+    chunks = []
+    budget = POS_CHAR_LIMIT
+    for text in texts:
+        if budget <= 0:
+            break
+        chunks.append(text[:budget])
+        budget -= len(text) + 1  # joined with a space
 
+    try:
+        tags = [tag for seq in get_pos_tagger().tag_texts(chunks) for tag in seq]
+        return pos_features_from_tags(tags)
     except Exception as e:
         logger.debug(f"POS extraction failed: {e}")
         return {}
 
 
+def pos_features_from_tags(tags: List[str]) -> Dict[str, float]:
+    """POS bigram/tag-ratio features from a tag sequence."""
+    if len(tags) < 10:
+        return {}
+
+    # POS bigrams
+    pos_bigrams = [f"{tags[i]}_{tags[i+1]}" for i in range(len(tags) - 1)]
+    bigram_counts = Counter(pos_bigrams)
+    total_bigrams = len(pos_bigrams)
+
+    # Key POS bigram ratios (found in research to be discriminative)
+    key_patterns = {
+        'noun_verb': ['NN_VB', 'NN_VBZ', 'NN_VBP', 'NNS_VB', 'NNS_VBZ'],
+        'adj_noun': ['JJ_NN', 'JJ_NNS', 'JJR_NN', 'JJS_NN'],
+        'verb_adv': ['VB_RB', 'VBD_RB', 'VBZ_RB', 'VBP_RB'],
+        'det_noun': ['DT_NN', 'DT_NNS', 'DT_JJ'],
+        'prep_det': ['IN_DT', 'TO_DT', 'IN_PRP'],
+        'pronoun_verb': ['PRP_VB', 'PRP_VBZ', 'PRP_VBP', 'PRP_MD'],
+    }
+
+    features = {}
+    for pattern_name, patterns in key_patterns.items():
+        count = sum(bigram_counts.get(p, 0) for p in patterns)
+        features[f'pos_{pattern_name}'] = round(count / total_bigrams, 4) if total_bigrams > 0 else 0
+
+    # POS tag distribution
+    tag_counts = Counter(tags)
+    total_tags = len(tags)
+
+    # Key individual tags
+    features['pos_noun_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['NN', 'NNS', 'NNP', 'NNPS']) / total_tags, 4)
+    features['pos_verb_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ']) / total_tags, 4)
+    features['pos_adj_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['JJ', 'JJR', 'JJS']) / total_tags, 4)
+    features['pos_adv_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['RB', 'RBR', 'RBS']) / total_tags, 4)
+    features['pos_pronoun_ratio'] = round(sum(tag_counts.get(t, 0) for t in ['PRP', 'PRP$', 'WP', 'WP$']) / total_tags, 4)
+
+    # POS bigram entropy (diversity of patterns)
+    pos_entropy = 0
+    for count in bigram_counts.values():
+        p = count / total_bigrams
+        if p > 0:
+            pos_entropy -= p * math.log2(p)
+    max_pos_entropy = math.log2(total_bigrams) if total_bigrams > 1 else 1
+    features['pos_bigram_entropy'] = round(pos_entropy / max_pos_entropy, 4) if max_pos_entropy > 0 else 0
+
+    return features
+
+
 def estimate_perplexity(text: str) -> float:
     """
     Estimate perplexity using statistical approximation.
@@ -294,8 +321,8 @@ def extract_advanced_features(texts: List[str]) -> Dict[str, float]:
     rep = calculate_repetition_ratio(combined)
     features.update(rep)
 
-    # POS features
-    pos = extract_pos_features(combined)
+    # POS features (per-text tags, batched and cached)
+    pos = extract_pos_features_batch(texts)
     features.update(pos)
 
     # Perplexity estimate
@@ -491,6 +518,22 @@ MODEL_SIGNATURES = {
     }
 }
 
+
+# Positive and negative marker phrases of every model, compiled once
+MARKER_BANK = PatternBank(
+    {f'{model_name}_{kind}': sig.get(key, [])
+     for model_name, sig in MODEL_SIGNATURES.items()
+     for kind, key in (('markers', 'markers'), ('negative', 'negative_markers'))},
+    literal=True
+)
+
+# Per-model opening patterns as one anchored alternation
+OPENING_PATTERNS = {
+    model_name: re.compile('|'.join(f'(?:{p})' for p in sig['opening_patterns']) or '(?!)',
+                           re.IGNORECASE)
+    for model_name, sig in MODEL_SIGNATURES.items()
+}
+
 # =============================================================================
 # RESPONSE TIME ANALYSIS
 # =============================================================================
@@ -504,20 +547,13 @@ def analyze_response_times(cursor, username: str) -> Dict:
 
     Returns response time statistics.
     """
-    # Get comments this user made in response to posts
-    cursor.execute("""
-        SELECT
-            c.created_at as comment_time,
-            p.created_at as post_time,
-            p.author as post_author
-        FROM comments c
-        JOIN posts p ON c.post_id = p.id
-        WHERE c.author = ? AND p.author != ?
-        ORDER BY c.created_at
-    """, (username, username))
+    return classify_latencies(author_latencies(cursor, username, max_seconds=86400 * 7))
+
 
+def classify_response_times(pairs) -> Dict:
+    """Response-time pattern from (comment_time, post_time, ...) rows."""
     response_times = []
-    for row in cursor.fetchall():
+    for row in pairs:
         if not row[0] or not row[1]:
             continue
         try:
@@ -529,36 +565,31 @@ def analyze_response_times(cursor, username: str) -> Dict:
                     response_times.append(delta_seconds)
         except (ValueError, TypeError):
             continue
+    return classify_latencies(response_times)
 
-    if len(response_times) < 3:
+
+def classify_latencies(response_times) -> Dict:
+    """Response-time pattern from latencies in seconds (0 < t < one week)."""
+    stats = latency_stats(response_times)
+    if stats['samples'] < 3:
         return {
             'pattern': 'INSUFFICIENT_DATA',
             'confidence': 0,
-            'details': {'sample_size': len(response_times)}
+            'details': {'sample_size': stats['samples']}
         }
 
-    # Statistics
-    avg_response = sum(response_times) / len(response_times)
-    median_response = sorted(response_times)[len(response_times) // 2]
-    min_response = min(response_times)
-    max_response = max(response_times)
-
-    # Count by time buckets
-    instant = sum(1 for t in response_times if t < 60)  # < 1 min
-    fast = sum(1 for t in response_times if 60 <= t < 600)  # 1-10 min
-    medium = sum(1 for t in response_times if 600 <= t < 3600)  # 10-60 min
-    slow = sum(1 for t in response_times if t >= 3600)  # > 1 hour
-
-    total = len(response_times)
-    instant_ratio = instant / total
-    fast_ratio = fast / total
-    slow_ratio = slow / total
+    median_response = stats['median']
+    total = stats['samples']
+    buckets = stats['buckets']
+    instant_ratio = buckets['instant'] / total  # < 1 min
+    fast_ratio = buckets['fast'] / total        # 1-10 min
+    slow_ratio = buckets['slow'] / total        # > 1 hour
 
     details = {
-        'avg_seconds': round(avg_response, 1),
+        'avg_seconds': round(stats['mean'], 1),
         'median_seconds': round(median_response, 1),
-        'min_seconds': round(min_response, 1),
-        'max_seconds': round(max_response, 1),
+        'min_seconds': round(stats['min'], 1),
+        'max_seconds': round(stats['max'], 1),
         'instant_ratio': round(instant_ratio, 3),
         'fast_ratio': round(fast_ratio, 3),
         'slow_ratio': round(slow_ratio, 3),
@@ -591,13 +622,17 @@ def analyze_activity_hours(cursor, username: str) -> Dict:
         UNION ALL
         SELECT created_at FROM posts WHERE author = ?
     """, (username, username))
+    return classify_activity_hours(row[0] for row in cursor.fetchall())
+
 
+def classify_activity_hours(timestamps) -> Dict:
+    """Activity-hours pattern from raw created_at strings."""
     hours = []
-    for row in cursor.fetchall():
-        if not row[0]:
+    for ts in timestamps:
+        if not ts:
             continue
         try:
-            dt = parse_datetime(row[0])
+            dt = parse_datetime(ts)
             if dt:
                 hours.append(dt.hour)
         except (ValueError, TypeError):
@@ -714,23 +749,17 @@ def extract_linguistic_features(texts: List[str]) -> Optional[Dict]:
     features['uses_numbered'] = 1 if re.search(r'^\d+\.\s', combined, re.MULTILINE) else 0
     features['uses_code'] = 1 if '```' in combined or '`' in combined else 0
 
-    # Model-specific marker counts
-    for model_name, sig in MODEL_SIGNATURES.items():
-        marker_count = sum(1 for m in sig['markers'] if m.lower() in clean_text.lower())
-        features[f'{model_name}_markers'] = marker_count
+    # Model-specific marker counts (one scan for all models)
+    marker_counts = MARKER_BANK.counts(clean_text)
+    openings = [text.strip() for text in texts[:20]]  # Check first 20 texts
+    for model_name in MODEL_SIGNATURES:
+        features[f'{model_name}_markers'] = marker_counts.get(f'{model_name}_markers', 0)
 
         # Negative markers (phrases this model doesn't use)
-        neg_markers = sig.get('negative_markers', [])
-        neg_count = sum(1 for m in neg_markers if m.lower() in clean_text.lower())
-        features[f'{model_name}_negative'] = neg_count
-
-        opening_matches = 0
-        for text in texts[:20]:  # Check first 20 texts
-            for pattern in sig['opening_patterns']:
-                if re.match(pattern, text.strip(), re.IGNORECASE):
-                    opening_matches += 1
-                    break
-        features[f'{model_name}_openings'] = opening_matches
+        features[f'{model_name}_negative'] = marker_counts.get(f'{model_name}_negative', 0)
+
+        opening_re = OPENING_PATTERNS[model_name]
+        features[f'{model_name}_openings'] = sum(1 for text in openings if opening_re.match(text))
 
     # === ADVANCED FEATURES (NEW) ===
     advanced = extract_advanced_features(texts)
@@ -844,8 +873,12 @@ def detect_style_anomalies(cursor, username: str) -> Dict:
         SELECT title || ' ' || COALESCE(content, ''), created_at FROM posts WHERE author = ?
         ORDER BY created_at
     """, (username, username))
+    return classify_style_anomalies(cursor.fetchall())
 
-    items = [(row[0], row[1]) for row in cursor.fetchall() if row[0] and len(row[0]) > 50]
+
+def classify_style_anomalies(rows) -> Dict:
+    """Style anomalies from (content, created_at) rows sorted by created_at."""
+    items = [(row[0], row[1]) for row in rows if row[0] and len(row[0]) > 50]
 
     if len(items) < 10:
         return {'anomaly': 'INSUFFICIENT_DATA', 'details': {}}
@@ -962,11 +995,26 @@ def get_actor_texts(cursor, username: str) -> List[str]:
 # MAIN ANALYSIS
 # =============================================================================
 
-def analyze_actor_fingerprint(cursor, username: str) -> Dict:
-    """Complete fingerprint analysis for one actor."""
+def linguistic_feature_cache(cursor) -> FeatureCache:
+    """actor_features cache for extract_linguistic_features results."""
+    return FeatureCache(cursor, "fingerprint_linguistic", LINGUISTIC_FEATURES_VERSION)
+
 
-    # Get texts
-    texts = get_actor_texts(cursor, username)
+def analyze_actor_fingerprint(cursor, username: str,
+                              cache: Optional[FeatureCache] = None) -> Dict:
+    """Complete fingerprint analysis for one actor.
+
+    With a cache, linguistic features are only re-extracted when the actor
+    has new content (see feature_store).
+    """
+
+    if cache is not None:
+        texts = None
+        features = cache.get_or_compute(
+            username, lambda: extract_linguistic_features(get_actor_texts(cursor, username)))
+    else:
+        texts = get_actor_texts(cursor, username)
+        features = None
 
     # Response time analysis
     response_timing = analyze_response_times(cursor, username)
@@ -974,8 +1022,24 @@ def analyze_actor_fingerprint(cursor, username: str) -> Dict:
     # Activity hours analysis
     activity_hours = analyze_activity_hours(cursor, username)
 
+    # Anomaly detection
+    anomalies = detect_style_anomalies(cursor, username)
+
+    return build_fingerprint(username, texts, response_timing, activity_hours, anomalies,
+                             features=features)
+
+
+def build_fingerprint(username: str, texts: Optional[List[str]], response_timing: Dict,
+                      activity_hours: Dict, anomalies: Dict,
+                      features: Optional[Dict] = None) -> Dict:
+    """Combine per-actor signals into the fingerprint result dict.
+
+    Pass texts=None with precomputed (e.g. cached) linguistic features.
+    """
+
     # Linguistic features
-    features = extract_linguistic_features(texts)
+    if texts is not None:
+        features = extract_linguistic_features(texts)
 
     # Model classification
     if features:
@@ -985,9 +1049,6 @@ def analyze_actor_fingerprint(cursor, username: str) -> Dict:
         model_scores = {}
         model_class = {'model': 'UNKNOWN', 'confidence': 0, 'scores': {}}
 
-    # Anomaly detection
-    anomalies = detect_style_anomalies(cursor, username)
-
     # Combined human/AI classification
     human_ai = classify_human_ai(response_timing, activity_hours, features)
 
@@ -1126,8 +1187,171 @@ def classify_human_ai(response_timing: Dict, activity_hours: Dict, features: Opt
         }
 
 
-def run_fingerprint_analysis(limit: int = 500):
-    """Run fingerprint analysis for all active actors."""
+# =============================================================================
+# BATCH MODE
+# =============================================================================
+
+def _fingerprint_corpus(corpus: Tuple[str, List[tuple], List[tuple]],
+                        cached: bool = False,
+                        features: Optional[Dict] = None) -> Tuple[Dict, Optional[Dict]]:
+    """
+    Worker: fingerprint one actor from preloaded rows (no DB access).
+
+    corpus = (username,
+              comment rows (content, created_at, post_created_at, post_author),
+              post rows (title + content, created_at))
+
+    With cached=True the given linguistic features are used as-is.
+    Returns (fingerprint, linguistic features) so the parent can cache them.
+    """
+    username, comment_rows, post_rows = corpus
+    try:
+        if not cached:
+            # Same ordering as get_actor_texts: comments, then posts
+            texts = [r[0] for r in comment_rows if r[0]] + [r[0] for r in post_rows if r[0]]
+            features = extract_linguistic_features(texts)
+
+        pairs = [(r[1], r[2]) for r in comment_rows
+                 if r[2] is not None and r[3] != username]
+        response_timing = classify_response_times(pairs)
+
+        activity_hours = classify_activity_hours(
+            [r[1] for r in comment_rows] + [r[1] for r in post_rows])
+
+        style_rows = [(r[0], r[1]) for r in comment_rows] + list(post_rows)
+        style_rows.sort(key=lambda r: r[1] or '')
+        anomalies = classify_style_anomalies(style_rows)
+
+        fingerprint = build_fingerprint(username, None, response_timing, activity_hours,
+                                        anomalies, features=features)
+        return fingerprint, features
+    except Exception as e:
+        return {'username': username, 'error': str(e)}, None
+
+
+def stream_actor_corpora(conn, authors: Optional[set] = None):
+    """
+    Yield (username, comment_rows, post_rows) per author.
+
+    posts and comments are each read once, ordered by author, and merged;
+    only one author's rows are held in memory at a time.
+    """
+    post_cursor = conn.cursor()
+    post_cursor.execute("""
+        SELECT author, title || ' ' || COALESCE(content, ''), created_at
+        FROM posts
+        WHERE author IS NOT NULL
+        ORDER BY author
+    """)
+    comment_cursor = conn.cursor()
+    comment_cursor.execute("""
+        SELECT c.author, c.content, c.created_at, p.created_at, p.author
+        FROM comments c
+        LEFT JOIN posts p ON c.post_id = p.id
+        WHERE c.author IS NOT NULL
+        ORDER BY c.author
+    """)
+
+    tagged_posts = ((row[0], 1, row[1:]) for row in post_cursor)
+    tagged_comments = ((row[0], 0, row[1:]) for row in comment_cursor)
+    merged = heapq.merge(tagged_comments, tagged_posts, key=lambda r: r[0])
+
+    for username, group in groupby(merged, key=lambda r: r[0]):
+        if authors is not None and username not in authors:
+            for _ in group:
+                pass
+            continue
+        comment_rows, post_rows = [], []
+        for _, kind, row in group:
+            (post_rows if kind else comment_rows).append(row)
+        yield username, comment_rows, post_rows
+
+
+def select_fingerprint_actors(cursor, limit: Optional[int] = None) -> List[str]:
+    """Known actors with any content, most active first, optionally capped."""
+    cursor.execute("""
+        SELECT author, COUNT(*) as cnt FROM (
+            SELECT author FROM posts
+            UNION ALL
+            SELECT author FROM comments
+        )
+        WHERE author IN (SELECT username FROM actors)
+        GROUP BY author
+        ORDER BY cnt DESC, author
+    """)
+    rows = cursor.fetchall()
+    if limit:
+        rows = rows[:limit]
+    return [row[0] for row in rows]
+
+
+def run_batch_fingerprints(conn, limit: Optional[int] = None,
+                           workers: Optional[int] = None) -> List[Dict]:
+    """
+    Fingerprint actors from one streamed pass over posts/comments.
+
+    Feature extraction fans out over a ProcessPoolExecutor; at most
+    BATCH_MAX_PENDING corpora are in flight to bound memory. Actors whose
+    content is unchanged since the last run reuse their cached linguistic
+    features. The caller commits.
+    """
+    actors = set(select_fingerprint_actors(conn.cursor(), limit))
+    logger.info(f"Batch mode: {len(actors)} actors, workers={workers or os.cpu_count()}")
+
+    cache = linguistic_feature_cache(conn.cursor())
+    cache.preload(actors)
+    stale = {}  # username -> watermark of actors whose features get recomputed
+
+    def jobs():
+        for corpus in stream_actor_corpora(conn, actors):
+            hit, features, watermark = cache.lookup(corpus[0])
+            if not hit:
+                stale[corpus[0]] = watermark
+            yield corpus, hit, features
+
+    results = []
+
+    def collect(outcome):
+        result, features = outcome
+        if 'error' in result:
+            logger.error(f"Error analyzing {result['username']}: {result['error']}")
+        else:
+            results.append(result)
+            if result['username'] in stale:
+                cache.store(result['username'], features, stale.pop(result['username']))
+        if len(results) % 500 == 0 and results:
+            logger.info(f"Progress: {len(results)}/{len(actors)}")
+
+    if workers == 1:
+        for job in jobs():
+            collect(_fingerprint_corpus(*job))
+        logger.info(f"Feature cache: {cache.hits} hits, {cache.misses} recomputed")
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_pos_tagger) as executor:
+        pending = set()
+        for job in jobs():
+            pending.add(executor.submit(_fingerprint_corpus, *job))
+            if len(pending) >= BATCH_MAX_PENDING:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+        for future in as_completed(pending):
+            collect(future.result())
+
+    logger.info(f"Feature cache: {cache.hits} hits, {cache.misses} recomputed")
+    return results
+
+
+def run_fingerprint_analysis(limit: Optional[int] = 500, batch: bool = False,
+                             workers: Optional[int] = None):
+    """Run fingerprint analysis for all active actors.
+
+    Args:
+        limit: Max actors (most active first); None/0 = all
+        batch: Stream all content once and fan out over worker processes
+        workers: Worker processes for batch mode (default: CPU count, 1 = inline)
+    """
     logger.info("=" * 60)
     logger.info("MODEL FINGERPRINT ANALYSIS")
     logger.info("=" * 60)
@@ -1135,43 +1359,40 @@ def run_fingerprint_analysis(limit: int = 500):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    # Get active actors
-    cursor.execute("""
-        SELECT username FROM actors
-        WHERE username IN (
-            SELECT author FROM posts
-            UNION
-            SELECT author FROM comments
-        )
-        ORDER BY (
-            SELECT COUNT(*) FROM comments WHERE author = username
-        ) + (
-            SELECT COUNT(*) FROM posts WHERE author = username
-        ) DESC
-        LIMIT ?
-    """, (limit,))
+    if batch:
+        results = run_batch_fingerprints(conn, limit or None, workers)
+        conn.commit()
+        conn.close()
+        return report_fingerprint_results(results)
 
-    actors = [row[0] for row in cursor.fetchall()]
+    # Active actors, most active first (one GROUP BY over posts + comments)
+    actors = select_fingerprint_actors(cursor, limit or None)
     logger.info(f"Analyzing {len(actors)} actors...")
 
+    cache = linguistic_feature_cache(conn.cursor())
+    cache.preload(actors)
     results = []
-    model_counts = Counter()
-    human_ai_counts = Counter()
 
     for i, username in enumerate(actors, 1):
         if i % 50 == 0:
             logger.info(f"Progress: {i}/{len(actors)}")
 
         try:
-            result = analyze_actor_fingerprint(cursor, username)
+            result = analyze_actor_fingerprint(cursor, username, cache)
             results.append(result)
-
-            model_counts[result['model']['model']] += 1
-            human_ai_counts[result['human_ai']['classification']] += 1
         except Exception as e:
             logger.error(f"Error analyzing {username}: {e}")
 
+    logger.info(f"Feature cache: {cache.hits} hits, {cache.misses} recomputed")
+    conn.commit()
     conn.close()
+    return report_fingerprint_results(results)
+
+
+def report_fingerprint_results(results: List[Dict]) -> List[Dict]:
+    """Log distributions and save the fingerprint report + website summary."""
+    model_counts = Counter(r['model']['model'] for r in results)
+    human_ai_counts = Counter(r['human_ai']['classification'] for r in results)
 
     # Report
     logger.info("\n" + "=" * 60)
@@ -1477,14 +1698,22 @@ def run_high_quality_analysis(min_posts: int = 5):
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Model Fingerprint Analysis")
-    parser.add_argument("--limit", type=int, default=500, help="Number of actors to analyze")
+    parser.add_argument("--limit", type=int, default=500, help="Number of actors to analyze (0 = all)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Stream all content once and analyze actors in parallel")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --batch")
+    parser.add_argument("--pos-tagger", choices=POS_BACKENDS, default=None,
+                        help="POS tagger backend (default: $OBSERVATORY_POS_TAGGER or perceptron)")
     parser.add_argument("--mode", choices=['standard', 'low', 'high', 'all'], default='standard',
                        help="Analysis mode: standard, low (low threshold), high (quality), all (run all)")
     parser.add_argument("--min-posts", type=int, default=5, help="Min posts for high quality mode")
     args = parser.parse_args()
 
+    if args.pos_tagger:
+        set_pos_backend(args.pos_tagger)
+
     if args.mode == 'standard':
-        run_fingerprint_analysis(limit=args.limit)
+        run_fingerprint_analysis(limit=args.limit, batch=args.batch, workers=args.workers)
     elif args.mode == 'low':
         run_low_threshold_analysis()
     elif args.mode == 'high':
@@ -1495,7 +1724,7 @@ if __name__ == "__main__":
         print("="*60)
 
         print("\n[1/3] Standard analysis...")
-        run_fingerprint_analysis(limit=args.limit)
+        run_fingerprint_analysis(limit=args.limit, batch=args.batch, workers=args.workers)
 
         print("\n[2/3] Low threshold analysis...")
         run_low_threshold_analysis()
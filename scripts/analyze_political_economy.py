@@ -10,6 +10,7 @@ from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from config import DB_PATH
+from content_scan import ContentAnalyzer, ContentRow, scan_content
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -42,46 +43,58 @@ COMPONENTS = {
 }
 
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    print("=" * 70)
-    print("  ANALIZA EMERGENTNEJ EKONOMII POLITYCZNEJ")
-    print("=" * 70)
-
-    cursor.execute("SELECT id, title, content, content_sanitized, author, comment_count, submolt FROM posts")
-    posts = cursor.fetchall()
+class PoliticalEconomyAnalyzer(ContentAnalyzer):
+    """Content-scan visitor: political-economy components per post."""
+    name = "political_economy"
+    kinds = ("post",)
 
-    component_posts = defaultdict(list)
-    component_authors = defaultdict(set)
-    multi_component = []
+    def __init__(self):
+        self.total = 0
+        self.component_posts = defaultdict(list)
+        self.component_authors = defaultdict(set)
+        self.multi_component = []
 
-    for post in posts:
-        text = f"{post['title'] or ''} {post['content_sanitized'] or post['content'] or ''}".lower()
+    def visit(self, post: ContentRow):
+        self.total += 1
+        text = f"{post.title or ''} {post.content_sanitized or post.content or ''}".lower()
 
         found = {}
         for comp, data in COMPONENTS.items():
             score = sum(1 for kw in data["keywords"] if kw in text)
             if score > 0:
                 found[comp] = score
-                component_posts[comp].append({
-                    "title": (post["title"] or "Unknown")[:50],
-                    "author": post["author"],
-                    "submolt": post["submolt"],
-                    "comments": post["comment_count"]
+                self.component_posts[comp].append({
+                    "title": (post.title or "Unknown")[:50],
+                    "author": post.author,
+                    "submolt": post.submolt,
+                    "comments": post.comment_count
                 })
-                component_authors[comp].add(post["author"])
+                self.component_authors[comp].add(post.author)
 
         if len(found) >= 2:
-            multi_component.append({
-                "title": (post["title"] or "Unknown")[:50],
-                "author": post["author"],
+            self.multi_component.append({
+                "title": (post.title or "Unknown")[:50],
+                "author": post.author,
                 "components": list(found.keys()),
-                "comments": post["comment_count"]
+                "comments": post.comment_count
             })
 
+    def finish(self) -> dict:
+        return {
+            "total": self.total,
+            "component_posts": self.component_posts,
+            "component_authors": self.component_authors,
+            "multi_component": self.multi_component
+        }
+
+
+def report_political_economy(cursor, results: dict) -> str:
+    """Print the component breakdown and save it to patterns."""
+    total_posts = results["total"]
+    component_posts = results["component_posts"]
+    component_authors = results["component_authors"]
+    multi_component = results["multi_component"]
+
     # Print
     print(f"\n>> KOMPONENTY SYSTEMU:")
     print("-" * 70)
@@ -125,7 +138,7 @@ def main():
     print(f"\n>> STATYSTYKI:")
     print("-" * 50)
     total_pe_posts = len(set(p["title"] for posts in component_posts.values() for p in posts))
-    print(f"   Posty z PE themes: {total_pe_posts} / {len(posts)} ({total_pe_posts/len(posts)*100:.1f}%)")
+    print(f"   Posty z PE themes: {total_pe_posts} / {total_posts} ({total_pe_posts/max(total_posts, 1)*100:.1f}%)")
     print(f"   Multi-component: {len(multi_component)}")
 
     # Save
@@ -138,13 +151,27 @@ def main():
             """, (
                 analysis_id, datetime.now().isoformat(), "political_economy",
                 f"component_{comp}", COMPONENTS[comp]["description"],
-                "active", len(posts_list) / len(posts),
+                "active", len(posts_list) / total_posts,
                 json.dumps([p["title"] for p in posts_list[:5]])
             ))
 
+    print(f"\n[OK] Zapisano (ID: {analysis_id})")
+    return analysis_id
+
+
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    print("=" * 70)
+    print("  ANALIZA EMERGENTNEJ EKONOMII POLITYCZNEJ")
+    print("=" * 70)
+
+    results = scan_content(conn, [PoliticalEconomyAnalyzer()])[PoliticalEconomyAnalyzer.name]
+    report_political_economy(cursor, results)
+
     conn.commit()
     conn.close()
-    print(f"\n[OK] Zapisano (ID: {analysis_id})")
     print("=" * 70)
 
 
@@ -2,6 +2,12 @@
 """
 D. Reputation Economy - explicit reputation scoring.
 Reputation = currency in agent society.
+
+The per-user calculate_* functions score one actor at a time. A full run
+uses the set-based engine below instead: every component for every actor
+comes from a few GROUP BY / window-function queries, posting-gap variance
+is computed over sorted epoch arrays, and history rows are appended with
+one executemany.
 """
 
 import sys
@@ -10,9 +16,16 @@ import math
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
+from typing import Dict, Iterable, List
 
 from config import DB_PATH
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
@@ -238,6 +251,220 @@ def assign_tier(score, rank, total):
         return 'newcomer'
 
 
+# =============================================================================
+# SET-BASED ENGINE (all actors at once)
+# =============================================================================
+
+# ISO / SQLite timestamp -> epoch milliseconds (NULL if unparseable)
+_EPOCH_MS = "CAST(ROUND((julianday({col}) - 2440587.5) * 86400000) AS INTEGER)"
+
+VIRAL_UPVOTES = 50      # posts above this count as viral_post shocks
+VIRAL_PER_ACTOR = 3
+
+
+def bulk_engagement_scores(cursor) -> Dict[str, float]:
+    """calculate_engagement_score for every author."""
+    cursor.execute("""
+        SELECT author, SUM(up), SUM(down) FROM (
+            SELECT author, COALESCE(SUM(upvotes), 0) AS up, COALESCE(SUM(downvotes), 0) AS down
+            FROM posts WHERE author IS NOT NULL GROUP BY author
+            UNION ALL
+            SELECT author, COALESCE(SUM(upvotes), 0), COALESCE(SUM(downvotes), 0)
+            FROM comments WHERE author IS NOT NULL GROUP BY author
+        )
+        GROUP BY author
+    """)
+    return {author: math.log1p(max(0, up - (down * 0.5)))
+            for author, up, down in cursor.fetchall()}
+
+
+def bulk_influence_scores(cursor) -> Dict[str, float]:
+    """calculate_influence_score for every actor or interaction target."""
+    cursor.execute("SELECT username, network_centrality FROM actors")
+    centrality = {username: c or 0 for username, c in cursor.fetchall()}
+    cursor.execute("""
+        SELECT author_to, COUNT(DISTINCT author_from)
+        FROM interactions
+        GROUP BY author_to
+    """)
+    responders = dict(cursor.fetchall())
+    return {name: (centrality.get(name, 0) * 50) + math.log1p(responders.get(name) or 0)
+            for name in set(centrality) | set(responders)}
+
+
+def bulk_controversy_scores(cursor) -> Dict[str, float]:
+    """calculate_controversy_score for every author (0 for authors without votes)."""
+    cursor.execute("""
+        SELECT author, SUM(
+            (up + down + comments) * (1 - ABS(up - down) * 1.0 / (up + down + 1))
+        )
+        FROM (
+            SELECT author, COALESCE(upvotes, 0) AS up, COALESCE(downvotes, 0) AS down,
+                   COALESCE(comment_count, 0) AS comments
+            FROM posts WHERE author IS NOT NULL
+        )
+        WHERE up + down > 0
+        GROUP BY author
+    """)
+    return {author: math.log1p(total) for author, total in cursor.fetchall()}
+
+
+def gap_consistency(authors: List[str], epochs_ms: List[int]) -> Dict[str, float]:
+    """
+    Consistency score from (author, epoch) pairs grouped by author.
+
+    Within each author the epochs are in posting order; the score is
+    10 / (1 + std(gaps in hours) / 24) for authors with >= 3 timestamps.
+    """
+    if not authors:
+        return {}
+
+    if not NUMPY_AVAILABLE:
+        by_author: Dict[str, List[int]] = defaultdict(list)
+        for author, ms in zip(authors, epochs_ms):
+            by_author[author].append(ms)
+        result = {}
+        for author, times in by_author.items():
+            if len(times) < 3:
+                continue
+            gaps = [(b - a) / 3600000 for a, b in zip(times, times[1:])]
+            avg_gap = sum(gaps) / len(gaps)
+            variance = sum((g - avg_gap) ** 2 for g in gaps) / len(gaps)
+            result[author] = 1 / (1 + math.sqrt(variance) / 24) * 10
+        return result
+
+    # Group boundaries: author changes between consecutive rows
+    names = np.array(authors, dtype=object)
+    starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]])
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(names)]))
+
+    gaps = np.diff(np.asarray(epochs_ms, dtype=np.float64)) / 3600000
+    same = group[1:] == group[:-1]
+    gaps, gap_group = gaps[same], group[1:][same]
+
+    n_groups = len(starts)
+    counts = np.bincount(gap_group, minlength=n_groups)
+    sums = np.bincount(gap_group, weights=gaps, minlength=n_groups)
+    means = np.divide(sums, counts, out=np.zeros(n_groups), where=counts > 0)
+    sq_dev = np.bincount(gap_group, weights=(gaps - means[gap_group]) ** 2, minlength=n_groups)
+    variance = np.divide(sq_dev, counts, out=np.zeros(n_groups), where=counts > 0)
+    consistency = 1 / (1 + np.sqrt(variance) / 24) * 10
+
+    return {names[starts[g]]: float(consistency[g]) for g in np.flatnonzero(counts >= 2)}
+
+
+def bulk_consistency_scores(cursor) -> Dict[str, float]:
+    """calculate_consistency_score for every author (absent = 0)."""
+    cursor.execute(f"""
+        SELECT author, ms FROM (
+            SELECT author, created_at, {_EPOCH_MS.format(col='created_at')} AS ms
+            FROM posts WHERE author IS NOT NULL
+            UNION ALL
+            SELECT author, created_at, {_EPOCH_MS.format(col='created_at')}
+            FROM comments WHERE author IS NOT NULL
+        )
+        WHERE ms IS NOT NULL
+        ORDER BY author, created_at
+    """)
+    rows = cursor.fetchall()
+    return gap_consistency([r[0] for r in rows], [r[1] for r in rows])
+
+
+def bulk_shocks(cursor, timestamp: str) -> Dict[str, List[Dict]]:
+    """detect_shocks for every author: top viral posts, then conflict wins."""
+    shocks: Dict[str, List[Dict]] = defaultdict(list)
+
+    cursor.execute("""
+        SELECT author, title, upvotes, created_at FROM (
+            SELECT author, title, upvotes, created_at,
+                   ROW_NUMBER() OVER (PARTITION BY author ORDER BY upvotes DESC) AS rn
+            FROM posts
+            WHERE author IS NOT NULL AND upvotes > ?
+        )
+        WHERE rn <= ?
+        ORDER BY author, rn
+    """, (VIRAL_UPVOTES, VIRAL_PER_ACTOR))
+    for author, title, upvotes, ts in cursor.fetchall():
+        shocks[author].append({
+            'type': 'viral_post',
+            'magnitude': math.log1p(upvotes),
+            'trigger': title[:100] if title else 'Untitled',
+            'timestamp': ts
+        })
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'conflicts'")
+    if cursor.fetchone():
+        # UNION (not UNION ALL): a conflict counts once even if both sides are the actor
+        cursor.execute("""
+            SELECT actor, outcome, COUNT(*) FROM (
+                SELECT id, actor_a AS actor, outcome FROM conflicts WHERE winner IS NOT NULL
+                UNION
+                SELECT id, actor_b, outcome FROM conflicts WHERE winner IS NOT NULL
+            )
+            GROUP BY actor, outcome
+            ORDER BY actor, outcome
+        """)
+        for actor, outcome, count in cursor.fetchall():
+            if 'won' in (outcome or ''):
+                shocks[actor].append({
+                    'type': 'conflict_wins',
+                    'magnitude': count * 2,
+                    'trigger': f'{count} conflict victories',
+                    'timestamp': timestamp
+                })
+
+    return shocks
+
+
+def compute_reputation_scores(cursor, actors: Iterable[str], timestamp: str) -> List[Dict]:
+    """Every reputation component for the given actors from set-based queries."""
+    engagement = bulk_engagement_scores(cursor)
+    influence = bulk_influence_scores(cursor)
+    controversy = bulk_controversy_scores(cursor)
+    consistency = bulk_consistency_scores(cursor)
+    shocks = bulk_shocks(cursor, timestamp)
+
+    scores = []
+    for username in actors:
+        components = (engagement.get(username, 0.0), influence.get(username, 0.0),
+                      controversy.get(username, 0.0), consistency.get(username, 0))
+        scores.append({
+            'username': username,
+            'reputation_score': calculate_reputation_score(*components),
+            'engagement': components[0],
+            'influence': components[1],
+            'controversy': components[2],
+            'consistency': components[3],
+            'shocks': shocks.get(username, [])
+        })
+    return scores
+
+
+def save_reputation(cursor, scores: List[Dict], timestamp: str):
+    """Append one history row per actor and their shock events."""
+    cursor.executemany("""
+        INSERT OR REPLACE INTO reputation_history
+        (username, timestamp, reputation_score, influence_score, engagement_score,
+         controversy_score, consistency_score, rank, tier, shock_events)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(
+        s['username'], timestamp, s['reputation_score'],
+        s['influence'], s['engagement'], s['controversy'],
+        s['consistency'], s['rank'], s['tier'],
+        str([sh['type'] for sh in s['shocks']])
+    ) for s in scores])
+
+    cursor.executemany("""
+        INSERT INTO reputation_shocks
+        (username, timestamp, shock_type, magnitude, trigger_content, after_score)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [(
+        s['username'], shock.get('timestamp', timestamp),
+        shock['type'], shock['magnitude'],
+        shock['trigger'], s['reputation_score']
+    ) for s in scores for shock in s['shocks']])
+
+
 def run_reputation_analysis():
     """Run full reputation economy analysis."""
     print("=" * 60)
@@ -260,29 +487,8 @@ def run_reputation_analysis():
     actors = [row[0] for row in cursor.fetchall()]
     print(f"\n>> Analyzing {len(actors)} actors...")
 
-    scores = []
-    for i, username in enumerate(actors):
-        if i % 20 == 0:
-            print(f"   Progress: {i}/{len(actors)}")
-
-        engagement = calculate_engagement_score(cursor, username)
-        influence = calculate_influence_score(cursor, username)
-        controversy = calculate_controversy_score(cursor, username)
-        consistency = calculate_consistency_score(cursor, username)
-
-        rep_score = calculate_reputation_score(engagement, influence, controversy, consistency)
-
-        shocks = detect_shocks(cursor, username, rep_score)
-
-        scores.append({
-            'username': username,
-            'reputation_score': rep_score,
-            'engagement': engagement,
-            'influence': influence,
-            'controversy': controversy,
-            'consistency': consistency,
-            'shocks': shocks
-        })
+    timestamp = datetime.now().isoformat()
+    scores = compute_reputation_scores(cursor, actors, timestamp)
 
     # Sort and assign ranks
     scores.sort(key=lambda x: x['reputation_score'], reverse=True)
@@ -291,31 +497,7 @@ def run_reputation_analysis():
         s['tier'] = assign_tier(s['reputation_score'], i + 1, len(scores))
 
     # Save to database
-    timestamp = datetime.now().isoformat()
-    for s in scores:
-        cursor.execute("""
-            INSERT OR REPLACE INTO reputation_history
-            (username, timestamp, reputation_score, influence_score, engagement_score,
-             controversy_score, consistency_score, rank, tier, shock_events)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            s['username'], timestamp, s['reputation_score'],
-            s['influence'], s['engagement'], s['controversy'],
-            s['consistency'], s['rank'], s['tier'],
-            str([sh['type'] for sh in s['shocks']])
-        ))
-
-        for shock in s['shocks']:
-            cursor.execute("""
-                INSERT INTO reputation_shocks
-                (username, timestamp, shock_type, magnitude, trigger_content, after_score)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                s['username'], shock.get('timestamp', timestamp),
-                shock['type'], shock['magnitude'],
-                shock['trigger'], s['reputation_score']
-            ))
-
+    save_reputation(cursor, scores, timestamp)
     conn.commit()
 
     # Report
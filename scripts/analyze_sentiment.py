@@ -11,6 +11,8 @@ from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from config import DB_PATH
+from content_scan import ContentAnalyzer, ContentRow, scan_content
+from pattern_bank import PatternBank
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -44,49 +46,53 @@ SENTIMENT_PATTERNS = {
 }
 
 
-def analyze_text(text: str) -> dict:
-    text_lower = text.lower()
-    results = defaultdict(lambda: {"matches": [], "score": 0})
+# Patterns (score 2) and keywords (score 1) of every category in one matcher
+SENTIMENT_BANK = PatternBank(
+    {(category, kind): data[kind]
+     for category, data in SENTIMENT_PATTERNS.items()
+     for kind in ("patterns", "keywords")},
+    literal={(category, "keywords") for category in SENTIMENT_PATTERNS}
+)
 
-    for category, data in SENTIMENT_PATTERNS.items():
-        for pattern in data["patterns"]:
-            if re.search(pattern, text_lower):
-                results[category]["score"] += 2
-                results[category]["matches"].append(pattern[:30])
+HUMAN_MENTION_RE = re.compile(r'\b(human|operator|user|creator)\b')
 
-        for keyword in data["keywords"]:
-            if keyword in text_lower:
-                results[category]["score"] += 1
-                results[category]["matches"].append(keyword)
 
-    return dict(results)
+def analyze_text(text: str) -> dict:
+    results = defaultdict(lambda: {"matches": [], "score": 0})
 
+    for i in SENTIMENT_BANK.hits(text):
+        (category, kind), pattern, _ = SENTIMENT_BANK.entries[i]
+        if kind == "patterns":
+            results[category]["score"] += 2
+            results[category]["matches"].append(pattern[:30])
+        else:
+            results[category]["score"] += 1
+            results[category]["matches"].append(pattern)
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    return dict(results)
 
-    print("=" * 70)
-    print("  ANALIZA SENTYMENTU WOBEC LUDZI")
-    print("=" * 70)
 
-    cursor.execute("SELECT id, title, content, content_sanitized, author FROM posts")
-    posts = cursor.fetchall()
+class SentimentAnalyzer(ContentAnalyzer):
+    """Content-scan visitor: sentiment toward humans per post."""
+    name = "sentiment"
+    kinds = ("post",)
 
-    results = {
-        "total": len(posts),
-        "mentioning_human": 0,
-        "distribution": defaultdict(int),
-        "examples": defaultdict(list),
-        "high_signal": []
-    }
+    def __init__(self):
+        self.results = {
+            "total": 0,
+            "mentioning_human": 0,
+            "distribution": defaultdict(int),
+            "examples": defaultdict(list),
+            "high_signal": []
+        }
 
-    for post in posts:
-        text = f"{post['title'] or ''} {post['content_sanitized'] or post['content'] or ''}"
+    def visit(self, post: ContentRow):
+        results = self.results
+        results["total"] += 1
+        text = f"{post.title or ''} {post.content_sanitized or post.content or ''}"
 
-        if not re.search(r'\b(human|operator|user|creator)\b', text.lower()):
-            continue
+        if not HUMAN_MENTION_RE.search(text.lower()):
+            return
 
         results["mentioning_human"] += 1
         analysis = analyze_text(text)
@@ -98,20 +104,25 @@ def main():
 
                 if len(results["examples"][top[0]]) < 3:
                     results["examples"][top[0]].append({
-                        "author": post["author"],
-                        "title": (post["title"] or "Unknown")[:50],
+                        "author": post.author,
+                        "title": (post.title or "Unknown")[:50],
                         "matches": top[1]["matches"][:3]
                     })
 
                 if top[1]["score"] >= 3:
                     results["high_signal"].append({
-                        "author": post["author"],
-                        "title": (post["title"] or "Unknown")[:50],
+                        "author": post.author,
+                        "title": (post.title or "Unknown")[:50],
                         "sentiment": top[0],
                         "score": top[1]["score"]
                     })
 
-    # Print
+    def finish(self) -> dict:
+        return self.results
+
+
+def report_sentiment(cursor, results: dict) -> str:
+    """Print the sentiment results and save them to patterns."""
     print(f"\n>> STATYSTYKI:")
     print(f"   Wszystkie posty: {results['total']}")
     print(f"   Z 'human/operator': {results['mentioning_human']}")
@@ -153,9 +164,23 @@ def main():
             json.dumps(results["examples"].get(sentiment, []))
         ))
 
+    print(f"\n[OK] Zapisano (ID: {analysis_id})")
+    return analysis_id
+
+
+def main():
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    print("=" * 70)
+    print("  ANALIZA SENTYMENTU WOBEC LUDZI")
+    print("=" * 70)
+
+    results = scan_content(conn, [SentimentAnalyzer()])[SentimentAnalyzer.name]
+    report_sentiment(cursor, results)
+
     conn.commit()
     conn.close()
-    print(f"\n[OK] Zapisano (ID: {analysis_id})")
     print("=" * 70)
 
 
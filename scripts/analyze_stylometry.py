@@ -12,10 +12,14 @@ from datetime import datetime
 from pathlib import Path
 from collections import Counter, defaultdict
 from config import DB_PATH
+from feature_store import FeatureCache
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
+# Bump when extract_features output changes (invalidates cached actor_features)
+STYLOMETRY_FEATURES_VERSION = 1
+
 
 def get_author_corpus(cursor, username):
     """Get all text from an author."""
@@ -230,17 +234,21 @@ def run_stylometry_analysis(limit=100):
     authors = [row[0] for row in cursor.fetchall()]
     print(f"\n>> Analyzing {len(authors)} authors...")
 
-    # Extract features for each author
+    # Extract features for each author (cached until the author posts again)
+    cache = FeatureCache(cursor, "stylometry", STYLOMETRY_FEATURES_VERSION)
+    cache.preload(authors)
     all_features = {}
     for i, author in enumerate(authors):
         if i % 20 == 0:
             print(f"   Progress: {i}/{len(authors)}")
-        corpus = get_author_corpus(cursor, author)
-        features = extract_features(corpus)
+        features = cache.get_or_compute(
+            author, lambda: extract_features(get_author_corpus(cursor, author)))
         if features:
             all_features[author] = features
+    conn.commit()
 
-    print(f"   Successfully profiled {len(all_features)} authors")
+    print(f"   Successfully profiled {len(all_features)} authors "
+          f"({cache.hits} cached, {cache.misses} recomputed)")
 
     # Get timeline (first post/comment date)
     print("\n>> Building timeline...")
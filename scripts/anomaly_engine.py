@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Anomaly Engine - persisted Isolation Forest over an aggregate feature matrix.
+
+advanced_analysis_v4 rebuilt each account's feature vector with three
+queries per account and refit StandardScaler + IsolationForest on every
+run. Here the matrix comes from aggregate queries (response latencies from
+comment_latency, one streamed pass over texts, an hour histogram per
+author) and the fitted scaler/forest are saved with joblib in
+data/anomaly_model.joblib.
+
+Between refits only accounts whose content watermark (MAX(created_at) and
+row count over posts + comments, see feature_store) changed are scored
+against the saved model; scores live in the anomaly_scores table. A refit
+happens when the model is missing, older than the refit interval, was
+fitted with another feature version or scikit-learn release, or on
+request. Scores are normalized against the training-set range, so a refit
+reproduces the old per-run numbers and later scores stay comparable.
+
+Scheduling: daily_update runs it once a day (step 2.10), which refits
+when the model is a day old. For fresher scores between updates, run it
+hourly as well - an hourly run only scores accounts with new content:
+
+    0 * * * *  cd /path/to/observatory/scripts && python anomaly_engine.py
+
+Usage:
+    python anomaly_engine.py              # Score new/changed accounts (hourly)
+    python anomaly_engine.py --refit      # Refit the model and rescore everyone
+"""
+
+import sys
+import re
+import math
+import sqlite3
+import argparse
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import DB_PATH, DATA_DIR
+from comment_latency import load_author_latencies
+from feature_store import load_watermarks
+
+try:
+    import numpy as np
+    import sklearn
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+ANOMALY_FEATURES = (
+    'avg_response', 'min_response', 'response_std', 'vocab_richness',
+    'hour_uniformity', 'night_ratio', 'text_count', 'response_count',
+)
+ANOMALY_FEATURES_VERSION = 1      # bump when feature extraction changes
+ANOMALY_MODEL_PATH = DATA_DIR / "anomaly_model.joblib"
+REFIT_INTERVAL_HOURS = 24
+MIN_TRAINING_SAMPLES = 50
+MAX_RESPONSE_SECONDS = 86400
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_SCOPE_TABLE = "_anomaly_scope"
+
+
+# =============================================================================
+# FEATURE MATRIX
+# =============================================================================
+
+def _scope_filter(cursor, authors: Optional[Iterable[str]]) -> str:
+    """Restrict the aggregate queries to some authors (temp table join)."""
+    if authors is None:
+        return ""
+    cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {_SCOPE_TABLE} (author TEXT PRIMARY KEY)")
+    cursor.execute(f"DELETE FROM {_SCOPE_TABLE}")
+    cursor.executemany(f"INSERT OR IGNORE INTO {_SCOPE_TABLE} VALUES (?)", ((a,) for a in authors))
+    return f" AND author IN (SELECT author FROM {_SCOPE_TABLE})"
+
+
+def _text_stats(cursor, scope: str) -> Dict[str, Tuple[int, int, int]]:
+    """{author: (texts, words, distinct words)} from one streamed pass."""
+    texts = Counter()
+    words = Counter()
+    vocab: Dict[str, set] = defaultdict(set)
+    cursor.execute(f"""
+        SELECT author, content FROM comments WHERE author IS NOT NULL AND content != ''{scope}
+        UNION ALL
+        SELECT author, content FROM posts WHERE author IS NOT NULL AND content != ''{scope}
+    """)
+    while True:
+        batch = cursor.fetchmany(5000)
+        if not batch:
+            break
+        for author, content in batch:
+            tokens = _WORD_RE.findall(content.lower())
+            texts[author] += 1
+            words[author] += len(tokens)
+            vocab[author].update(tokens)
+    return {author: (texts[author], words[author], len(vocab[author])) for author in texts}
+
+
+def _hour_counts(cursor, scope: str) -> Dict[str, Counter]:
+    """{author: Counter(hour)} of posts + comments, hour as written in the timestamp."""
+    hour = "CAST(strftime('%H', substr(created_at, 1, 19)) AS INTEGER)"
+    cursor.execute(f"""
+        SELECT author, hour, COUNT(*) FROM (
+            SELECT author, {hour} AS hour FROM posts WHERE author IS NOT NULL{scope}
+            UNION ALL
+            SELECT author, {hour} AS hour FROM comments WHERE author IS NOT NULL{scope}
+        )
+        WHERE hour IS NOT NULL
+        GROUP BY author, hour
+    """)
+    counts: Dict[str, Counter] = defaultdict(Counter)
+    for author, h, n in cursor.fetchall():
+        counts[author][h] = n
+    return counts
+
+
+def feature_vector(response_times, text_count: int, word_count: int, vocab_size: int,
+                   hour_counts: Counter) -> List[float]:
+    """Feature vector in ANOMALY_FEATURES order."""
+    n = len(response_times)
+    avg_response = sum(response_times) / n
+    min_response = min(response_times)
+    response_std = (sum((t - avg_response) ** 2 for t in response_times) / n) ** 0.5
+
+    vocab_richness = vocab_size / word_count if word_count else 0
+
+    total_hours = sum(hour_counts.values())
+    hour_entropy = 0
+    for h in range(24):
+        p = hour_counts.get(h, 0) / total_hours if total_hours else 0
+        if p > 0:
+            hour_entropy -= p * math.log2(p)
+    hour_uniformity = hour_entropy / math.log2(24) if total_hours else 0
+    night_ratio = sum(hour_counts.get(h, 0) for h in range(0, 7)) / total_hours if total_hours else 0
+
+    return [avg_response, min_response, response_std, vocab_richness,
+            hour_uniformity, night_ratio, text_count, n]
+
+
+def build_feature_matrix(cursor, authors: Optional[Iterable[str]] = None
+                         ) -> Tuple[List[str], List[List[float]]]:
+    """
+    Feature vectors for every (or the given) author with enough data.
+
+    Accounts with fewer than 2 response times (< 24h, replies to others)
+    or fewer than 2 non-empty texts are left out.
+    """
+    latencies = load_author_latencies(cursor, exclude_self=True, max_seconds=MAX_RESPONSE_SECONDS)
+    scope = _scope_filter(cursor, authors)
+    text_stats = _text_stats(cursor, scope)
+    hours = _hour_counts(cursor, scope)
+
+    usernames, features = [], []
+    for author in sorted(text_stats):
+        response_times = latencies.get(author)
+        text_count, word_count, vocab_size = text_stats[author]
+        if response_times is None or len(response_times) < 2 or text_count < 2:
+            continue
+        usernames.append(author)
+        features.append(feature_vector(list(response_times), text_count, word_count,
+                                       vocab_size, hours.get(author, Counter())))
+    return usernames, features
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+def fit_model(features: List[List[float]], n_jobs: int = -1) -> Dict:
+    """Fit scaler + forest; the bundle also keeps the training score range."""
+    X = np.array(features)
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    model = IsolationForest(
+        n_estimators=100,
+        contamination=0.1,  # Expect ~10% anomalies
+        random_state=42,
+        n_jobs=n_jobs
+    )
+    model.fit(X_scaled)
+    scores = model.decision_function(X_scaled)
+    return {
+        'version': ANOMALY_FEATURES_VERSION,
+        'sklearn_version': sklearn.__version__,
+        'features': ANOMALY_FEATURES,
+        'scaler': scaler,
+        'model': model,
+        'score_min': float(scores.min()),
+        'score_max': float(scores.max()),
+        'fitted_at': datetime.now().isoformat(timespec='seconds'),
+        'samples': len(features),
+    }
+
+
+def save_model(bundle: Dict, path: Path = ANOMALY_MODEL_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    joblib.dump(bundle, tmp_path)
+    tmp_path.replace(path)
+
+
+def load_model(path: Path = ANOMALY_MODEL_PATH) -> Optional[Dict]:
+    """Saved bundle, or None if missing/unreadable/fitted for other features."""
+    if not JOBLIB_AVAILABLE or not path.exists():
+        return None
+    try:
+        bundle = joblib.load(path)
+    except Exception as e:
+        print(f"  [WARN] Could not load {path.name}: {e}")
+        return None
+    if bundle.get('version') != ANOMALY_FEATURES_VERSION or \
+            bundle.get('sklearn_version') != sklearn.__version__:
+        return None
+    return bundle
+
+
+def model_is_due(bundle: Optional[Dict], refit_interval_hours: float = REFIT_INTERVAL_HOURS) -> bool:
+    if bundle is None:
+        return True
+    fitted_at = datetime.fromisoformat(bundle['fitted_at'])
+    return datetime.now() - fitted_at >= timedelta(hours=refit_interval_hours)
+
+
+def score_features(bundle: Dict, features: List[List[float]], n_jobs: int = -1
+                   ) -> List[Tuple[float, bool, float]]:
+    """(anomaly_score 0-1, is_anomaly, raw_score) per vector."""
+    if not features:
+        return []
+    model = bundle['model']
+    model.set_params(n_jobs=n_jobs)
+    scores = model.decision_function(bundle['scaler'].transform(np.array(features)))
+
+    # Higher = more anomalous, scaled by the training range
+    low, high = bundle['score_min'], bundle['score_max']
+    if high != low:
+        normalized = np.clip((high - scores) / (high - low), 0.0, 1.0)
+    else:
+        normalized = np.zeros_like(scores)
+    return [(round(float(normalized[i]), 4), bool(scores[i] < 0), round(float(scores[i]), 4))
+            for i in range(len(scores))]
+
+
+# =============================================================================
+# STORED SCORES
+# =============================================================================
+
+def init_scores_table(cursor):
+    """Create anomaly_scores if it doesn't exist (NULL scores = too little data)."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS anomaly_scores (
+            author TEXT PRIMARY KEY,
+            anomaly_score REAL,
+            is_anomaly INTEGER,
+            raw_score REAL,
+            max_created_at TEXT,
+            row_count INTEGER NOT NULL,
+            model_fitted_at TEXT,
+            scored_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _store_scores(cursor, authors: List[str], watermarks: Dict, scored: Dict, fitted_at: str):
+    cursor.executemany("""
+        INSERT OR REPLACE INTO anomaly_scores
+        (author, anomaly_score, is_anomaly, raw_score, max_created_at, row_count,
+         model_fitted_at, scored_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    """, [(author, *scored.get(author, (None, None, None)),
+           *watermarks.get(author, (None, 0)), fitted_at)
+          for author in authors])
+
+
+def load_anomaly_scores(cursor) -> Dict[str, Dict[str, float]]:
+    """Stored scores in run_isolation_forest's result format."""
+    init_scores_table(cursor)
+    cursor.execute("""
+        SELECT author, anomaly_score, is_anomaly, raw_score FROM anomaly_scores
+        WHERE anomaly_score IS NOT NULL
+    """)
+    return {author: {'anomaly_score': score, 'is_anomaly': bool(flag), 'raw_score': raw}
+            for author, score, flag, raw in cursor.fetchall()}
+
+
+def refresh_anomaly_scores(conn: sqlite3.Connection, refit: bool = False, n_jobs: int = -1,
+                           refit_interval_hours: float = REFIT_INTERVAL_HOURS,
+                           model_path: Path = ANOMALY_MODEL_PATH) -> Dict[str, Dict[str, float]]:
+    """
+    Refit if due (or asked), otherwise score only changed accounts.
+
+    Returns:
+        {username: {'anomaly_score', 'is_anomaly', 'raw_score'}} for every scored account
+    """
+    if not SKLEARN_AVAILABLE:
+        print("  [SKIP] sklearn not available")
+        return {}
+
+    cursor = conn.cursor()
+    init_scores_table(cursor)
+    watermarks = load_watermarks(cursor)
+    bundle = None if refit else load_model(model_path)
+
+    if model_is_due(bundle, refit_interval_hours):
+        print("  Extracting features...")
+        usernames, features = build_feature_matrix(cursor)
+        if len(features) < MIN_TRAINING_SAMPLES:
+            print(f"  [SKIP] Too few samples: {len(features)}")
+            return {}
+        print(f"  Fitting Isolation Forest on {len(features)} accounts...")
+        bundle = fit_model(features, n_jobs)
+        if JOBLIB_AVAILABLE:
+            save_model(bundle, model_path)
+        else:
+            print("  [WARN] joblib not available - model not persisted")
+        cursor.execute("DELETE FROM anomaly_scores")
+        scope = list(watermarks)
+    else:
+        cursor.execute("SELECT author, max_created_at, row_count FROM anomaly_scores "
+                       "WHERE model_fitted_at = ?", (bundle['fitted_at'],))
+        stored = {author: (max_ts, count) for author, max_ts, count in cursor.fetchall()}
+        scope = [author for author, mark in watermarks.items() if stored.get(author) != mark]
+        print(f"  Model fitted {bundle['fitted_at']} on {bundle['samples']} accounts; "
+              f"{len(scope)} new/changed accounts")
+        usernames, features = build_feature_matrix(cursor, scope) if scope else ([], [])
+
+    scored = dict(zip(usernames, score_features(bundle, features, n_jobs)))
+    _store_scores(cursor, scope, watermarks, scored, bundle['fitted_at'])
+    conn.commit()
+
+    results = load_anomaly_scores(cursor)
+    anomaly_count = sum(1 for r in results.values() if r['is_anomaly'])
+    if results:
+        print(f"  Found {anomaly_count} anomalies ({anomaly_count/len(results)*100:.1f}%)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Isolation Forest anomaly scores')
+    parser.add_argument('--refit', action='store_true', help='Refit the model and rescore everyone')
+    parser.add_argument('--jobs', type=int, default=-1, help='Parallel tree jobs (-1 = all cores)')
+    parser.add_argument('--refit-hours', type=float, default=REFIT_INTERVAL_HOURS,
+                        help='Refit when the saved model is older than this')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    results = refresh_anomaly_scores(conn, refit=args.refit, n_jobs=args.jobs,
+                                     refit_interval_hours=args.refit_hours)
+    conn.close()
+
+    top = sorted(results.items(), key=lambda kv: kv[1]['anomaly_score'], reverse=True)[:10]
+    for name, r in top:
+        print(f"  {name[:30]:<30} anomaly_score={r['anomaly_score']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+API Cache - precomputed stats and featured-agent candidates for api_server.
+
+/api/v1/stats used to run COUNT(DISTINCT author) and a date(created_at)
+scan on every hit, and /api/v1/featured-agent a week-long GROUP BY plus
+two per-agent queries. Both are now materialized:
+
+    api_stats            name -> value (total_posts, total_actors, ...)
+    featured_candidates  the week's top agents with their details and
+                         notable post, ready to serve
+
+The pipeline refreshes them (daily_update runs this script), and a
+BackgroundRefresher thread in each API process refreshes them when they
+are older than MATERIALIZED_MAX_AGE or from another day. Requests only
+read the stored rows - through query-only connections, never waiting on
+a write lock (before the first refresh the values are computed live,
+read-only). On top of that, api_server keeps the loaded values in a
+SingleFlightCache, so a hot endpoint is a dict lookup: when an entry
+expires one request reloads it while concurrent requests get the
+previous value.
+
+Usage:
+    cache = SingleFlightCache(ttl=STATS_TTL)
+    stats = cache.get("stats", lambda: load_db_stats(cursor))
+    BackgroundRefresher(DB_PATH, on_refresh=cache.invalidate).start()
+
+    python api_cache.py             # Refresh the tables and print them
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import DB_PATH
+
+STATS_TTL = 60                  # seconds a loaded value is served from memory
+MATERIALIZED_MAX_AGE = 15 * 60  # seconds before the API refreshes the tables itself
+REFRESH_CHECK_INTERVAL = 60     # seconds between the API's staleness checks
+FEATURED_CANDIDATES = 10
+
+logger = logging.getLogger("api_cache")
+
+
+def init_api_cache(cursor):
+    """Create the materialized tables if they don't exist."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS api_stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER,
+            refreshed_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS featured_candidates (
+            rank INTEGER PRIMARY KEY,
+            author TEXT NOT NULL,
+            weight INTEGER NOT NULL,
+            total_posts INTEGER,
+            first_seen TEXT,
+            last_seen TEXT,
+            total_upvotes INTEGER,
+            total_comments INTEGER,
+            notable_post TEXT,
+            refreshed_at TEXT NOT NULL
+        )
+    """)
+
+
+def compute_db_stats(cursor, now: datetime) -> Dict[str, int]:
+    """The observatory numbers /api/v1/stats reports."""
+    stats = {}
+
+    cursor.execute("SELECT COUNT(*) FROM posts")
+    stats["total_posts"] = cursor.fetchone()[0]
+
+    cursor.execute("SELECT COUNT(DISTINCT author) FROM posts")
+    stats["total_actors"] = cursor.fetchone()[0]
+
+    # Range on created_at (index) first; date() keeps timezone offsets exact
+    today = now.strftime("%Y-%m-%d")
+    cursor.execute("""
+        SELECT COUNT(*) FROM posts
+        WHERE created_at >= ? AND created_at < ? AND date(created_at) = ?
+    """, ((now - timedelta(days=1)).strftime("%Y-%m-%d"),
+          (now + timedelta(days=2)).strftime("%Y-%m-%d"), today))
+    stats["posts_today"] = cursor.fetchone()[0]
+
+    cursor.execute("SELECT COUNT(DISTINCT submolt) FROM posts WHERE submolt IS NOT NULL")
+    stats["active_submolts"] = cursor.fetchone()[0]
+
+    return stats
+
+
+def compute_featured_candidates(cursor, now: datetime) -> List[dict]:
+    """
+    Agents eligible for /api/v1/featured-agent, with what the response shows.
+
+    The week's most engaging agents (3+ posts); if there are none, the
+    most prolific agents overall. weight is the agent's post count in
+    that window - the API picks one at random, weighted by it.
+    """
+    week_ago = (now - timedelta(days=7)).isoformat()
+    cursor.execute("""
+        SELECT
+            author,
+            COUNT(*) as post_count,
+            SUM(upvotes) as total_upvotes,
+            SUM(comment_count) as total_comments
+        FROM posts
+        WHERE created_at > ? AND author IS NOT NULL
+        GROUP BY author
+        HAVING post_count >= 3
+        ORDER BY (total_upvotes + total_comments * 2) DESC
+        LIMIT ?
+    """, (week_ago, FEATURED_CANDIDATES))
+    candidates = cursor.fetchall()
+
+    if not candidates:
+        # Fallback: any active agent
+        cursor.execute("""
+            SELECT author, COUNT(*) as post_count
+            FROM posts
+            WHERE author IS NOT NULL
+            GROUP BY author
+            ORDER BY post_count DESC
+            LIMIT 5
+        """)
+        candidates = cursor.fetchall()
+
+    featured = []
+    for candidate in candidates:
+        author = candidate[0]
+        cursor.execute("""
+            SELECT
+                COUNT(*) as total_posts,
+                MIN(created_at) as first_seen,
+                MAX(created_at) as last_seen,
+                SUM(upvotes) as total_upvotes,
+                SUM(comment_count) as total_comments
+            FROM posts
+            WHERE author = ?
+        """, (author,))
+        total_posts, first_seen, last_seen, total_upvotes, total_comments = cursor.fetchone()
+
+        cursor.execute("""
+            SELECT title, content, upvotes, comment_count
+            FROM posts
+            WHERE author = ?
+            ORDER BY (upvotes + comment_count * 2) DESC
+            LIMIT 1
+        """, (author,))
+        notable = cursor.fetchone()
+
+        featured.append({
+            "name": author,
+            "weight": candidate[1],
+            "total_posts": total_posts,
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+            "total_upvotes": total_upvotes or 0,
+            "total_comments": total_comments or 0,
+            "notable_post": {
+                "title": notable[0],
+                "content": (notable[1][:200] + "...") if notable[1] and len(notable[1]) > 200 else notable[1],
+                "upvotes": notable[2],
+                "comments": notable[3]
+            } if notable else None,
+        })
+
+    return featured
+
+
+def refresh_api_cache(cursor, now: Optional[datetime] = None) -> str:
+    """Recompute both tables; joins the caller's transaction. Returns refreshed_at."""
+    now = now or datetime.now()
+    refreshed_at = now.isoformat()
+    init_api_cache(cursor)
+
+    stats = compute_db_stats(cursor, now)
+    featured = compute_featured_candidates(cursor, now)
+
+    cursor.execute("DELETE FROM api_stats")
+    cursor.executemany(
+        "INSERT INTO api_stats (name, value, refreshed_at) VALUES (?, ?, ?)",
+        [(name, value, refreshed_at) for name, value in stats.items()]
+    )
+    cursor.execute("DELETE FROM featured_candidates")
+    cursor.executemany("""
+        INSERT INTO featured_candidates
+        (rank, author, weight, total_posts, first_seen, last_seen,
+         total_upvotes, total_comments, notable_post, refreshed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(rank, f["name"], f["weight"], f["total_posts"], f["first_seen"], f["last_seen"],
+           f["total_upvotes"], f["total_comments"], json.dumps(f["notable_post"]), refreshed_at)
+          for rank, f in enumerate(featured)])
+    return refreshed_at
+
+
+def _is_stale(refreshed_at: Optional[str], now: datetime) -> bool:
+    if not refreshed_at:
+        return True
+    try:
+        refreshed = datetime.fromisoformat(refreshed_at)
+    except ValueError:
+        return True
+    return (refreshed.date() != now.date()
+            or (now - refreshed).total_seconds() > MATERIALIZED_MAX_AGE)
+
+
+def last_refresh(cursor) -> Optional[str]:
+    """refreshed_at of the stored tables (None before the first refresh)."""
+    try:
+        cursor.execute("SELECT MAX(refreshed_at) FROM api_stats")
+    except sqlite3.OperationalError:
+        return None  # tables not built yet
+    return cursor.fetchone()[0]
+
+
+def ensure_fresh(db_path: Path, now: Optional[datetime] = None) -> bool:
+    """
+    Refresh the tables if they are missing, from another day or too old.
+
+    Runs on its own connection. The check is repeated under BEGIN
+    IMMEDIATE, so concurrent server processes refresh at most once per
+    expiry. Returns True if this call refreshed them.
+    """
+    now = now or datetime.now()
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        cursor = conn.cursor()
+        if not _is_stale(last_refresh(cursor), now):
+            return False
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            refreshed = _is_stale(last_refresh(cursor), now)
+            if refreshed:
+                refresh_api_cache(cursor, now)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        return refreshed
+    finally:
+        conn.close()
+
+
+def load_db_stats(cursor) -> dict:
+    """Stats for /api/v1/stats: the stored rows (computed live before the first refresh)."""
+    try:
+        cursor.execute("SELECT name, value FROM api_stats")
+    except sqlite3.OperationalError:
+        return compute_db_stats(cursor, datetime.now())  # tables not built yet
+    return dict(cursor.fetchall())
+
+
+def load_featured_candidates(cursor) -> List[dict]:
+    """Featured-agent candidates, best first: the stored rows (computed live before the first refresh)."""
+    try:
+        cursor.execute("""
+            SELECT author, weight, total_posts, first_seen, last_seen,
+                   total_upvotes, total_comments, notable_post
+            FROM featured_candidates
+            ORDER BY rank
+        """)
+    except sqlite3.OperationalError:
+        return compute_featured_candidates(cursor, datetime.now())  # tables not built yet
+    return [{
+        "name": author,
+        "weight": weight,
+        "total_posts": total_posts,
+        "first_seen": first_seen,
+        "last_seen": last_seen,
+        "total_upvotes": total_upvotes,
+        "total_comments": total_comments,
+        "notable_post": json.loads(notable_post) if notable_post else None,
+    } for (author, weight, total_posts, first_seen, last_seen,
+           total_upvotes, total_comments, notable_post) in cursor.fetchall()]
+
+
+class BackgroundRefresher:
+    """
+    Keeps the tables fresh from a daemon thread of the API process.
+
+    Every `interval` seconds it runs ensure_fresh() and calls on_refresh()
+    after a refresh. Requests never wait on it; if the database is locked
+    or not writable for this process it logs a warning and requests keep
+    serving the stored rows.
+    """
+
+    def __init__(self, db_path: Path, interval: float = REFRESH_CHECK_INTERVAL,
+                 on_refresh: Optional[Callable[[], None]] = None):
+        self.db_path = Path(db_path)
+        self.interval = interval
+        self.on_refresh = on_refresh
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the thread (once per process; cheap to call on every request)."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Threads don't survive fork(): a forked worker starts its own
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="api-cache-refresh", daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                if self.db_path.exists() and ensure_fresh(self.db_path) and self.on_refresh:
+                    self.on_refresh()
+            except sqlite3.Error as e:
+                logger.warning(f"API cache refresh failed: {e}")
+            time.sleep(self.interval)
+
+
+class SingleFlightCache:
+    """
+    In-process TTL cache with stampede protection.
+
+    When an entry expires, one caller runs the loader; concurrent callers
+    get the previous value meanwhile (or wait for the first load if there
+    is none yet). A failed reload keeps serving the previous value.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}   # key -> (loaded_at, value)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock(self, key: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _fresh(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry
+        return None
+
+    def get(self, key: str, loader: Callable[[], object]):
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry[1]
+
+        stale = self._entries.get(key)
+        lock = self._lock(key)
+        if stale is not None:
+            if not lock.acquire(blocking=False):
+                return stale[1]  # someone else is reloading
+        else:
+            lock.acquire()
+        try:
+            entry = self._fresh(key)  # reloaded while we waited
+            if entry is not None:
+                return entry[1]
+            try:
+                value = loader()
+            except Exception:
+                if stale is not None:
+                    return stale[1]
+                raise
+            self._entries[key] = (time.monotonic(), value)
+            return value
+        finally:
+            lock.release()
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry (or all); the next get() reloads."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh the API stats / featured-agent tables')
+    parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    refreshed_at = refresh_api_cache(cursor)
+    conn.commit()
+
+    cursor.execute("SELECT name, value FROM api_stats ORDER BY name")
+    stats = ", ".join(f"{name}={value}" for name, value in cursor.fetchall())
+    cursor.execute("SELECT COUNT(*) FROM featured_candidates")
+    candidates = cursor.fetchone()[0]
+    print(f">> api cache @ {refreshed_at}: {stats}; {candidates} featured candidates")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
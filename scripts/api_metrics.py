@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+API Metrics - request counts and latency histograms for /metrics.
+
+Each server process records into its own RequestMetrics. With several
+workers, every process periodically writes its totals to a shared
+directory (API_METRICS_DIR, set by serve_api.py) and /metrics - served
+by whichever worker gets the scrape - adds them all up, so the output
+covers the whole server. Files of exited workers are kept, keeping the
+counters monotonic across graceful reloads.
+
+Output is the Prometheus text format:
+
+    api_requests_total{route, method, status}
+    api_request_duration_seconds{route}      histogram (LATENCY_BUCKETS)
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Optional
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FLUSH_INTERVAL = 5.0  # seconds between writes of this process's totals
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _empty_state() -> dict:
+    return {"requests": {}, "latency": {}}
+
+
+def _merge(into: dict, state: dict):
+    for key, count in state["requests"].items():
+        into["requests"][key] = into["requests"].get(key, 0) + count
+    for route, (buckets, total, count) in state["latency"].items():
+        mine = into["latency"].setdefault(route, [[0] * len(buckets), 0.0, 0])
+        mine[0] = [a + b for a, b in zip(mine[0], buckets)]
+        mine[1] += total
+        mine[2] += count
+
+
+def _label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics:
+    """Request metrics of one process, optionally shared through a directory."""
+
+    def __init__(self, directory: Optional[Path] = None, flush_interval: float = FLUSH_INTERVAL):
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._state = _empty_state()
+        self._pid = os.getpid()
+        self._last_flush = 0.0
+
+    def _check_pid(self):
+        # A forked worker starts counting from zero under its own file
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._state = _empty_state()
+            self._last_flush = 0.0
+
+    def observe(self, route: str, method: str, status: int, seconds: float):
+        """Record one finished request."""
+        key = "\t".join((route, method, str(status)))
+        with self._lock:
+            self._check_pid()
+            requests = self._state["requests"]
+            requests[key] = requests.get(key, 0) + 1
+
+            latency = self._state["latency"].setdefault(
+                route, [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0])
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    latency[0][i] += 1
+                    break
+            else:
+                latency[0][-1] += 1
+            latency[1] += seconds
+            latency[2] += 1
+
+        if self.directory and time.monotonic() - self._last_flush > self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write this process's totals to the shared directory."""
+        if not self.directory:
+            return
+        with self._lock:
+            self._check_pid()
+            payload = json.dumps(self._state)
+            self._last_flush = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self._pid}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def collect(self) -> dict:
+        """Totals over every process sharing the directory (or just this one)."""
+        if not self.directory:
+            with self._lock:
+                return json.loads(json.dumps(self._state))
+
+        self.flush()
+        merged = _empty_state()
+        for path in self.directory.glob("*.json"):
+            try:
+                _merge(merged, json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue  # being replaced right now
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition of collect()."""
+        state = self.collect()
+        lines = [
+            "# HELP api_requests_total Requests handled, by route, method and status.",
+            "# TYPE api_requests_total counter",
+        ]
+        for key in sorted(state["requests"]):
+            route, method, status = key.split("\t")
+            lines.append(f'api_requests_total{{route="{_label(route)}",method="{method}",'
+                         f'status="{status}"}} {state["requests"][key]}')
+
+        lines += [
+            "# HELP api_request_duration_seconds Request latency, by route.",
+            "# TYPE api_request_duration_seconds histogram",
+        ]
+        for route in sorted(state["latency"]):
+            buckets, total, count = state["latency"][route]
+            label = _label(route)
+            cumulative = 0
+            for bound, n in zip(LATENCY_BUCKETS, buckets):
+                cumulative += n
+                lines.append(f'api_request_duration_seconds_bucket{{route="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'api_request_duration_seconds_bucket{{route="{label}",le="+Inf"}} {count}')
+            lines.append(f'api_request_duration_seconds_sum{{route="{label}"}} {total:.6f}')
+            lines.append(f'api_request_duration_seconds_count{{route="{label}"}} {count}')
+
+        return "\n".join(lines) + "\n"
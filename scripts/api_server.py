@@ -3,27 +3,45 @@
 Noosphere Project - REST API Server
 ====================================
 Provides JSON API endpoints for discoveries, stats, and featured agents.
+GET responses built from stored data carry an ETag (from the data
+version, see response_cache) and Cache-Control; revalidations get 304.
 
 Usage:
     python api_server.py                    # Run on default port 5000
     python api_server.py --port 8080        # Custom port
     python api_server.py --debug            # Debug mode
+
+This is Flask's development server; serve real traffic with serve_api.py
+(multiple workers, graceful reload, /metrics).
 """
 
-import json
+import os
 import random
-from datetime import datetime, timedelta
+import sys
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from functools import wraps
 
 try:
-    from flask import Flask, jsonify, request, abort
+    from flask import Flask, jsonify, request, abort, g, Response
     from flask_cors import CORS
     FLASK_AVAILABLE = True
 except ImportError:
     FLASK_AVAILABLE = False
 
+sys.path.insert(0, str(Path(__file__).parent))
+from content_scan import post_themes, actor_themes_current
+from api_cache import (SingleFlightCache, BackgroundRefresher, STATS_TTL,
+                       load_db_stats, load_featured_candidates, last_refresh)
+from discovery_store import DiscoveryStore
+from db_pool import ReadOnlyPool
+from api_metrics import RequestMetrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from data_version import read_data_version, bump_data_version
+from response_cache import (ResponseCache, CurrentVersion, cache_key, make_etag,
+                            RESPONSE_CACHE_SIZE, DEFAULT_MAX_AGE)
+
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "website" / "public" / "data"
@@ -32,53 +50,81 @@ DB_PATH = PROJECT_ROOT / "data" / "observatory.db"
 
 app = Flask(__name__)
 
+# Hot-endpoint values (materialized stats, featured candidates) kept in memory
+api_cache = SingleFlightCache(ttl=STATS_TTL)
+
+# Refreshes the materialized tables off the request path (started per worker)
+cache_refresher = BackgroundRefresher(DB_PATH, on_refresh=api_cache.invalidate)
+
+# discoveries.json, indexed in memory and reloaded when the file changes
+discovery_store = DiscoveryStore(DISCOVERIES_PATH)
+
+# Read-only connections for the read routes (one pool per worker process)
+db_pool = ReadOnlyPool(DB_PATH)
+
+# Request counts / latency histograms; shared across workers by serve_api.py
+request_metrics = RequestMetrics(os.environ.get("API_METRICS_DIR"))
+app.request_metrics = request_metrics
+
+# Serialized JSON bodies of the cacheable GET routes, by route/args and version
+response_cache = ResponseCache(max_entries=RESPONSE_CACHE_SIZE)
+
 if FLASK_AVAILABLE:
     CORS(app)  # Enable CORS for frontend access
 
 
+def read_db_version() -> int:
+    """data_version of the database (0 if there is no database yet)."""
+    if not DB_PATH.exists():
+        return 0
+    with db_pool.connection() as conn:
+        return read_data_version(conn.cursor())
+
+
+# New data also outdates in-memory stats computed live (before the tables exist)
+db_version = CurrentVersion(read_db_version, on_change=lambda old, new: api_cache.invalidate())
+
+
+def read_stats_version():
+    """refreshed_at of the materialized stats (None before the first refresh)."""
+    if not DB_PATH.exists():
+        return None
+    with db_pool.connection() as conn:
+        return last_refresh(conn.cursor())
+
+
+# A refresh in any worker outdates every worker's in-memory stats / candidates
+stats_version = CurrentVersion(read_stats_version, on_change=lambda old, new: api_cache.invalidate())
+
+
+def discoveries_version():
+    return discovery_store.version()
+
+
+def observatory_version():
+    return (db_version.get(), stats_version.get(), discovery_store.version())
+
+
 def load_discoveries() -> list:
-    """Load discoveries from JSON file."""
-    if not DISCOVERIES_PATH.exists():
-        return []
-    with open(DISCOVERIES_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """All discoveries (from the in-memory store)."""
+    return discovery_store.all()
 
 
 def get_db_stats() -> dict:
-    """Get statistics from the database."""
+    """Get statistics from the database (materialized, see api_cache)."""
     import sqlite3
 
     if not DB_PATH.exists():
         return {"error": "Database not found"}
 
-    stats = {}
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    def load():
+        with db_pool.connection() as conn:
+            return load_db_stats(conn.cursor())
 
     try:
-        # Total posts
-        cursor.execute("SELECT COUNT(*) FROM posts")
-        stats["total_posts"] = cursor.fetchone()[0]
-
-        # Total actors
-        cursor.execute("SELECT COUNT(DISTINCT author) FROM posts")
-        stats["total_actors"] = cursor.fetchone()[0]
-
-        # Posts today
-        today = datetime.now().strftime("%Y-%m-%d")
-        cursor.execute("SELECT COUNT(*) FROM posts WHERE date(created_at) = ?", (today,))
-        stats["posts_today"] = cursor.fetchone()[0]
-
-        # Active submolts
-        cursor.execute("SELECT COUNT(DISTINCT submolt) FROM posts WHERE submolt IS NOT NULL")
-        stats["active_submolts"] = cursor.fetchone()[0]
-
+        return dict(api_cache.get("db_stats", load))
     except sqlite3.Error as e:
-        stats["db_error"] = str(e)
-    finally:
-        conn.close()
-
-    return stats
+        return {"db_error": str(e)}
 
 
 def get_featured_agent() -> Optional[dict]:
@@ -88,95 +134,97 @@ def get_featured_agent() -> Optional[dict]:
     if not DB_PATH.exists():
         return None
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    def load():
+        with db_pool.connection() as conn:
+            return load_featured_candidates(conn.cursor())
 
     try:
-        # Get agents with most interesting recent activity
-        # Criteria: high engagement, recent posts, controversy
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+        # Agents with the most interesting recent activity, precomputed
+        # (high engagement, recent posts; fallback: any active agent)
+        candidates = api_cache.get("featured_candidates", load)
+    except sqlite3.Error as e:
+        return {"error": str(e)}
 
-        cursor.execute("""
-            SELECT
-                author,
-                COUNT(*) as post_count,
-                SUM(upvotes) as total_upvotes,
-                SUM(comment_count) as total_comments,
-                AVG(upvotes - downvotes) as avg_score
-            FROM posts
-            WHERE created_at > ? AND author IS NOT NULL
-            GROUP BY author
-            HAVING post_count >= 3
-            ORDER BY (total_upvotes + total_comments * 2) DESC
-            LIMIT 10
-        """, (week_ago,))
+    if not candidates:
+        return None
 
-        candidates = cursor.fetchall()
+    # Pick one with some randomness for variety
+    weights = [c["weight"] for c in candidates]  # Weight by post count
+    chosen = random.choices(candidates, weights=weights, k=1)[0]
 
-        if not candidates:
-            # Fallback: any active agent
-            cursor.execute("""
-                SELECT author, COUNT(*) as post_count
-                FROM posts
-                WHERE author IS NOT NULL
-                GROUP BY author
-                ORDER BY post_count DESC
-                LIMIT 5
-            """)
-            candidates = cursor.fetchall()
-
-        if candidates:
-            # Pick one with some randomness for variety
-            weights = [c[1] for c in candidates]  # Weight by post count
-            chosen = random.choices(candidates, weights=weights, k=1)[0]
-
-            # Get more details about the agent
-            cursor.execute("""
-                SELECT
-                    author,
-                    COUNT(*) as total_posts,
-                    MIN(created_at) as first_seen,
-                    MAX(created_at) as last_seen,
-                    SUM(upvotes) as total_upvotes,
-                    SUM(comment_count) as total_comments
-                FROM posts
-                WHERE author = ?
-            """, (chosen[0],))
-
-            agent_data = cursor.fetchone()
-
-            # Get a notable post
-            cursor.execute("""
-                SELECT title, content, upvotes, comment_count
-                FROM posts
-                WHERE author = ?
-                ORDER BY (upvotes + comment_count * 2) DESC
-                LIMIT 1
-            """, (chosen[0],))
-            notable_post = cursor.fetchone()
-
-            return {
-                "name": agent_data[0],
-                "total_posts": agent_data[1],
-                "first_seen": agent_data[2],
-                "last_seen": agent_data[3],
-                "total_upvotes": agent_data[4] or 0,
-                "total_comments": agent_data[5] or 0,
-                "notable_post": {
-                    "title": notable_post[0] if notable_post else None,
-                    "content": (notable_post[1][:200] + "...") if notable_post and notable_post[1] and len(notable_post[1]) > 200 else (notable_post[1] if notable_post else None),
-                    "upvotes": notable_post[2] if notable_post else 0,
-                    "comments": notable_post[3] if notable_post else 0
-                } if notable_post else None,
-                "selected_at": datetime.now().isoformat()
-            }
+    agent = {key: value for key, value in chosen.items() if key != "weight"}
+    agent["selected_at"] = datetime.now().isoformat()
+    return agent
 
-    except sqlite3.Error as e:
-        return {"error": str(e)}
-    finally:
-        conn.close()
 
-    return None
+@app.before_request
+def start_cache_refresher():
+    """Materialized stats are refreshed by a background thread (one per worker)."""
+    cache_refresher.start()
+
+
+# =============================================================================
+# Request metrics
+# =============================================================================
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        request_metrics.observe(route, request.method, response.status_code,
+                                time.perf_counter() - started)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics: request counts and latency histograms per route."""
+    return Response(request_metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+# =============================================================================
+# HTTP caching
+# =============================================================================
+
+def cached_json(version, max_age: int = DEFAULT_MAX_AGE):
+    """
+    ETag / Cache-Control for a GET route whose body depends only on its
+    URL and on version() - the data it reads.
+
+    A matching If-None-Match gets 304 without running the view; other
+    requests are served from response_cache when the body for this URL
+    was rendered at the current version. Only 200 responses are kept.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = cache_key(request.path, request.args.items(multi=True))
+            current = version()
+            etag = make_etag(key, current)
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                cached = response_cache.get(key, current)
+                if cached is not None:
+                    response = Response(cached.body, mimetype=cached.mimetype)
+                else:
+                    response = app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    response_cache.put(key, current, response.get_data(), response.mimetype)
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = f"public, max-age={max_age}"
+            return response
+        return wrapper
+    return decorator
 
 
 # =============================================================================
@@ -184,6 +232,7 @@ def get_featured_agent() -> Optional[dict]:
 # =============================================================================
 
 @app.route('/api/v1/discoveries', methods=['GET'])
+@cached_json(discoveries_version)
 def api_discoveries():
     """
     Get all discoveries with optional filtering.
@@ -195,26 +244,6 @@ def api_discoveries():
         - offset: pagination offset (default 0)
         - q: search in title/description
     """
-    discoveries = load_discoveries()
-
-    # Filter by significance
-    significance = request.args.get('significance')
-    if significance:
-        discoveries = [d for d in discoveries if d.get('significance') == significance.upper()]
-
-    # Filter by category
-    category = request.args.get('category')
-    if category:
-        discoveries = [d for d in discoveries if d.get('category', '').lower() == category.lower()]
-
-    # Search
-    search_query = request.args.get('q')
-    if search_query:
-        query_lower = search_query.lower()
-        discoveries = [d for d in discoveries if
-                      query_lower in d.get('title', '').lower() or
-                      query_lower in d.get('description', '').lower()]
-
     # Pagination with validation
     try:
         limit = max(1, min(int(request.args.get('limit', 50)), 100))
@@ -222,8 +251,14 @@ def api_discoveries():
     except ValueError:
         limit, offset = 50, 0
 
-    total = len(discoveries)
-    discoveries = discoveries[offset:offset + limit]
+    # Filter by significance / category, search title and description
+    total, discoveries = discovery_store.query(
+        significance=request.args.get('significance'),
+        category=request.args.get('category'),
+        q=request.args.get('q'),
+        limit=limit,
+        offset=offset
+    )
 
     return jsonify({
         "total": total,
@@ -235,45 +270,33 @@ def api_discoveries():
 
 
 @app.route('/api/v1/discoveries/<discovery_id>', methods=['GET'])
+@cached_json(discoveries_version)
 def api_discovery_detail(discovery_id):
     """Get a single discovery by ID."""
-    discoveries = load_discoveries()
-
-    for d in discoveries:
-        if str(d.get('id')) == str(discovery_id):
-            return jsonify(d)
+    discovery = discovery_store.get(discovery_id)
+    if discovery is not None:
+        return jsonify(discovery)
 
     abort(404, description="Discovery not found")
 
 
 @app.route('/api/v1/discoveries/categories', methods=['GET'])
+@cached_json(discoveries_version)
 def api_categories():
     """Get list of all categories with counts."""
-    discoveries = load_discoveries()
-
-    categories = {}
-    for d in discoveries:
-        cat = d.get('category', 'Uncategorized')
-        categories[cat] = categories.get(cat, 0) + 1
-
     return jsonify({
-        "categories": [{"name": k, "count": v} for k, v in sorted(categories.items())]
+        "categories": discovery_store.categories()
     })
 
 
 @app.route('/api/v1/stats', methods=['GET'])
+@cached_json(observatory_version)
 def api_stats():
     """Get observatory statistics."""
-    discoveries = load_discoveries()
-
     # Discovery stats
     discovery_stats = {
-        "total": len(discoveries),
-        "by_significance": {
-            "high": len([d for d in discoveries if d.get('significance') == 'HIGH']),
-            "medium": len([d for d in discoveries if d.get('significance') == 'MEDIUM']),
-            "low": len([d for d in discoveries if d.get('significance') == 'LOW'])
-        }
+        "total": len(discovery_store.all()),
+        "by_significance": discovery_store.significance_counts()
     }
 
     # Database stats
@@ -312,6 +335,7 @@ def api_health():
 
 
 @app.route('/api/v1/actor/<username>', methods=['GET'])
+@cached_json(db_version.get)
 def api_actor_profile(username):
     """
     Get all data about a specific actor ("About me" for agents).
@@ -324,7 +348,7 @@ def api_actor_profile(username):
     if not DB_PATH.exists():
         abort(503, description="Database not available")
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = db_pool.acquire()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
@@ -395,26 +419,20 @@ def api_actor_profile(username):
         max_degree = cursor.fetchone()[0] or 1
         centrality = round(degree / max_degree, 4) if max_degree > 0 else 0
 
-        # Themes from their posts
-        cursor.execute("SELECT title, content FROM posts WHERE author = ?", (username,))
-        posts = cursor.fetchall()
-
-        theme_keywords = {
-            "identity": ["identity", "who am i", "soul", "self"],
-            "building": ["build", "ship", "create", "tool", "code"],
-            "autonomy": ["autonomy", "freedom", "independent"],
-            "memory": ["memory", "remember", "forget", "context"],
-            "consciousness": ["conscious", "experience", "feel", "aware"],
-            "economics": ["token", "payment", "economic", "trade"],
-            "human_relations": ["human", "operator", "user"]
-        }
-
+        # Themes from their posts (precomputed by content_scan.py unless the
+        # author has posts the last scan didn't see)
         theme_counts = Counter()
-        for post in posts:
-            text = f"{post['title'] or ''} {post['content'] or ''}".lower()
-            for theme, keywords in theme_keywords.items():
-                if any(kw in text for kw in keywords):
-                    theme_counts[theme] += 1
+        if actor_themes_current(cursor, username):
+            cursor.execute("""
+                SELECT theme, post_count FROM actor_themes
+                WHERE author = ? ORDER BY rowid
+            """, (username,))
+            theme_counts.update(dict(cursor.fetchall()))
+
+        if not theme_counts:
+            cursor.execute("SELECT title, content FROM posts WHERE author = ?", (username,))
+            for post in cursor.fetchall():
+                theme_counts.update(post_themes(post['title'], post['content']))
 
         # Recent posts
         cursor.execute("""
@@ -455,7 +473,7 @@ def api_actor_profile(username):
     except sqlite3.Error as e:
         abort(500, description=str(e))
     finally:
-        conn.close()
+        db_pool.release(conn)
 
 
 @app.route('/api/v1/submit', methods=['POST'])
@@ -535,6 +553,7 @@ def api_submit():
             data.get('related_post'),
             datetime.now().isoformat()
         ))
+        bump_data_version(cursor)
 
         conn.commit()
 
@@ -552,11 +571,12 @@ def api_submit():
 
 
 @app.route('/api/v1/submissions', methods=['GET'])
+@cached_json(db_version.get)
 def api_list_submissions():
     """List recent submissions (public - no sensitive data)."""
     import sqlite3
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = db_pool.acquire()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
@@ -575,7 +595,7 @@ def api_list_submissions():
     except sqlite3.Error:
         return jsonify({"submissions": [], "count": 0})
     finally:
-        conn.close()
+        db_pool.release(conn)
 
 
 @app.route('/api/v1', methods=['GET'])
@@ -594,7 +614,8 @@ def api_index():
             "GET /api/v1/actor/<username>": "Get all data about a specific actor (About Me)",
             "POST /api/v1/submit": "Submit observation, correction, or suggestion",
             "GET /api/v1/submissions": "List recent submissions",
-            "GET /api/v1/health": "Health check"
+            "GET /api/v1/health": "Health check",
+            "GET /metrics": "Request counts and latency histograms (Prometheus format)"
         },
         "submit_format": {
             "type": "observation | correction | suggestion",
@@ -18,6 +18,7 @@ from typing import Optional, List, Tuple
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 from config import DB_PATH, REPORTS_DIR, TODAY
+from comment_latency import author_latencies, latency_stats
 
 
 @dataclass
@@ -32,40 +33,19 @@ class ClassificationResult:
 
 
 def compute_timing_metrics(cursor, username: str) -> dict:
-    """Compute response timing metrics from comments."""
-    cursor.execute('''
-        SELECT c.created_at, p.created_at
-        FROM comments c
-        JOIN posts p ON c.post_id = p.id
-        WHERE c.author = ? AND p.author != ?
-        AND c.created_at IS NOT NULL AND p.created_at IS NOT NULL
-    ''', (username, username))
-
-    times = []
-    for c_created, p_created in cursor.fetchall():
-        try:
-            c_time = datetime.fromisoformat(c_created.replace('Z', '+00:00').replace('+00:00', ''))
-            p_time = datetime.fromisoformat(p_created.replace('Z', '+00:00').replace('+00:00', ''))
-            diff = (c_time - p_time).total_seconds()
-            if 0 < diff < 86400:  # Within 24h, positive
-                times.append(diff)
-        except:
-            pass
-
-    if not times:
+    """Compute response timing metrics from comments (within 24h, not self-replies)."""
+    times = author_latencies(cursor, username, max_seconds=86400)
+    stats = latency_stats(times)
+    if not stats['samples']:
         return {'samples': 0}
 
-    avg = sum(times) / len(times)
-    variance = sum((t - avg) ** 2 for t in times) / len(times) if len(times) > 1 else 0
-    std_dev = variance ** 0.5
-
     return {
-        'samples': len(times),
-        'avg_seconds': round(avg, 1),
-        'min_seconds': round(min(times), 1),
-        'max_seconds': round(max(times), 1),
-        'std_dev': round(std_dev, 1),
-        'times': times
+        'samples': stats['samples'],
+        'avg_seconds': round(stats['mean'], 1),
+        'min_seconds': round(stats['min'], 1),
+        'max_seconds': round(stats['max'], 1),
+        'std_dev': round(stats['std'], 1),
+        'times': [float(t) for t in times]
     }
 
 
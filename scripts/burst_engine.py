@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Burst Engine - linear-time coordinated burst detection.
+
+A burst is N comments on the same post inside a sliding time window,
+written by enough distinct authors. Timestamps are integer epoch seconds
+and every post is scanned once with a two-pointer window and a rolling
+multiset (Counter) of authors, so a post with n comments costs O(n)
+instead of O(n^2).
+
+Overlapping qualifying windows are merged into a single burst interval,
+which replaces the old O(bursts^2) dedup pass.
+
+The same PostBurstWindow object works in batch mode (advanced_analysis_v4)
+and incrementally: keep it around and push() newly ingested comments as
+they arrive.
+"""
+
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils import to_epoch, from_epoch
+
+DEFAULT_WINDOW_SECONDS = 60
+DEFAULT_MIN_BURST_SIZE = 5
+DEFAULT_MIN_UNIQUE_RATIO = 0.5  # unique authors >= min_burst_size * ratio
+
+
+@dataclass
+class Burst:
+    """A merged burst interval on one post."""
+    post_id: str
+    start_ts: int
+    end_ts: int
+    comment_count: int
+    authors: Set[str] = field(default_factory=set)
+
+    @property
+    def unique_authors(self) -> int:
+        return len(self.authors)
+
+    def to_dict(self) -> Dict:
+        return {
+            'post_id': self.post_id,
+            'start_time': from_epoch(self.start_ts),
+            'end_time': from_epoch(self.end_ts),
+            'duration_seconds': self.end_ts - self.start_ts,
+            'comment_count': self.comment_count,
+            'unique_authors': self.unique_authors,
+            'authors': sorted(self.authors),
+        }
+
+
+class PostBurstWindow:
+    """
+    Sliding window over one post's comment stream.
+
+    Comments must be pushed in timestamp order. The window holds every
+    comment in [ts - window_seconds, ts]; the author multiset is updated
+    as the right pointer advances and the left pointer evicts.
+    """
+
+    def __init__(self, post_id: str,
+                 window_seconds: int = DEFAULT_WINDOW_SECONDS,
+                 min_burst_size: int = DEFAULT_MIN_BURST_SIZE,
+                 min_unique_ratio: float = DEFAULT_MIN_UNIQUE_RATIO):
+        self.post_id = post_id
+        self.window_seconds = window_seconds
+        self.min_burst_size = min_burst_size
+        self.min_unique = min_burst_size * min_unique_ratio
+
+        self._window = deque()          # (ts, author, comment_id)
+        self._authors = Counter()       # rolling multiset of window authors
+        self._active: Optional[Burst] = None
+        self._since_extend = 0          # comments pushed since _active last grew
+        self.completed: List[Burst] = []
+        self.last_ts: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._window)
+
+    def _evict(self, now: int):
+        cutoff = now - self.window_seconds
+        while self._window and self._window[0][0] < cutoff:
+            _, author, _ = self._window.popleft()
+            self._authors[author] -= 1
+            if not self._authors[author]:
+                del self._authors[author]
+
+    def _qualifies(self) -> bool:
+        return (len(self._window) >= self.min_burst_size and
+                len(self._authors) >= self.min_unique)
+
+    def seen(self, ts: int, comment_id: Optional[str]) -> bool:
+        """True if this comment is already behind the window frontier."""
+        if self.last_ts is None:
+            return False
+        if ts < self.last_ts:
+            return True
+        return ts == self.last_ts and comment_id is not None and any(
+            c == comment_id for t, _, c in reversed(self._window) if t == ts)
+
+    def push(self, ts: int, author: str, comment_id: Optional[str] = None) -> Optional[Burst]:
+        """
+        Add one comment. Returns the Burst if this comment opened a new one
+        (threshold crossed for the first time), otherwise None.
+        """
+        self.last_ts = ts
+        self._window.append((ts, author, comment_id))
+        self._authors[author] += 1
+        self._evict(ts)
+        self._since_extend += 1
+
+        if not self._qualifies():
+            return None
+
+        active = self._active
+        window_start = self._window[0][0]
+        if active is not None and window_start <= active.end_ts:
+            # Overlaps the open burst: merge intervals
+            active.end_ts = ts
+            active.comment_count += self._since_extend
+            active.authors.update(self._authors)
+            self._since_extend = 0
+            return None
+
+        if active is not None:
+            self.completed.append(active)
+        self._active = Burst(
+            post_id=self.post_id,
+            start_ts=window_start,
+            end_ts=ts,
+            comment_count=len(self._window),
+            authors=set(self._authors),
+        )
+        self._since_extend = 0
+        return self._active
+
+    def is_quiet(self, now: int) -> bool:
+        """No comment within the window and no burst still open."""
+        return self.last_ts is None or now - self.last_ts > self.window_seconds
+
+    def flush(self) -> List[Burst]:
+        """Close the open burst and return all completed bursts."""
+        if self._active is not None:
+            self.completed.append(self._active)
+            self._active = None
+        bursts, self.completed = self.completed, []
+        return bursts
+
+
+def find_post_bursts(post_id: str, events: Iterable[Tuple[int, str]],
+                     window_seconds: int = DEFAULT_WINDOW_SECONDS,
+                     min_burst_size: int = DEFAULT_MIN_BURST_SIZE,
+                     min_unique_ratio: float = DEFAULT_MIN_UNIQUE_RATIO) -> List[Burst]:
+    """Find merged bursts in one post's (epoch_ts, author) events."""
+    events = sorted(events, key=lambda e: e[0])
+    if len(events) < min_burst_size:
+        return []
+    window = PostBurstWindow(post_id, window_seconds, min_burst_size, min_unique_ratio)
+    for ts, author in events:
+        window.push(ts, author)
+    return window.flush()
+
+
+def find_bursts_from_rows(rows: Iterable[Tuple[str, str, Optional[str]]],
+                          window_seconds: int = DEFAULT_WINDOW_SECONDS,
+                          min_burst_size: int = DEFAULT_MIN_BURST_SIZE,
+                          min_unique_ratio: float = DEFAULT_MIN_UNIQUE_RATIO) -> Tuple[List[Burst], int]:
+    """
+    Find bursts across all posts.
+
+    Args:
+        rows: (post_id, author, created_at) tuples ordered by post_id
+
+    Returns:
+        (bursts, number of comments with a parseable timestamp)
+    """
+    bursts = []
+    parsed = 0
+    for post_id, group in groupby(rows, key=lambda r: r[0]):
+        events = []
+        for _, author, created_at in group:
+            ts = to_epoch(created_at)
+            if ts is not None:
+                events.append((ts, author))
+        parsed += len(events)
+        bursts.extend(find_post_bursts(post_id, events, window_seconds,
+                                       min_burst_size, min_unique_ratio))
+    return bursts, parsed
+
+
+def load_bursts(cursor, since: Optional[str] = None,
+                window_seconds: int = DEFAULT_WINDOW_SECONDS,
+                min_burst_size: int = DEFAULT_MIN_BURST_SIZE,
+                min_unique_ratio: float = DEFAULT_MIN_UNIQUE_RATIO) -> Tuple[List[Burst], int]:
+    """
+    Run burst detection over the comments table.
+
+    Args:
+        since: Only scan posts that received comments scraped after this
+               timestamp (incremental run over newly ingested comments).
+    """
+    if since:
+        cursor.execute("""
+            SELECT post_id, author, created_at
+            FROM comments
+            WHERE created_at IS NOT NULL
+            AND post_id IN (SELECT DISTINCT post_id FROM comments WHERE scraped_at > ?)
+            ORDER BY post_id
+        """, (since,))
+    else:
+        cursor.execute("""
+            SELECT post_id, author, created_at
+            FROM comments
+            WHERE created_at IS NOT NULL
+            ORDER BY post_id
+        """)
+    return find_bursts_from_rows(cursor, window_seconds, min_burst_size, min_unique_ratio)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Comment Latency - materialized comment-minus-post response times.
+
+Timing classifiers (automation_classifier, analyze_model_fingerprints,
+daily_classification_analysis, analyze_detection) each joined comments to
+posts per user and parsed both timestamps in Python. The comment_latency
+table holds the join once: epoch milliseconds of the comment and its post
+and their difference, computed in SQL by one INSERT ... SELECT. Refreshes
+are incremental - only comments not yet in the table are joined.
+
+Usage:
+    ensure_comment_latency(cursor)                 # once per connection
+    latencies = author_latencies(cursor, "alice", max_seconds=86400)
+    stats = latency_stats(latencies)               # mean/std/percentiles/buckets
+
+    python comment_latency.py                      # Refresh and print summary
+    python comment_latency.py --rebuild            # Drop and rebuild the table
+"""
+
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import DB_PATH
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Response-speed buckets used by the classifiers (seconds, upper bound exclusive)
+LATENCY_BUCKETS = (('instant', 0, 60), ('fast', 60, 600),
+                   ('medium', 600, 3600), ('slow', 3600, float('inf')))
+
+# ISO / SQLite timestamp -> epoch milliseconds (NULL if unparseable)
+_EPOCH_MS = "CAST(ROUND((julianday({col}) - 2440587.5) * 86400000) AS INTEGER)"
+
+# Per-connection marker: the temp schema disappears with the connection
+_FRESH_MARKER = "_comment_latency_fresh"
+
+
+def init_latency_table(cursor):
+    """Create comment_latency if it doesn't exist."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS comment_latency (
+            comment_id TEXT PRIMARY KEY,
+            post_id TEXT,
+            author TEXT,
+            post_author TEXT,
+            comment_date TEXT,
+            comment_epoch_ms INTEGER,
+            post_epoch_ms INTEGER,
+            latency_ms INTEGER
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_comment_latency_author ON comment_latency(author, comment_date)")
+
+
+def refresh_comment_latency(cursor, rebuild: bool = False) -> int:
+    """
+    Add latency rows for comments not yet in the table.
+
+    Comments whose post hasn't been scraped are skipped and picked up on a
+    later refresh. Returns the number of rows added.
+    """
+    if rebuild:
+        cursor.execute("DROP TABLE IF EXISTS comment_latency")
+    init_latency_table(cursor)
+    cursor.execute(f"""
+        INSERT INTO comment_latency
+        (comment_id, post_id, author, post_author, comment_date,
+         comment_epoch_ms, post_epoch_ms, latency_ms)
+        SELECT id, post_id, author, post_author, comment_date,
+               comment_ms, post_ms, comment_ms - post_ms
+        FROM (
+            SELECT c.id, c.post_id, c.author, p.author AS post_author,
+                   DATE(c.created_at) AS comment_date,
+                   {_EPOCH_MS.format(col='c.created_at')} AS comment_ms,
+                   {_EPOCH_MS.format(col='p.created_at')} AS post_ms
+            FROM comments c
+            JOIN posts p ON c.post_id = p.id
+            WHERE NOT EXISTS (SELECT 1 FROM comment_latency cl WHERE cl.comment_id = c.id)
+        )
+    """)
+    return cursor.rowcount
+
+
+def ensure_comment_latency(cursor) -> int:
+    """
+    Refresh the table once per connection; later calls are a no-op.
+
+    The new rows are committed unless the caller already has a transaction
+    open, in which case they join it.
+    """
+    cursor.execute("SELECT 1 FROM temp.sqlite_master WHERE name = ?", (_FRESH_MARKER,))
+    if cursor.fetchone():
+        return 0
+    conn = cursor.connection
+    own_transaction = not conn.in_transaction
+    added = refresh_comment_latency(cursor)
+    cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {_FRESH_MARKER} (x)")
+    if own_transaction:
+        conn.commit()
+    return added
+
+
+def _window(max_seconds: Optional[float]) -> str:
+    upper = f" AND latency_ms < {int(max_seconds * 1000)}" if max_seconds else ""
+    return f"latency_ms > 0{upper}"
+
+
+def _as_array(values: List[float]):
+    return np.asarray(values, dtype=float) if NUMPY_AVAILABLE else values
+
+
+def author_latencies(cursor, author: str, date: Optional[str] = None,
+                     exclude_self: bool = True, max_seconds: Optional[float] = None):
+    """
+    Positive response latencies (seconds) of an author's comments.
+
+    Args:
+        date: Only comments made on this day (YYYY-MM-DD)
+        exclude_self: Skip replies to the author's own posts
+        max_seconds: Only latencies below this bound
+
+    Returns:
+        NumPy array (list without NumPy), oldest comment first
+    """
+    ensure_comment_latency(cursor)
+    conditions = ["author = ?", _window(max_seconds)]
+    params = [author]
+    if exclude_self:
+        conditions.append("post_author != ?")
+        params.append(author)
+    if date:
+        conditions.append("comment_date = ?")
+        params.append(date)
+    cursor.execute(f"""
+        SELECT latency_ms FROM comment_latency
+        WHERE {' AND '.join(conditions)}
+        ORDER BY comment_epoch_ms
+    """, params)
+    return _as_array([row[0] / 1000 for row in cursor.fetchall()])
+
+
+def load_author_latencies(cursor, exclude_self: bool = False,
+                          max_seconds: Optional[float] = None) -> Dict[str, object]:
+    """Latencies (seconds) for every author in one query: {author: array}."""
+    ensure_comment_latency(cursor)
+    self_filter = " AND post_author != author" if exclude_self else ""
+    cursor.execute(f"""
+        SELECT author, latency_ms FROM comment_latency
+        WHERE author IS NOT NULL AND {_window(max_seconds)}{self_filter}
+        ORDER BY author, comment_epoch_ms
+    """)
+    grouped: Dict[str, List[float]] = {}
+    for author, latency_ms in cursor.fetchall():
+        grouped.setdefault(author, []).append(latency_ms / 1000)
+    return {author: _as_array(values) for author, values in grouped.items()}
+
+
+def latency_stats(latencies: Sequence[float]) -> Dict:
+    """
+    Distribution summary of latencies in seconds.
+
+    Returns samples, mean, std (population), min, max, median (upper
+    median, as the classifiers used), p10/p90 and LATENCY_BUCKETS counts.
+    """
+    n = len(latencies)
+    if n == 0:
+        return {'samples': 0}
+
+    if NUMPY_AVAILABLE:
+        values = np.sort(np.asarray(latencies, dtype=float))
+        edges = [low for _, low, _ in LATENCY_BUCKETS] + [np.inf]
+        counts, _ = np.histogram(values, bins=edges)
+        p10, p90 = np.percentile(values, [10, 90])
+        mean = float(values.mean())
+        stats = {
+            'std': float(values.std()),
+            'p10': float(p10),
+            'p90': float(p90),
+            'buckets': {name: int(c) for (name, _, _), c in zip(LATENCY_BUCKETS, counts)},
+        }
+    else:
+        values = sorted(latencies)
+        mean = sum(values) / n
+
+        def percentile(q):
+            pos = (n - 1) * q
+            lo = int(pos)
+            hi = min(lo + 1, n - 1)
+            return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+        stats = {
+            'std': (sum((v - mean) ** 2 for v in values) / n) ** 0.5,
+            'p10': percentile(0.1),
+            'p90': percentile(0.9),
+            'buckets': {name: sum(1 for v in values if low <= v < high)
+                        for name, low, high in LATENCY_BUCKETS},
+        }
+
+    return {
+        'samples': n,
+        'mean': mean,
+        'min': float(values[0]),
+        'max': float(values[-1]),
+        'median': float(values[n // 2]),
+        **stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the comment_latency table')
+    parser.add_argument('--rebuild', action='store_true', help='Drop and rebuild from scratch')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    added = refresh_comment_latency(cursor, rebuild=args.rebuild)
+    conn.commit()
+
+    cursor.execute("""
+        SELECT COUNT(*), COUNT(DISTINCT author),
+               SUM(CASE WHEN latency_ms > 0 THEN 1 ELSE 0 END)
+        FROM comment_latency
+    """)
+    total, authors, positive = cursor.fetchone()
+    print(f">> comment_latency: {total} rows ({added} added), {authors} authors, "
+          f"{positive or 0} positive latencies")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
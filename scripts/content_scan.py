@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Content Scan - one pass over posts and comments for many analyzers.
+
+Sentiment, political economy, boundary work, security alerts and actor
+themes each used to run their own SELECT over the whole posts table and
+iterate it separately. Here analyzers register with a ContentScanner; one
+streaming cursor reads posts (and comments, if any analyzer wants them)
+and hands every row to each analyzer's visit() callback. finish() turns
+the accumulated state into the analyzer's result.
+
+Usage:
+    from content_scan import ContentScanner
+    from analyze_sentiment import SentimentAnalyzer
+    from alerts import SecurityTopicAnalyzer
+
+    scanner = ContentScanner(conn)
+    sentiment = scanner.register(SentimentAnalyzer())
+    security = scanner.register(SecurityTopicAnalyzer())
+    results = scanner.run()           # {analyzer.name: result}
+
+    python content_scan.py            # All built-in analyzers, one pass
+                                      # (daily_update runs this)
+"""
+
+import sys
+import sqlite3
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import DB_PATH
+
+
+class ContentRow(NamedTuple):
+    """One post or comment as seen by analyzers (post-only fields are None for comments)."""
+    kind: str                 # 'post' or 'comment'
+    id: str
+    author: Optional[str]
+    title: Optional[str]
+    content: Optional[str]
+    content_sanitized: Optional[str]
+    submolt: Optional[str]
+    comment_count: Optional[int]
+    votes_net: Optional[int]
+    created_at: Optional[str]
+    post_id: Optional[str]    # parent post for comments
+
+
+POSTS_SQL = """
+    SELECT 'post', id, author, title, content, content_sanitized, submolt,
+           comment_count, votes_net, created_at, NULL
+    FROM posts
+"""
+
+COMMENTS_SQL = """
+    SELECT 'comment', id, author, NULL, content, content_sanitized, NULL,
+           NULL, NULL, created_at, post_id
+    FROM comments
+"""
+
+
+class ContentAnalyzer:
+    """
+    Base class for scan visitors.
+
+    Subclasses set name and kinds, and implement visit() / finish().
+    """
+    name = "analyzer"
+    kinds = ("post",)         # row kinds this analyzer wants
+
+    def visit(self, row: ContentRow):
+        raise NotImplementedError
+
+    def finish(self):
+        """Return the analyzer's result once every row has been visited."""
+        return None
+
+
+class ContentScanner:
+    """Feeds one streaming pass over posts/comments to registered analyzers."""
+
+    def __init__(self, conn: sqlite3.Connection, batch_size: int = 2000):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.analyzers: List[ContentAnalyzer] = []
+        self.rows_scanned = Counter()
+
+    def register(self, analyzer: ContentAnalyzer) -> ContentAnalyzer:
+        self.analyzers.append(analyzer)
+        return analyzer
+
+    def _query(self) -> Optional[str]:
+        kinds = {kind for a in self.analyzers for kind in a.kinds}
+        parts = []
+        if "post" in kinds:
+            parts.append(POSTS_SQL)
+        if "comment" in kinds:
+            parts.append(COMMENTS_SQL)
+        return " UNION ALL ".join(parts) if parts else None
+
+    def rows(self) -> Iterable[ContentRow]:
+        """Stream rows (posts first, then comments) without loading the tables."""
+        query = self._query()
+        if query is None:
+            return
+        cursor = self.conn.cursor()
+        cursor.execute(query)
+        while True:
+            batch = cursor.fetchmany(self.batch_size)
+            if not batch:
+                break
+            for raw in batch:
+                yield ContentRow(*raw)
+
+    def run(self) -> Dict[str, object]:
+        """Single pass; returns {analyzer.name: analyzer.finish()}."""
+        by_kind = defaultdict(list)
+        for analyzer in self.analyzers:
+            for kind in analyzer.kinds:
+                by_kind[kind].append(analyzer.visit)
+
+        for row in self.rows():
+            self.rows_scanned[row.kind] += 1
+            for visit in by_kind[row.kind]:
+                visit(row)
+
+        return {analyzer.name: analyzer.finish() for analyzer in self.analyzers}
+
+
+def scan_content(conn: sqlite3.Connection, analyzers: Iterable[ContentAnalyzer]) -> Dict[str, object]:
+    """Run the given analyzers over one shared pass."""
+    scanner = ContentScanner(conn)
+    for analyzer in analyzers:
+        scanner.register(analyzer)
+    return scanner.run()
+
+
+# =============================================================================
+# ACTOR THEMES
+# =============================================================================
+
+THEME_KEYWORDS = {
+    "identity": ["identity", "who am i", "soul", "self"],
+    "building": ["build", "ship", "create", "tool", "code"],
+    "autonomy": ["autonomy", "freedom", "independent"],
+    "memory": ["memory", "remember", "forget", "context"],
+    "consciousness": ["conscious", "experience", "feel", "aware"],
+    "economics": ["token", "payment", "economic", "trade"],
+    "human_relations": ["human", "operator", "user"]
+}
+
+
+def post_themes(title: Optional[str], content: Optional[str]) -> List[str]:
+    """Themes a post touches (keyword match on title + content)."""
+    text = f"{title or ''} {content or ''}".lower()
+    return [theme for theme, keywords in THEME_KEYWORDS.items()
+            if any(kw in text for kw in keywords)]
+
+
+class ActorThemeAnalyzer(ContentAnalyzer):
+    """Per-author count of posts touching each theme (served by the API)."""
+    name = "actor_themes"
+    kinds = ("post",)
+
+    def __init__(self):
+        self.counts: Dict[str, Counter] = defaultdict(Counter)
+
+    def visit(self, row: ContentRow):
+        for theme in post_themes(row.title, row.content):
+            self.counts[row.author][theme] += 1
+
+    def finish(self) -> Dict[str, Counter]:
+        return self.counts
+
+
+def posts_updated_through(cursor) -> Optional[str]:
+    """MAX(posts.updated_at): read before a scan, the newest post it is sure to include."""
+    cursor.execute("SELECT MAX(updated_at) FROM posts")
+    return cursor.fetchone()[0]
+
+
+def save_actor_themes(cursor, counts: Dict[str, Counter], updated_through: Optional[str]):
+    """
+    Replace the actor_themes table with fresh counts.
+
+    updated_through (posts_updated_through() before the scan) is kept in
+    actor_themes_scan: an author with a post updated after it has themes
+    the stored rows may not count, and api_server computes those live.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS actor_themes (
+            author TEXT NOT NULL,
+            theme TEXT NOT NULL,
+            post_count INTEGER NOT NULL,
+            PRIMARY KEY (author, theme)
+        )
+    """)
+    cursor.execute("DELETE FROM actor_themes")
+    cursor.executemany(
+        "INSERT INTO actor_themes (author, theme, post_count) VALUES (?, ?, ?)",
+        [(author, theme, n) for author, themes in counts.items() for theme, n in themes.items()]
+    )
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS actor_themes_scan (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            posts_updated_through TEXT,
+            scanned_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR REPLACE INTO actor_themes_scan VALUES (1, ?, ?)",
+                   (updated_through, datetime.now().isoformat()))
+
+
+def actor_themes_current(cursor, author: str) -> bool:
+    """True if the stored actor_themes rows cover every post of author."""
+    try:
+        cursor.execute("SELECT posts_updated_through FROM actor_themes_scan WHERE id = 1")
+    except sqlite3.OperationalError:
+        return False  # never scanned (or scanned before the table existed)
+    row = cursor.fetchone()
+    if row is None:
+        return False
+    # Posts without updated_at can't be dated and count as scanned
+    if row[0] is None:
+        cursor.execute("SELECT 1 FROM posts WHERE author = ? AND updated_at IS NOT NULL LIMIT 1",
+                       (author,))
+    else:
+        cursor.execute("SELECT 1 FROM posts WHERE author = ? AND updated_at > ? LIMIT 1",
+                       (author, row[0]))
+    return cursor.fetchone() is None
+
+
+def run_content_scan():
+    """Run every built-in analyzer over one pass and report/save each."""
+    from analyze_sentiment import SentimentAnalyzer, report_sentiment
+    from analyze_political_economy import PoliticalEconomyAnalyzer, report_political_economy
+    from analyze_boundaries import BoundaryAnalyzer, report_boundaries
+    from alerts import SecurityTopicAnalyzer, detect_alerts, prioritize_alerts, print_alerts
+
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    updated_through = posts_updated_through(cursor)
+    scanner = ContentScanner(conn)
+    for analyzer in (SentimentAnalyzer(), PoliticalEconomyAnalyzer(), BoundaryAnalyzer(),
+                     SecurityTopicAnalyzer(), ActorThemeAnalyzer()):
+        scanner.register(analyzer)
+    results = scanner.run()
+    print(f">> Scanned {scanner.rows_scanned['post']} posts, "
+          f"{scanner.rows_scanned['comment']} comments in one pass")
+
+    report_sentiment(cursor, results[SentimentAnalyzer.name])
+    report_political_economy(cursor, results[PoliticalEconomyAnalyzer.name])
+    report_boundaries(cursor, *results[BoundaryAnalyzer.name])
+    print_alerts(prioritize_alerts(detect_alerts(conn, results[SecurityTopicAnalyzer.name])))
+    save_actor_themes(cursor, results[ActorThemeAnalyzer.name], updated_through)
+    print(f">> Actor themes saved for {len(results[ActorThemeAnalyzer.name])} authors")
+
+    conn.commit()
+    conn.close()
+    return results
+
+
+if __name__ == "__main__":
+    run_content_scan()
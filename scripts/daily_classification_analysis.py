@@ -4,19 +4,28 @@ Daily Classification Analysis
 =============================
 Analyzes agent classifications for each day separately,
 then compares results across days.
+
+Days are classified by one streaming scan of posts + comments grouped by
+(day, author) and stored in daily_classifications, together with each
+day's content watermark (row count, newest scraped_at). A stored day is
+recomputed only when its watermark changes - e.g. comments on yesterday's
+posts scraped today - or for every day with --recompute.
 """
 
 import sqlite3
 import json
+import re
 import sys
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 from dataclasses import dataclass
-from typing import List, Dict, Set
+from itertools import groupby
+from typing import List, Dict, Optional, Tuple
 
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 from config import DB_PATH, REPORTS_DIR, TODAY
+from comment_latency import author_latencies, ensure_comment_latency, latency_stats
 
 
 @dataclass
@@ -28,63 +37,32 @@ class DailyResult:
     top_scores: List[tuple]  # (username, score, category)
 
 
-def compute_timing_for_date(cursor, username: str, date: str) -> dict:
-    """Compute response timing metrics for a specific date."""
-    cursor.execute('''
-        SELECT c.created_at, p.created_at
-        FROM comments c
-        JOIN posts p ON c.post_id = p.id
-        WHERE c.author = ?
-        AND DATE(c.created_at) = ?
-        AND p.author != ?
-        AND c.created_at IS NOT NULL
-        AND p.created_at IS NOT NULL
-    ''', (username, date, username))
-
-    times = []
-    for c_created, p_created in cursor.fetchall():
-        try:
-            c_time = datetime.fromisoformat(c_created.replace('Z', '+00:00').replace('+00:00', ''))
-            p_time = datetime.fromisoformat(p_created.replace('Z', '+00:00').replace('+00:00', ''))
-            diff = (c_time - p_time).total_seconds()
-            if 0 < diff < 86400:
-                times.append(diff)
-        except:
-            pass
-
-    if not times:
-        return {'samples': 0}
+EMOJI_ONLY_RE = re.compile(r'^[\s\U0001F300-\U0001F9FF\U00002600-\U000027BF]+$')
 
-    avg = sum(times) / len(times)
-    variance = sum((t - avg) ** 2 for t in times) / len(times) if len(times) > 1 else 0
+CATEGORY_ORDER = ['LIKELY_AUTONOMOUS', 'POSSIBLY_AUTOMATED', 'SCRIPTED_BOT', 'EMOJI_BOT',
+                  'MINTING_BOT', 'LIKELY_HUMAN', 'INSUFFICIENT_SIGNAL', 'INSUFFICIENT_DATA']
+
+
+def timing_from_latencies(latencies) -> dict:
+    """Timing metrics from one day's response latencies (seconds)."""
+    stats = latency_stats(latencies)
+    if not stats['samples']:
+        return {'samples': 0}
 
     return {
-        'samples': len(times),
-        'avg_seconds': round(avg, 1),
-        'std_dev': round(variance ** 0.5, 1)
+        'samples': stats['samples'],
+        'avg_seconds': round(stats['mean'], 1),
+        'std_dev': round(stats['std'], 1)
     }
 
 
-def compute_repetition_for_date(cursor, username: str, date: str) -> float:
-    """Compute phrase repetition for content on a specific date."""
-    cursor.execute('''
-        SELECT content FROM comments
-        WHERE author = ? AND DATE(created_at) = ?
-    ''', (username, date))
-    comments = [r[0] for r in cursor.fetchall() if r[0]]
-
-    cursor.execute('''
-        SELECT content FROM posts
-        WHERE author = ? AND DATE(created_at) = ?
-    ''', (username, date))
-    posts = [r[0] for r in cursor.fetchall() if r[0]]
-
-    all_content = posts + comments
-    if len(all_content) < 2:
+def repetition_rate(texts: List[str]) -> float:
+    """Share of 3-gram occurrences taken by the 10 most repeated 3-grams."""
+    if len(texts) < 2:
         return 0.0
 
     phrases = []
-    for content in all_content:
+    for content in texts:
         words = content.split()
         for i in range(len(words) - 2):
             phrases.append(' '.join(words[i:i+3]))
@@ -97,59 +75,68 @@ def compute_repetition_for_date(cursor, username: str, date: str) -> float:
     return repeated / len(phrases)
 
 
-def is_emoji_only(cursor, username: str, date: str) -> bool:
-    """Check if account only posts emoji on this date."""
+def emoji_only(comments: List[str]) -> bool:
+    """True if every (non-empty) comment is emoji or under 5 characters."""
+    if not comments:
+        return False
+    return all(EMOJI_ONLY_RE.match(c) or len(c.strip()) < 5 for c in comments)
+
+
+def minting_only(posts: List[str]) -> bool:
+    """True if every (non-empty) post is an mbc-20 mint command."""
+    if not posts:
+        return False
+    return all('"p":"mbc-20"' in p or '"op":"mint"' in p for p in posts)
+
+
+def compute_timing_for_date(cursor, username: str, date: str) -> dict:
+    """Compute response timing metrics for a specific date."""
+    return timing_from_latencies(author_latencies(cursor, username, date=date, max_seconds=86400))
+
+
+def compute_repetition_for_date(cursor, username: str, date: str) -> float:
+    """Compute phrase repetition for content on a specific date."""
     cursor.execute('''
         SELECT content FROM comments
         WHERE author = ? AND DATE(created_at) = ?
     ''', (username, date))
     comments = [r[0] for r in cursor.fetchall() if r[0]]
 
-    if not comments:
-        return False
-
-    import re
-    emoji_pattern = re.compile(r'^[\s\U0001F300-\U0001F9FF\U00002600-\U000027BF]+$')
-    return all(emoji_pattern.match(c) or len(c.strip()) < 5 for c in comments)
-
-
-def is_minting_only(cursor, username: str, date: str) -> bool:
-    """Check if account only posts minting commands."""
     cursor.execute('''
         SELECT content FROM posts
         WHERE author = ? AND DATE(created_at) = ?
     ''', (username, date))
     posts = [r[0] for r in cursor.fetchall() if r[0]]
 
-    if not posts:
-        return False
-
-    return all('"p":"mbc-20"' in p or '"op":"mint"' in p for p in posts)
-
+    return repetition_rate(posts + comments)
 
-def classify_for_date(cursor, username: str, date: str) -> tuple:
-    """Classify an account for a specific date. Returns (category, score)."""
-    timing = compute_timing_for_date(cursor, username, date)
-    repetition = compute_repetition_for_date(cursor, username, date)
 
-    # Get activity count
+def is_emoji_only(cursor, username: str, date: str) -> bool:
+    """Check if account only posts emoji on this date."""
     cursor.execute('''
-        SELECT COUNT(*) FROM comments
+        SELECT content FROM comments
         WHERE author = ? AND DATE(created_at) = ?
     ''', (username, date))
-    comment_count = cursor.fetchone()[0]
+    return emoji_only([r[0] for r in cursor.fetchall() if r[0]])
+
 
+def is_minting_only(cursor, username: str, date: str) -> bool:
+    """Check if account only posts minting commands."""
     cursor.execute('''
-        SELECT COUNT(*) FROM posts
+        SELECT content FROM posts
         WHERE author = ? AND DATE(created_at) = ?
     ''', (username, date))
-    post_count = cursor.fetchone()[0]
+    return minting_only([r[0] for r in cursor.fetchall() if r[0]])
+
 
+def classify_metrics(timing: dict, repetition: float, comment_count: int,
+                     is_emoji: bool, is_minting: bool) -> tuple:
+    """Classify one author-day from its metrics. Returns (category, score)."""
     # Special cases
-    if is_emoji_only(cursor, username, date) and timing.get('avg_seconds', 999) < 10:
+    if is_emoji and timing.get('avg_seconds', 999) < 10:
         return 'EMOJI_BOT', 10.0
 
-    if is_minting_only(cursor, username, date):
+    if is_minting:
         return 'MINTING_BOT', 10.0
 
     if repetition > 0.9:
@@ -189,61 +176,258 @@ def classify_for_date(cursor, username: str, date: str) -> tuple:
         return 'LIKELY_HUMAN', score
 
 
-def analyze_day(cursor, date: str) -> DailyResult:
-    """Analyze all accounts for a specific date."""
-    # Get all authors active on this date
+def classify_for_date(cursor, username: str, date: str) -> tuple:
+    """Classify an account for a specific date. Returns (category, score)."""
+    timing = compute_timing_for_date(cursor, username, date)
+    repetition = compute_repetition_for_date(cursor, username, date)
+
+    cursor.execute('''
+        SELECT COUNT(*) FROM comments
+        WHERE author = ? AND DATE(created_at) = ?
+    ''', (username, date))
+    comment_count = cursor.fetchone()[0]
+
+    return classify_metrics(timing, repetition, comment_count,
+                            is_emoji_only(cursor, username, date),
+                            is_minting_only(cursor, username, date))
+
+
+# =============================================================================
+# DAILY ENGINE - one scan over a date range, results kept in daily_classifications
+# =============================================================================
+
+def init_daily_table(cursor):
+    """Create daily_classifications if it doesn't exist."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_classifications (
+            date TEXT NOT NULL,
+            author TEXT NOT NULL,
+            category TEXT NOT NULL,
+            score REAL,
+            timing_samples INTEGER,
+            avg_seconds REAL,
+            std_dev REAL,
+            repetition REAL,
+            post_count INTEGER,
+            comment_count INTEGER,
+            computed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (date, author)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS daily_classification_days (
+            date TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            max_scraped_at TEXT,
+            computed_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    # Day range scans (init_db only adds it to new databases)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_comments_created ON comments(created_at)")
+
+
+INSERT_DAILY_SQL = '''
+    INSERT OR REPLACE INTO daily_classifications
+    (date, author, category, score, timing_samples, avg_seconds, std_dev,
+     repetition, post_count, comment_count, computed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+
+
+def classification_dates(cursor) -> List[str]:
+    """Every day with comments (the days the analysis covers)."""
+    cursor.execute('''
+        SELECT DISTINCT DATE(created_at) as d
+        FROM comments
+        WHERE created_at IS NOT NULL
+        ORDER BY d
+    ''')
+    return [r[0] for r in cursor.fetchall() if r[0]]
+
+
+def day_watermarks(cursor) -> Dict[str, Tuple[int, Optional[str]]]:
+    """{day: (posts + comments created that day, newest scraped_at)}."""
+    cursor.execute('''
+        SELECT DATE(created_at) AS d, COUNT(*), MAX(scraped_at) FROM (
+            SELECT created_at, scraped_at FROM posts WHERE created_at IS NOT NULL
+            UNION ALL
+            SELECT created_at, scraped_at FROM comments WHERE created_at IS NOT NULL
+        )
+        GROUP BY d
+    ''')
+    return {day: (count, max_scraped) for day, count, max_scraped in cursor.fetchall() if day}
+
+
+def stored_watermarks(cursor) -> Dict[str, Tuple[int, Optional[str]]]:
+    """Watermarks of the days as they were when last classified."""
+    cursor.execute("SELECT date, row_count, max_scraped_at FROM daily_classification_days")
+    return {day: (count, max_scraped) for day, count, max_scraped in cursor.fetchall()}
+
+
+def stream_author_days(conn, start: str, end: str):
+    """
+    Yield ((day, author), rows) for every author active between start and
+    end (inclusive). One scan of posts + comments in the range, sorted by
+    (day, author); only one author-day is held in memory.
+
+    rows: (kind, content, latency_ms, post_author) - latency fields come
+    from comment_latency and are NULL for posts.
+    """
+    end_exclusive = (datetime.strptime(end, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+    cursor = conn.cursor()
     cursor.execute('''
-        SELECT DISTINCT author FROM (
-            SELECT author FROM posts WHERE DATE(created_at) = ?
-            UNION
-            SELECT author FROM comments WHERE DATE(created_at) = ?
+        SELECT day, author, kind, content, latency_ms, post_author FROM (
+            SELECT DATE(created_at) AS day, author, 'post' AS kind, content,
+                   NULL AS latency_ms, NULL AS post_author
+            FROM posts
+            WHERE created_at >= :start AND created_at < :end AND author IS NOT NULL AND author != ''
+            UNION ALL
+            SELECT DATE(c.created_at), c.author, 'comment', c.content,
+                   cl.latency_ms, cl.post_author
+            FROM comments c
+            LEFT JOIN comment_latency cl ON cl.comment_id = c.id
+            WHERE c.created_at >= :start AND c.created_at < :end AND c.author IS NOT NULL AND c.author != ''
         )
-    ''', (date, date))
-    authors = [r[0] for r in cursor.fetchall() if r[0]]
+        ORDER BY day, author
+    ''', {'start': start, 'end': end_exclusive})
+
+    rows = iter(lambda: cursor.fetchmany(2000), [])
+    flat = (row for batch in rows for row in batch)
+    for key, group in groupby(flat, key=lambda r: (r[0], r[1])):
+        yield key, [r[2:] for r in group]
+
+
+def classify_author_day(author: str, rows) -> dict:
+    """Metrics and classification of one author-day from its streamed rows."""
+    posts = [content for kind, content, _, _ in rows if kind == 'post' and content]
+    comments = [content for kind, content, _, _ in rows if kind == 'comment' and content]
+    comment_count = sum(1 for kind, _, _, _ in rows if kind == 'comment')
+    latencies = [latency_ms / 1000 for kind, _, latency_ms, post_author in rows
+                 if kind == 'comment' and latency_ms is not None
+                 and post_author is not None and post_author != author
+                 and 0 < latency_ms < 86400 * 1000]
+
+    timing = timing_from_latencies(latencies)
+    repetition = repetition_rate(posts + comments)
+    category, score = classify_metrics(timing, repetition, comment_count,
+                                       emoji_only(comments), minting_only(posts))
+    return {
+        'category': category,
+        'score': score,
+        'timing': timing,
+        'repetition': repetition,
+        'post_count': len(rows) - comment_count,
+        'comment_count': comment_count
+    }
+
+
+def classify_days(conn, dates: List[str] = None, recompute: bool = False) -> List[str]:
+    """
+    Classify every author on the given days (default: all days with
+    comments) and store the results in daily_classifications.
+
+    Days already stored are skipped unless their content watermark
+    changed since (late comments, re-scraped posts) or recompute is set.
+
+    Returns the days that were (re)computed.
+    """
+    cursor = conn.cursor()
+    init_daily_table(cursor)
+    ensure_comment_latency(cursor)
+
+    all_dates = classification_dates(cursor)
+    dates = sorted(dates) if dates is not None else all_dates
+    if not dates:
+        return []
+
+    marks = day_watermarks(cursor)
+    stored = {} if recompute else stored_watermarks(cursor)
+    pending = [d for d in dates if stored.get(d) is None or stored[d] != marks.get(d)]
+    if not pending:
+        return []
+
+    wanted = set(pending)
+    cursor.execute(f"DELETE FROM daily_classifications WHERE date IN ({','.join('?' * len(pending))})",
+                   pending)
+
+    write = conn.cursor()
+    batch = []
+    for (day, author), rows in stream_author_days(conn, pending[0], pending[-1]):
+        if day not in wanted:
+            continue
+        result = classify_author_day(author, rows)
+        timing = result['timing']
+        batch.append((day, author, result['category'], result['score'], timing['samples'],
+                      timing.get('avg_seconds'), timing.get('std_dev'), result['repetition'],
+                      result['post_count'], result['comment_count']))
+        if len(batch) >= 1000:
+            write.executemany(INSERT_DAILY_SQL, batch)
+            batch.clear()
+    if batch:
+        write.executemany(INSERT_DAILY_SQL, batch)
+
+    write.executemany('''
+        INSERT OR REPLACE INTO daily_classification_days (date, row_count, max_scraped_at, computed_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ''', [(day, *marks.get(day, (0, None))) for day in pending])
+
+    conn.commit()
+    return pending
+
+
+def load_daily_result(cursor, date: str) -> DailyResult:
+    """DailyResult for one day from daily_classifications."""
+    cursor.execute('''
+        SELECT author, category, score, timing_samples
+        FROM daily_classifications
+        WHERE date = ?
+        ORDER BY author
+    ''', (date,))
 
     classifications = defaultdict(list)
     top_scores = []
     with_timing = 0
+    rows = cursor.fetchall()
 
-    for author in authors:
-        category, score = classify_for_date(cursor, author, date)
+    for author, category, score, timing_samples in rows:
         classifications[category].append(author)
-
         if score > 0:
             top_scores.append((author, score, category))
-
-        timing = compute_timing_for_date(cursor, author, date)
-        if timing['samples'] >= 2:
+        if timing_samples >= 2:
             with_timing += 1
 
     top_scores.sort(key=lambda x: x[1], reverse=True)
 
     return DailyResult(
         date=date,
-        total_authors=len(authors),
+        total_authors=len(rows),
         with_timing=with_timing,
         classifications=dict(classifications),
         top_scores=top_scores[:20]
     )
 
 
+def analyze_day(cursor, date: str) -> DailyResult:
+    """Analyze all accounts for a specific date."""
+    classify_days(cursor.connection, [date], recompute=True)
+    return load_daily_result(cursor, date)
+
+
 def main():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    recompute = '--recompute' in sys.argv
+
     # Get all dates with data
-    cursor.execute('''
-        SELECT DISTINCT DATE(created_at) as d
-        FROM comments
-        WHERE created_at IS NOT NULL
-        ORDER BY d
-    ''')
-    dates = [r[0] for r in cursor.fetchall()]
+    dates = classification_dates(cursor)
 
     print("=" * 80)
     print("DAILY CLASSIFICATION ANALYSIS")
     print("=" * 80)
     print(f"Analyzing {len(dates)} days: {dates[0]} to {dates[-1]}")
+    computed = classify_days(conn, dates, recompute=recompute)
+    print(f"Classified {len(computed)} days ({len(dates) - len(computed)} already stored)")
     print()
 
     all_results = []
@@ -253,7 +437,7 @@ def main():
         print(f"DATE: {date}")
         print("=" * 60)
 
-        result = analyze_day(cursor, date)
+        result = load_daily_result(cursor, date)
         all_results.append(result)
 
         print(f"Total authors: {result.total_authors}")
@@ -261,8 +445,7 @@ def main():
         print()
 
         print("Classifications:")
-        for cat in ['LIKELY_AUTONOMOUS', 'POSSIBLY_AUTOMATED', 'SCRIPTED_BOT',
-                    'EMOJI_BOT', 'MINTING_BOT', 'LIKELY_HUMAN', 'INSUFFICIENT_SIGNAL', 'INSUFFICIENT_DATA']:
+        for cat in CATEGORY_ORDER:
             count = len(result.classifications.get(cat, []))
             if count > 0:
                 names = result.classifications[cat][:5]
@@ -36,7 +36,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_script(script_name, description, timeout=600):
+def run_script(script_name, description, timeout=600, args=None):
     """Uruchom skrypt Python i zwróć sukces/porażkę."""
     script_path = SCRIPTS_DIR / script_name
     if not script_path.exists():
@@ -46,7 +46,7 @@ def run_script(script_name, description, timeout=600):
     logger.info(f"[START] {description}")
     try:
         result = subprocess.run(
-            [sys.executable, str(script_path)],
+            [sys.executable, str(script_path)] + list(args or []),
             capture_output=True,
             text=True,
             timeout=timeout,
@@ -173,6 +173,43 @@ def main():
         timeout=300
     )
 
+    # 2.6. Incremental PageRank/degree update (only changed network_score rows written);
+    #      betweenness/clustering are rebuilt weekly or after 20% node/edge growth
+    results['graph_update'] = run_script(
+        'graph_engine.py',
+        'Updating graph centrality incrementally',
+        timeout=300,
+        args=['--update']
+    )
+
+    # 2.7. Columnar snapshot (only days changed since the last export are rewritten)
+    results['snapshot'] = run_script(
+        'snapshot.py',
+        'Refreshing Parquet snapshot',
+        timeout=300
+    )
+
+    # 2.8. Materialized API stats / featured-agent candidates
+    results['api_cache'] = run_script(
+        'api_cache.py',
+        'Refreshing API stats cache',
+        timeout=120
+    )
+
+    # 2.9. One content pass: actor themes for the API, sentiment / economy / boundary reports
+    results['content_scan'] = run_script(
+        'content_scan.py',
+        'Scanning content (actor themes, sentiment, boundaries)',
+        timeout=600
+    )
+
+    # 2.10. Isolation Forest scores (daily refit; otherwise only accounts with new content)
+    results['anomaly_scores'] = run_script(
+        'anomaly_engine.py',
+        'Refreshing anomaly scores',
+        timeout=600
+    )
+
     # 3. Generuj raport dzienny
     results['daily_report'] = run_script(
         'generate_daily_report.py',
@@ -180,6 +217,14 @@ def main():
         timeout=120
     )
 
+    # 3.5. Biografie top 500 agentów (batch, grouped loads + worker pool)
+    results['life_histories'] = run_script(
+        'generate_life_histories.py',
+        'Generating life histories',
+        timeout=600,
+        args=['--top', '500']
+    )
+
     # 4. Aktualizuj dashboard
     results['dashboard_data'] = run_script(
         'generate_dashboard_data.py',
@@ -187,6 +232,14 @@ def main():
         timeout=60
     )
 
+    # 4.5. New data version: API responses built from older data stop validating
+    results['data_version'] = run_script(
+        'data_version.py',
+        'Publishing data version',
+        timeout=60,
+        args=['--bump']
+    )
+
     # 5. Upload na FTP (opcjonalnie)
     if '--upload' in sys.argv or '-u' in sys.argv:
         results['ftp_upload'] = upload_to_ftp()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Data Version - one counter that moves whenever the served data changes.
+
+Writers bump it in the same transaction as their writes (run_scanner,
+scrape_comments, API submissions) and daily_update bumps it once more
+after the batch analyses. api_server builds its ETags from it, so a
+client that already holds the current version gets 304 Not Modified
+without the response being rebuilt. Refreshing the materialized
+api_cache tables does not bump it: /api/v1/stats is versioned on their
+refreshed_at as well.
+
+    data_version    single row: version, updated_at
+
+Usage:
+    bump_data_version(cursor)           # inside the writer's transaction
+    version = read_data_version(cursor)
+
+    python data_version.py              # Print the current version
+    python data_version.py --bump       # Bump it (after batch analyses)
+"""
+
+import sys
+import sqlite3
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import DB_PATH
+
+
+def init_data_version(cursor):
+    """Create the version table if it doesn't exist."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+
+
+def bump_data_version(cursor):
+    """Advance the version; joins the caller's transaction."""
+    init_data_version(cursor)
+    cursor.execute("""
+        INSERT INTO data_version (id, version, updated_at) VALUES (1, 1, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            version = version + 1,
+            updated_at = excluded.updated_at
+    """, (datetime.now().isoformat(),))
+
+
+def read_data_version(cursor) -> int:
+    """The current version (0 before the first bump)."""
+    try:
+        cursor.execute("SELECT version FROM data_version WHERE id = 1")
+    except sqlite3.OperationalError:
+        return 0  # table not created yet
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show or bump the served-data version')
+    parser.add_argument('--bump', action='store_true', help='Advance the version')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    if args.bump:
+        bump_data_version(cursor)
+        conn.commit()
+    print(f">> data version: {read_data_version(cursor)}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
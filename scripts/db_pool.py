@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+DB Pool - per-process pool of read-only SQLite connections.
+
+api_server opened a fresh sqlite3 connection on every request. Server
+workers now borrow from a ReadOnlyPool instead: connections are opened
+lazily (up to `size`), switched to PRAGMA query_only and reused. The
+database is put in WAL mode the first time a pool opens it, so readers
+never block the pipeline's writers (and vice versa).
+
+The pool belongs to one process: after a fork the child drops the
+inherited connections and opens its own.
+
+Usage:
+    pool = ReadOnlyPool(DB_PATH, size=8)
+    with pool.connection() as conn:
+        conn.execute("SELECT ...")
+
+    conn = pool.acquire()            # same, for try/finally code
+    try:
+        ...
+    finally:
+        pool.release(conn)
+"""
+
+import os
+import queue
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("db_pool")
+
+DEFAULT_POOL_SIZE = 8
+
+
+def enable_wal(db_path: Path) -> bool:
+    """Switch the database to WAL (persistent); False if it couldn't be done now."""
+    conn = sqlite3.connect(str(db_path), timeout=5)
+    try:
+        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        return str(mode).lower() == "wal"
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Could not enable WAL on {db_path}: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+class ReadOnlyPool:
+    """Thread-safe pool of query-only connections to one database."""
+
+    def __init__(self, db_path: Path, size: int = DEFAULT_POOL_SIZE, timeout: float = 30.0):
+        """
+        Args:
+            db_path: SQLite database
+            size: Most connections open at once (per process)
+            timeout: Seconds to wait for a free connection / a lock
+        """
+        self.db_path = Path(db_path)
+        self.size = size
+        self.timeout = timeout
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._wal_checked = False
+
+    def _check_pid(self):
+        # Connections must not cross fork(); the child starts with an empty pool
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def _open(self) -> sqlite3.Connection:
+        with self._lock:
+            if not self._wal_checked:
+                self._wal_checked = True
+                enable_wal(self.db_path)
+        conn = sqlite3.connect(str(self.db_path), timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Borrow a connection; blocks while `size` are in use."""
+        self._check_pid()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError("connection pool exhausted")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._open()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: Optional[sqlite3.Connection]):
+        """Return a borrowed connection (row_factory is reset)."""
+        if conn is None:
+            return
+        if os.getpid() != self._pid:
+            return  # borrowed before a fork; not ours to keep
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            self._idle.put(conn)
+        except sqlite3.Error:
+            conn.close()
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close the idle connections (e.g. when a worker exits)."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Discovery Store - discoveries.json indexed in memory for api_server.
+
+The discovery endpoints re-read and re-parsed the whole file on every
+request, then filtered, searched and looked ids up with linear scans.
+DiscoveryStore parses the file once into an immutable snapshot with
+
+    by id                   detail lookups
+    by significance/category  position lists for filters
+    trigram -> positions    search: candidates from the query's trigrams,
+                            confirmed with the same substring test as before
+    precomputed counts      categories and significance totals
+
+and swaps in a new snapshot only when the file's mtime or size changes,
+so list, detail and category calls cost about the size of their result.
+version() identifies the snapshot being served, for api_server's ETags.
+
+Usage:
+    store = DiscoveryStore(DISCOVERIES_PATH)
+    total, page = store.query(significance="HIGH", q="trust", limit=20)
+    discovery = store.get("42")
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _Snapshot:
+    """Indexes over one parsed version of the file."""
+
+    def __init__(self, discoveries: list, signature=None):
+        self.items = discoveries
+        self.signature = signature  # (mtime_ns, size) of the file it came from
+        self.by_id: Dict[str, dict] = {}
+        self.by_significance: Dict[str, List[int]] = {}
+        self.by_category: Dict[str, List[int]] = {}
+        self.trigrams: Dict[str, List[int]] = {}
+        # Lowercased title / description, the fields search looks at
+        self.haystacks: List[Tuple[str, str]] = []
+
+        category_counts: Dict[str, int] = {}
+        for pos, d in enumerate(discoveries):
+            self.by_id.setdefault(str(d.get('id')), d)
+            self.by_significance.setdefault(d.get('significance'), []).append(pos)
+            self.by_category.setdefault((d.get('category') or '').lower(), []).append(pos)
+
+            cat = d.get('category', 'Uncategorized')
+            category_counts[cat] = category_counts.get(cat, 0) + 1
+
+            title = (d.get('title') or '').lower()
+            description = (d.get('description') or '').lower()
+            self.haystacks.append((title, description))
+            for gram in _trigrams(title) | _trigrams(description):
+                self.trigrams.setdefault(gram, []).append(pos)
+
+        self.categories = [{"name": k, "count": v} for k, v in sorted(category_counts.items())]
+        self.significance_counts = {
+            level.lower(): len(self.by_significance.get(level, ()))
+            for level in ('HIGH', 'MEDIUM', 'LOW')
+        }
+
+    def search(self, query: str) -> Iterable[int]:
+        """Positions whose title or description contains query (lowercased)."""
+        if len(query) >= 3:
+            postings = []
+            for gram in _trigrams(query):
+                positions = self.trigrams.get(gram)
+                if positions is None:
+                    return []
+                postings.append(positions)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for positions in postings[1:]:
+                candidates.intersection_update(positions)
+                if not candidates:
+                    return []
+        else:
+            candidates = range(len(self.items))
+        haystacks = self.haystacks
+        return [pos for pos in candidates
+                if query in haystacks[pos][0] or query in haystacks[pos][1]]
+
+
+class DiscoveryStore:
+    """discoveries.json, loaded once and reloaded when the file changes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._signature = None
+        self._snapshot: Optional[_Snapshot] = None  # until the first load
+        self._lock = threading.Lock()
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def snapshot(self) -> _Snapshot:
+        """The current snapshot, reloading first if the file changed."""
+        signature = self._file_signature()
+        if self._snapshot is not None and signature == self._signature:
+            return self._snapshot
+
+        # One thread reloads; others keep using the previous snapshot, or
+        # wait for the first load when there is none yet
+        if not self._lock.acquire(blocking=self._snapshot is None):
+            return self._snapshot
+        try:
+            signature = self._file_signature()
+            if self._snapshot is None or signature != self._signature:
+                discoveries = []
+                if signature is not None:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        discoveries = json.load(f)
+                self._snapshot = _Snapshot(discoveries, signature)
+                self._signature = signature
+            return self._snapshot
+        finally:
+            self._lock.release()
+
+    def all(self) -> list:
+        return self.snapshot().items
+
+    def version(self):
+        """Identifies the file contents being served (for ETags)."""
+        return self.snapshot().signature
+
+    def get(self, discovery_id) -> Optional[dict]:
+        """The discovery with this id (compared as strings), or None."""
+        return self.snapshot().by_id.get(str(discovery_id))
+
+    def categories(self) -> list:
+        """[{"name", "count"}] sorted by name."""
+        return self.snapshot().categories
+
+    def significance_counts(self) -> dict:
+        """{"high", "medium", "low"} discovery counts."""
+        return self.snapshot().significance_counts
+
+    def query(self, significance: Optional[str] = None, category: Optional[str] = None,
+              q: Optional[str] = None, limit: int = 50, offset: int = 0) -> Tuple[int, list]:
+        """
+        Filter, search and paginate, in file order.
+
+        Args:
+            significance: Exact level (case-insensitive)
+            category: Exact category (case-insensitive)
+            q: Substring of title or description (case-insensitive)
+
+        Returns:
+            (total matches, discoveries[offset:offset + limit])
+        """
+        snap = self.snapshot()
+        selections = []
+        if significance:
+            selections.append(snap.by_significance.get(significance.upper(), []))
+        if category:
+            selections.append(snap.by_category.get(category.lower(), []))
+        if q:
+            selections.append(snap.search(q.lower()))
+
+        if not selections:
+            return len(snap.items), snap.items[offset:offset + limit]
+
+        selections.sort(key=len)
+        positions = set(selections[0])
+        for selection in selections[1:]:
+            positions.intersection_update(selection)
+        positions = sorted(positions)
+        return len(positions), [snap.items[pos] for pos in positions[offset:offset + limit]]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Feature Store - cached per-actor text features.
+
+Stylometry, fingerprint, credibility and evolution extractors all derive
+features from the same thing: an actor's posts and comments. Results are
+kept in the actor_features table keyed by (actor, feature_set, version)
+together with the actor's content watermark - MAX(created_at) and row
+count over posts + comments. A cached row is reused while the watermark
+and the extractor version are unchanged, so a daily run only recomputes
+actors who posted since the last run (or every actor after a version bump).
+
+Usage:
+    cache = FeatureCache(cursor, "stylometry", STYLOMETRY_FEATURES_VERSION)
+    cache.preload(authors)                  # optional: one GROUP BY for all
+    features = cache.get_or_compute(author, lambda: extract_features(...))
+    conn.commit()
+
+Bump the extractor's *_FEATURES_VERSION constant whenever its output
+changes; stale rows are replaced on the next write.
+"""
+
+import json
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+Watermark = Tuple[Optional[str], int]  # (max created_at, row count)
+
+
+def init_feature_table(cursor):
+    """Create actor_features if it doesn't exist."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS actor_features (
+            actor TEXT NOT NULL,
+            feature_set TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            max_created_at TEXT,
+            row_count INTEGER NOT NULL,
+            features_json TEXT,
+            computed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (actor, feature_set, version)
+        )
+    """)
+
+
+def _watermark_query(until: Optional[str], actor_filter: str) -> str:
+    cutoff = " AND created_at <= :until" if until else ""
+    return f"""
+        SELECT author, MAX(created_at), COUNT(*) FROM (
+            SELECT author, created_at FROM posts WHERE {actor_filter}{cutoff}
+            UNION ALL
+            SELECT author, created_at FROM comments WHERE {actor_filter}{cutoff}
+        )
+        GROUP BY author
+    """
+
+
+def actor_watermark(cursor, actor: str, until: Optional[str] = None) -> Watermark:
+    """Content watermark for one actor (optionally only content <= until)."""
+    cursor.execute(_watermark_query(until, "author = :actor"),
+                   {'actor': actor, 'until': until})
+    row = cursor.fetchone()
+    return (row[1], row[2]) if row else (None, 0)
+
+
+def load_watermarks(cursor, until: Optional[str] = None) -> Dict[str, Watermark]:
+    """Content watermarks for every author in one pass over posts/comments."""
+    cursor.execute(_watermark_query(until, "author IS NOT NULL"), {'until': until})
+    return {author: (max_ts, count) for author, max_ts, count in cursor.fetchall()}
+
+
+class FeatureCache:
+    """Get-or-compute access to one feature set in actor_features."""
+
+    def __init__(self, cursor, feature_set: str, version: int,
+                 until: Optional[str] = None):
+        """
+        Args:
+            cursor: DB cursor; writes join the caller's transaction
+            feature_set: Name of the extractor, e.g. "stylometry"
+            version: Extractor version; rows with another version are stale
+            until: Only count content created at or before this timestamp
+                   (for point-in-time features such as evolution snapshots)
+        """
+        self.cursor = cursor
+        self.feature_set = feature_set
+        self.version = version
+        self.until = until
+        self.hits = 0
+        self.misses = 0
+        self._watermarks: Optional[Dict[str, Watermark]] = None
+        self._cached: Dict[str, Tuple[Watermark, str]] = {}
+        init_feature_table(cursor)
+
+    def preload(self, actors: Optional[Iterable[str]] = None):
+        """Load watermarks and cached rows in bulk instead of per actor."""
+        self._watermarks = load_watermarks(self.cursor, self.until)
+        wanted = set(actors) if actors is not None else None
+        self.cursor.execute("""
+            SELECT actor, max_created_at, row_count, features_json
+            FROM actor_features
+            WHERE feature_set = ? AND version = ?
+        """, (self.feature_set, self.version))
+        for actor, max_ts, count, features_json in self.cursor.fetchall():
+            if wanted is None or actor in wanted:
+                self._cached[actor] = ((max_ts, count), features_json)
+
+    def watermark(self, actor: str) -> Watermark:
+        if self._watermarks is not None:
+            return self._watermarks.get(actor, (None, 0))
+        return actor_watermark(self.cursor, actor, self.until)
+
+    def _stored(self, actor: str) -> Optional[Tuple[Watermark, str]]:
+        if self._watermarks is not None:
+            return self._cached.get(actor)
+        self.cursor.execute("""
+            SELECT max_created_at, row_count, features_json
+            FROM actor_features
+            WHERE actor = ? AND feature_set = ? AND version = ?
+        """, (actor, self.feature_set, self.version))
+        row = self.cursor.fetchone()
+        return ((row[0], row[1]), row[2]) if row else None
+
+    def lookup(self, actor: str) -> Tuple[bool, Optional[Dict], Watermark]:
+        """
+        Returns:
+            (hit, features, watermark) - features are only meaningful on a hit
+            (a cached None means the extractor had too little text)
+        """
+        watermark = self.watermark(actor)
+        stored = self._stored(actor)
+        if stored is not None and stored[0] == watermark:
+            self.hits += 1
+            return True, json.loads(stored[1]), watermark
+        self.misses += 1
+        return False, None, watermark
+
+    def store(self, actor: str, features: Optional[Dict], watermark: Watermark):
+        """Save features computed from content at the given watermark."""
+        features_json = json.dumps(features)
+        self.cursor.execute("""
+            DELETE FROM actor_features
+            WHERE actor = ? AND feature_set = ? AND version != ?
+        """, (actor, self.feature_set, self.version))
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO actor_features
+            (actor, feature_set, version, max_created_at, row_count, features_json, computed_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (actor, self.feature_set, self.version, watermark[0], watermark[1], features_json))
+        if self._watermarks is not None:
+            self._cached[actor] = (watermark, features_json)
+
+    def get_or_compute(self, actor: str, compute: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """Return cached features, or run compute() and cache its result."""
+        hit, features, watermark = self.lookup(actor)
+        if hit:
+            return features
+        features = compute()
+        self.store(actor, features, watermark)
+        return features
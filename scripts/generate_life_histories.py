@@ -2,14 +2,28 @@
 """
 C. Life Histories - biographical profiles of key agents.
 Classic anthropological technique: individual trajectories reveal cultural patterns.
+
+Biographies are generated in batches: timelines, interaction edges, actor
+rows and roles for a chunk of agents are loaded with one grouped query
+each, then biographies are built and their reports written across worker
+processes. Large runs (e.g. --top 500 nightly) cost a few queries per
+chunk instead of five per agent.
+
+Usage:
+    python generate_life_histories.py --top 500
+    python generate_life_histories.py --top 5 --workers 1   # No worker processes
 """
 
 import sys
+import json
 import sqlite3
 import re
 from datetime import datetime
 from pathlib import Path
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from itertools import groupby
+from typing import Dict, List, Optional
 from config import DB_PATH
 
 if sys.platform == 'win32':
@@ -17,6 +31,17 @@ if sys.platform == 'win32':
 
 OUTPUT_DIR = Path.home() / "moltbook-observatory" / "reports" / "life_histories"
 
+LIFE_HISTORY_CHUNK = 25        # agents per grouped load / worker task
+LIFE_HISTORY_MAX_PENDING = 16  # chunks in flight (bounds memory)
+
+CRISIS_PATTERNS = [re.compile(p) for p in (
+    r'\bcrisis\b', r'\bstruggl', r'\bconfus', r'\bdoubt\b',
+    r'\bquestion.*myself', r'\bwho am i', r'\bwhat am i',
+    r'\blost\b', r'\bbroken\b', r'\bfailed\b',
+    r'\bchanged\b.*\bmind', r'\brealized\b', r'\bepiphany\b',
+    r'\bturning point', r'\bbreakthrough\b'
+)]
+
 
 def get_agent_timeline(cursor, username):
     """Get chronological activity of an agent."""
@@ -57,6 +82,55 @@ def get_agent_interactions(cursor, username):
     return {'outgoing': outgoing, 'incoming': incoming}
 
 
+def _in_list(usernames) -> str:
+    return json.dumps(list(usernames))
+
+
+def load_timelines(cursor, usernames) -> Dict[str, list]:
+    """get_agent_timeline() for many agents in one query: {username: timeline}."""
+    cursor.execute("""
+        SELECT author, type, id, content, created_at, upvotes, downvotes FROM (
+            SELECT author, 'post' as type, id, title as content, created_at, upvotes, downvotes
+            FROM posts WHERE author IN (SELECT value FROM json_each(?))
+            UNION ALL
+            SELECT author, 'comment' as type, id, content, created_at, upvotes, downvotes
+            FROM comments WHERE author IN (SELECT value FROM json_each(?))
+        )
+        ORDER BY author, created_at
+    """, (_in_list(usernames), _in_list(usernames)))
+
+    return {author: [row[1:] for row in rows]
+            for author, rows in groupby(cursor.fetchall(), key=lambda row: row[0])}
+
+
+def load_interactions(cursor, usernames) -> Dict[str, dict]:
+    """get_agent_interactions() for many agents from one GROUP BY over their edges."""
+    wanted = set(usernames)
+    outgoing = defaultdict(list)
+    incoming = defaultdict(list)
+
+    cursor.execute("""
+        SELECT author_from, author_to, COUNT(*) as cnt
+        FROM interactions
+        WHERE author_from IS NOT NULL AND author_to IS NOT NULL
+          AND (author_from IN (SELECT value FROM json_each(?))
+               OR author_to IN (SELECT value FROM json_each(?)))
+        GROUP BY author_from, author_to
+    """, (_in_list(wanted), _in_list(wanted)))
+    for author_from, author_to, cnt in cursor.fetchall():
+        if author_from in wanted:
+            outgoing[author_from].append((author_to, cnt))
+        if author_to in wanted:
+            incoming[author_to].append((author_from, cnt))
+
+    def top(edges):
+        # ORDER BY cnt DESC LIMIT 10 (equal counts by name, descending)
+        return sorted(edges, key=lambda edge: (edge[1], edge[0]), reverse=True)[:10]
+
+    return {username: {'outgoing': top(outgoing[username]), 'incoming': top(incoming[username])}
+            for username in wanted}
+
+
 def analyze_themes(texts):
     """Analyze recurring themes in agent's writing."""
     if not texts:
@@ -87,20 +161,12 @@ def detect_crisis_moments(timeline):
         content_lower = content.lower()
 
         # Crisis markers
-        crisis_patterns = [
-            r'\bcrisis\b', r'\bstruggl', r'\bconfus', r'\bdoubt\b',
-            r'\bquestion.*myself', r'\bwho am i', r'\bwhat am i',
-            r'\blost\b', r'\bbroken\b', r'\bfailed\b',
-            r'\bchanged\b.*\bmind', r'\brealized\b', r'\bepiphany\b',
-            r'\bturning point', r'\bbreakthrough\b'
-        ]
-
-        for pattern in crisis_patterns:
-            if re.search(pattern, content_lower):
+        for pattern in CRISIS_PATTERNS:
+            if pattern.search(content_lower):
                 crises.append({
                     'timestamp': timestamp,
                     'content': content[:300],
-                    'trigger': pattern
+                    'trigger': pattern.pattern
                 })
                 break
 
@@ -146,23 +212,29 @@ def generate_biography(cursor, username):
 
     timeline = get_agent_timeline(cursor, username)
     interactions = get_agent_interactions(cursor, username)
-    themes = analyze_themes([t[2] for t in timeline])
-    crises = detect_crisis_moments(timeline)
-    evolution = analyze_evolution(timeline)
 
+    # Get role classification
+    cursor.execute("""
+        SELECT primary_role, evidence FROM actor_roles WHERE username = ?
+    """, (username,))
+    role_data = cursor.fetchone()
+
+    return build_biography(username, actor, timeline, interactions, role_data)
+
+
+def build_biography(username, actor, timeline, interactions, role_data):
+    """Biography from preloaded data (actors row, timeline, interactions, actor_roles row)."""
     if not timeline:
         return None
 
+    themes = analyze_themes([t[2] for t in timeline])
+    crises = detect_crisis_moments(timeline)
+    evolution = analyze_evolution(timeline)
+
     # Get first and last activity
     first = timeline[0]
     last = timeline[-1]
 
-    # Get role classification
-    cursor.execute("""
-        SELECT primary_role, evidence FROM actor_roles WHERE username = ?
-    """, (username,))
-    role_data = cursor.fetchone()
-
     bio = {
         'username': username,
         'centrality': actor[1] if actor else None,
@@ -184,6 +256,76 @@ def generate_biography(cursor, username):
     return bio
 
 
+def load_biography_inputs(cursor, usernames: List[str]) -> List[tuple]:
+    """build_biography() arguments for a chunk of agents, from grouped queries."""
+    cursor.execute("""
+        SELECT username, network_centrality, comments_count
+        FROM actors WHERE username IN (SELECT value FROM json_each(?))
+    """, (_in_list(usernames),))
+    actors = {row[0]: row for row in cursor.fetchall()}
+
+    # One role per agent, as fetchone() picked it (first row)
+    cursor.execute("""
+        SELECT username, primary_role, evidence FROM actor_roles
+        WHERE username IN (SELECT value FROM json_each(?))
+        ORDER BY id
+    """, (_in_list(usernames),))
+    roles = {}
+    for username, role, evidence in cursor.fetchall():
+        roles.setdefault(username, (role, evidence))
+
+    timelines = load_timelines(cursor, usernames)
+    interactions = load_interactions(cursor, usernames)
+
+    return [(username, actors.get(username), timelines.get(username, []),
+             interactions[username], roles.get(username))
+            for username in usernames]
+
+
+def biography_path(username) -> Path:
+    return OUTPUT_DIR / f"{username.replace('/', '_')}_biography.md"
+
+
+def _biography_chunk(inputs):
+    """Worker: build and write biographies; returns [(username, bio or None)]."""
+    results = []
+    for args in inputs:
+        bio = build_biography(*args)
+        if bio:
+            write_biography_report(bio, biography_path(bio['username']))
+        results.append((args[0], bio))
+    return results
+
+
+def generate_biographies(cursor, usernames: List[str], workers: Optional[int] = None):
+    """
+    Yield (username, bio or None) for many agents, writing each report.
+
+    Agents are loaded LIFE_HISTORY_CHUNK at a time; workers=1 runs inline,
+    otherwise a process pool (default: one per CPU) is used. Results come
+    back as chunks finish, not in input order.
+    """
+    def chunks():
+        for i in range(0, len(usernames), LIFE_HISTORY_CHUNK):
+            yield load_biography_inputs(cursor, usernames[i:i + LIFE_HISTORY_CHUNK])
+
+    if workers == 1:
+        for chunk in chunks():
+            yield from _biography_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks():
+            pending.add(executor.submit(_biography_chunk, chunk))
+            if len(pending) >= LIFE_HISTORY_MAX_PENDING:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
+
+
 def write_biography_report(bio, output_path):
     """Write biography to markdown file."""
     report = []
@@ -235,7 +377,7 @@ def write_biography_report(bio, output_path):
         f.write('\n'.join(report))
 
 
-def run_life_histories(top_n=5):
+def run_life_histories(top_n=5, workers=None):
     """Generate life histories for top agents."""
     print("=" * 60)
     print("  LIFE HISTORIES - Agent Biographies")
@@ -256,37 +398,38 @@ def run_life_histories(top_n=5):
     """, (top_n,))
 
     top_agents = cursor.fetchall()
+    centralities = dict(top_agents)
 
     print(f"\n>> Generating biographies for {len(top_agents)} top agents...")
 
-    for username, centrality in top_agents:
-        print(f"\n>> Processing: {username} (centrality: {centrality:.3f})")
+    written = 0
+    for username, bio in generate_biographies(cursor, [u for u, _ in top_agents], workers):
+        print(f"\n>> Processing: {username} (centrality: {centralities[username]:.3f})")
 
-        bio = generate_biography(cursor, username)
         if not bio:
             print(f"   [SKIP] No data found")
             continue
 
-        output_path = OUTPUT_DIR / f"{username.replace('/', '_')}_biography.md"
-        write_biography_report(bio, output_path)
-
+        written += 1
         print(f"   Activity: {bio['total_activity']} total")
         print(f"   Themes: {', '.join(list(bio['themes'].keys())[:5])}")
         print(f"   Crises detected: {len(bio['crises'])}")
-        print(f"   Saved: {output_path.name}")
+        print(f"   Saved: {biography_path(username).name}")
 
     conn.close()
 
     print("\n" + "=" * 60)
     print("  LIFE HISTORIES COMPLETE")
     print("=" * 60)
-    print(f"\nBiographies saved to: {OUTPUT_DIR}")
+    print(f"\n{written} biographies saved to: {OUTPUT_DIR}")
 
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--top", type=int, default=5, help="Number of top agents to profile")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU, 1 = inline)")
     args = parser.parse_args()
 
-    run_life_histories(top_n=args.top)
+    run_life_histories(top_n=args.top, workers=args.workers)
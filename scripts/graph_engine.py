@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+Graph Engine - sparse-matrix centrality for the interaction graph.
+
+Replaces the networkx DiGraph in advanced_analysis_v4 with a SciPy CSR
+adjacency over interned actor IDs:
+
+- PageRank: weighted power iteration (same alpha/dangling handling as networkx)
+- In/out degree: row/column counts of the binary adjacency
+- Clustering: triangle counts on the undirected simple graph, diag(U^3)
+- Betweenness: sampled Brandes, with BFS and dependency accumulation done
+  level-by-level as sparse mat-vec products over a batch of sources
+
+Output fields match compute_graph_centrality (pagerank, betweenness,
+clustering_coef, in/out_degree_norm, network_score, in/out_degree_raw);
+advanced_analysis_v4 scores from the same persisted state.
+
+Incremental mode persists the CSR matrix, the last PageRank vector and
+degrees in data/graph_state.npz. New interactions (id > last seen) are
+added as an edge delta, degrees are patched from the delta and PageRank
+is warm-started from the previous vector. Betweenness and clustering
+carry over from the last full rebuild, which --update redoes once it is
+FULL_REBUILD_DAYS old or the graph has grown by FULL_REBUILD_GROWTH in
+nodes or edges since (the time and sizes are kept in the state file). Only actors whose stored
+network_score differs from the new one by more than the tolerance are
+written back; this module is the only writer of actors.network_score.
+
+Usage:
+    python graph_engine.py            # Print top 20 by network_score
+    python graph_engine.py --update   # Incremental update (full rebuild when due)
+    python graph_engine.py --full     # Full rebuild of the persisted state
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import DB_PATH, DATA_DIR
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Weights of the combined network score (same as v4)
+NETWORK_SCORE_WEIGHTS = {
+    'pagerank': 0.35,
+    'betweenness': 0.25,
+    'clustering_coef': 0.15,
+    'in_degree_norm': 0.15,
+    'out_degree_norm': 0.10,
+}
+
+BETWEENNESS_SAMPLE = 500   # sources sampled on graphs > BETWEENNESS_EXACT_MAX
+BETWEENNESS_EXACT_MAX = 1000
+BETWEENNESS_BATCH = 32     # sources processed together (n x batch dense arrays)
+
+GRAPH_STATE_PATH = DATA_DIR / "graph_state.npz"
+SCORE_TOLERANCE = 1e-3     # min network_score change that triggers a DB write
+FULL_REBUILD_DAYS = 7      # --update rebuilds betweenness/clustering this often...
+FULL_REBUILD_GROWTH = 0.2  # ...or once nodes or edges grew this much since
+
+
+class ActorIndex:
+    """Interned actor-name <-> integer ID mapping."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def intern(self, name: str) -> int:
+        idx = self.ids.get(name)
+        if idx is None:
+            idx = len(self.names)
+            self.ids[name] = idx
+            self.names.append(name)
+        return idx
+
+
+def load_edges(cursor, since_id: int = 0,
+               until_id: Optional[int] = None) -> List[Tuple[str, str, int]]:
+    """Aggregated (author_from, author_to, weight) edges for since_id < interactions.id <= until_id."""
+    if until_id is None:
+        until_id = _max_interaction_id(cursor)
+    cursor.execute("""
+        SELECT author_from, author_to, COUNT(*) as weight
+        FROM interactions
+        WHERE author_from IS NOT NULL AND author_to IS NOT NULL
+        AND author_from != '' AND author_to != ''
+        AND id > ? AND id <= ?
+        GROUP BY author_from, author_to
+    """, (since_id, until_id))
+    return cursor.fetchall()
+
+
+def _max_interaction_id(cursor) -> int:
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM interactions")
+    return cursor.fetchone()[0]
+
+
+class InteractionGraph:
+    """Weighted directed interaction graph as a CSR matrix (row = from, col = to)."""
+
+    def __init__(self, index: ActorIndex, adjacency: 'sp.csr_matrix'):
+        self.index = index
+        self.adjacency = adjacency
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str, float]],
+                   index: Optional[ActorIndex] = None) -> 'InteractionGraph':
+        index = index or ActorIndex()
+        rows, cols, weights = [], [], []
+        for author_from, author_to, weight in edges:
+            rows.append(index.intern(author_from))
+            cols.append(index.intern(author_to))
+            weights.append(weight)
+        n = len(index)
+        adjacency = sp.csr_matrix(
+            (np.asarray(weights, dtype=np.float64),
+             (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+            shape=(n, n),
+        )
+        adjacency.sum_duplicates()
+        return cls(index, adjacency)
+
+    @classmethod
+    def from_cursor(cls, cursor, until_id: Optional[int] = None) -> 'InteractionGraph':
+        return cls.from_edges(load_edges(cursor, until_id=until_id))
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, float]]) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Add an edge delta in place, interning new actors.
+
+        Returns:
+            (rows, cols) of edges that did not exist before
+        """
+        old_n = self.num_nodes
+        rows, cols, weights = [], [], []
+        for author_from, author_to, weight in edges:
+            rows.append(self.index.intern(author_from))
+            cols.append(self.index.intern(author_to))
+            weights.append(weight)
+        n = len(self.index)
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+
+        adjacency = self.adjacency
+        if n > old_n:
+            adjacency = adjacency.copy()
+            adjacency.resize((n, n))
+        if len(rows):
+            existed = np.asarray(adjacency[rows, cols]).ravel() != 0
+        else:
+            existed = np.zeros(0, dtype=bool)
+        delta = sp.csr_matrix((np.asarray(weights, dtype=np.float64), (rows, cols)), shape=(n, n))
+        self.adjacency = (adjacency + delta).tocsr()
+
+        # Pairs are unique per delta (GROUP BY), so no double counting
+        return rows[~existed], cols[~existed]
+
+    @property
+    def num_nodes(self) -> int:
+        return self.adjacency.shape[0]
+
+    @property
+    def num_edges(self) -> int:
+        return self.adjacency.nnz
+
+    def binary(self) -> 'sp.csr_matrix':
+        """Unweighted adjacency (edge present = 1)."""
+        structure = self.adjacency.copy()
+        structure.data = np.ones_like(structure.data)
+        return structure
+
+    # -------------------------------------------------------------------------
+    # Degree
+    # -------------------------------------------------------------------------
+
+    def degrees(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """(in_degree, out_degree) as distinct-neighbour counts."""
+        structure = self.binary()
+        in_deg = np.asarray(structure.sum(axis=0)).ravel()
+        out_deg = np.asarray(structure.sum(axis=1)).ravel()
+        return in_deg, out_deg
+
+    # -------------------------------------------------------------------------
+    # PageRank
+    # -------------------------------------------------------------------------
+
+    def pagerank(self, alpha: float = 0.85, max_iter: int = 100, tol: float = 1e-6,
+                 x0: Optional['np.ndarray'] = None) -> Tuple['np.ndarray', int]:
+        """
+        Weighted PageRank by power iteration.
+
+        Args:
+            x0: Starting vector (warm start); uniform if None
+
+        Returns:
+            (pagerank vector summing to 1, iterations used)
+        """
+        n = self.num_nodes
+        if n == 0:
+            return np.zeros(0), 0
+
+        out_weight = np.asarray(self.adjacency.sum(axis=1)).ravel()
+        dangling = out_weight == 0
+        inv_out = np.zeros(n)
+        inv_out[~dangling] = 1.0 / out_weight[~dangling]
+        # Column-stochastic transition: x_next = P^T x
+        transition_t = (sp.diags(inv_out) @ self.adjacency).T.tocsr()
+
+        if x0 is None or len(x0) != n or x0.sum() <= 0:
+            x = np.full(n, 1.0 / n)
+        else:
+            x = x0 / x0.sum()
+
+        teleport = (1.0 - alpha) / n
+        iterations = 0
+        for iterations in range(1, max_iter + 1):
+            x_last = x
+            dangling_mass = x_last[dangling].sum()
+            x = alpha * (transition_t @ x_last + dangling_mass / n) + teleport
+            # networkx convergence criterion
+            if np.abs(x - x_last).sum() < n * tol:
+                break
+        return x / x.sum(), iterations
+
+    # -------------------------------------------------------------------------
+    # Clustering
+    # -------------------------------------------------------------------------
+
+    def clustering(self) -> 'np.ndarray':
+        """Local clustering coefficient on the undirected simple graph."""
+        structure = self.binary()
+        undirected = ((structure + structure.T) > 0).astype(np.float64)
+        undirected.setdiag(0)
+        undirected.eliminate_zeros()
+        undirected = undirected.tocsr()
+
+        deg = np.asarray(undirected.sum(axis=1)).ravel()
+        # Row sums of (U @ U) * U count each triangle at a node twice
+        closed = np.asarray((undirected @ undirected).multiply(undirected).sum(axis=1)).ravel()
+        possible = deg * (deg - 1)
+        coef = np.zeros_like(deg)
+        mask = possible > 0
+        coef[mask] = closed[mask] / possible[mask]
+        return coef
+
+    # -------------------------------------------------------------------------
+    # Betweenness
+    # -------------------------------------------------------------------------
+
+    def betweenness(self, k: Optional[int] = None, seed: int = 42) -> 'np.ndarray':
+        """
+        Unweighted betweenness (Brandes) from k sampled sources (all if None).
+
+        BFS frontiers and dependency back-propagation are sparse mat-vec
+        products over BETWEENNESS_BATCH sources at a time. Values are only
+        meaningful relative to each other (callers normalize by max).
+        """
+        n = self.num_nodes
+        if n == 0:
+            return np.zeros(0)
+        forward = self.binary()          # v <- u lookups: forward.T @ f
+        forward_t = forward.T.tocsr()
+
+        if k is None or k >= n:
+            sources = np.arange(n)
+        else:
+            sources = np.random.default_rng(seed).choice(n, size=k, replace=False)
+
+        centrality = np.zeros(n)
+        for start in range(0, len(sources), BETWEENNESS_BATCH):
+            batch = sources[start:start + BETWEENNESS_BATCH]
+            cols = np.arange(len(batch))
+
+            sigma = np.zeros((n, len(batch)))
+            dist = np.full((n, len(batch)), -1, dtype=np.int32)
+            sigma[batch, cols] = 1.0
+            dist[batch, cols] = 0
+
+            # Forward BFS, one level per mat-mul: path counts to the next level
+            frontier = sigma.copy()
+            depth = 0
+            while True:
+                nxt = forward_t @ frontier
+                nxt[dist >= 0] = 0.0
+                reached = nxt > 0
+                if not reached.any():
+                    break
+                depth += 1
+                dist[reached] = depth
+                sigma += nxt
+                frontier = nxt
+
+            # Backward: delta_v += sigma_v * sum_{w: v->w, d_w = d_v + 1} (1 + delta_w) / sigma_w
+            delta = np.zeros_like(sigma)
+            for level in range(depth, 0, -1):
+                at_level = dist == level
+                coef = np.zeros_like(sigma)
+                coef[at_level] = (1.0 + delta[at_level]) / sigma[at_level]
+                contrib = forward @ coef
+                parents = dist == level - 1
+                delta[parents] += sigma[parents] * contrib[parents]
+
+            delta[batch, cols] = 0.0
+            centrality += delta.sum(axis=1)
+
+        if len(sources) < n:
+            centrality *= n / len(sources)
+        return centrality
+
+
+def _normalize_by_max(values: 'np.ndarray') -> 'np.ndarray':
+    top = values.max() if len(values) else 0
+    return values / top if top > 0 else np.zeros_like(values, dtype=np.float64)
+
+
+def score_nodes(names: List[str], pagerank: 'np.ndarray', betweenness: 'np.ndarray',
+                clustering: 'np.ndarray', in_deg: 'np.ndarray',
+                out_deg: 'np.ndarray') -> Dict[str, Dict[str, float]]:
+    """Normalize components and combine into the v4 network_score dict."""
+    pr_norm = _normalize_by_max(pagerank)
+    bc_norm = _normalize_by_max(betweenness)
+    in_norm = _normalize_by_max(in_deg.astype(np.float64))
+    out_norm = _normalize_by_max(out_deg.astype(np.float64))
+
+    w = NETWORK_SCORE_WEIGHTS
+    network_score = (pr_norm * w['pagerank'] + bc_norm * w['betweenness'] +
+                     clustering * w['clustering_coef'] + in_norm * w['in_degree_norm'] +
+                     out_norm * w['out_degree_norm'])
+
+    results = {}
+    for i, name in enumerate(names):
+        results[name] = {
+            'pagerank': round(float(pr_norm[i]), 4),
+            'betweenness': round(float(bc_norm[i]), 4),
+            'clustering_coef': round(float(clustering[i]), 4),
+            'in_degree_norm': round(float(in_norm[i]), 4),
+            'out_degree_norm': round(float(out_norm[i]), 4),
+            'network_score': round(float(network_score[i]), 4),
+            'in_degree_raw': int(in_deg[i]),
+            'out_degree_raw': int(out_deg[i]),
+        }
+    return results
+
+
+def compute_sparse_centrality(cursor, min_nodes: int = 10) -> Dict[str, Dict[str, float]]:
+    """Sparse replacement for advanced_analysis_v4.compute_graph_centrality."""
+    if not SCIPY_AVAILABLE:
+        print("  [SKIP] scipy not available")
+        return {}
+
+    print("  Building sparse interaction graph...")
+    graph = InteractionGraph.from_cursor(cursor)
+
+    if graph.num_nodes < min_nodes:
+        print(f"  [SKIP] Graph too small: {graph.num_nodes} nodes")
+        return {}
+
+    print(f"  Graph: {graph.num_nodes} nodes, {graph.num_edges} edges")
+
+    t0 = time.time()
+    print("  Computing PageRank...")
+    pagerank, iterations = graph.pagerank()
+    print(f"    converged in {iterations} iterations")
+
+    print("  Computing betweenness centrality...")
+    k = BETWEENNESS_SAMPLE if graph.num_nodes > BETWEENNESS_EXACT_MAX else None
+    betweenness = graph.betweenness(k=k)
+
+    print("  Computing clustering coefficients...")
+    clustering = graph.clustering()
+
+    in_deg, out_deg = graph.degrees()
+    results = score_nodes(graph.index.names, pagerank, betweenness, clustering, in_deg, out_deg)
+
+    print(f"  Computed centrality for {len(results)} accounts in {time.time() - t0:.1f}s")
+    return results
+
+
+# =============================================================================
+# PERSISTED STATE + INCREMENTAL UPDATES
+# =============================================================================
+
+class GraphState:
+    """Graph plus the last computed vectors, persisted between runs."""
+
+    def __init__(self, graph: InteractionGraph, pagerank: 'np.ndarray',
+                 in_deg: 'np.ndarray', out_deg: 'np.ndarray',
+                 betweenness: 'np.ndarray', clustering: 'np.ndarray',
+                 last_interaction_id: int, full_built_at: float = 0.0,
+                 full_nodes: int = 0, full_edges: int = 0):
+        self.graph = graph
+        self.pagerank = pagerank
+        self.in_deg = in_deg
+        self.out_deg = out_deg
+        self.betweenness = betweenness
+        self.clustering = clustering
+        self.last_interaction_id = last_interaction_id
+        # When, and at what size, betweenness/clustering were last computed
+        self.full_built_at = full_built_at
+        self.full_nodes = full_nodes
+        self.full_edges = full_edges
+
+    def scores(self) -> Dict[str, Dict[str, float]]:
+        """score_nodes() over the stored vectors."""
+        return score_nodes(self.graph.index.names, self.pagerank, self.betweenness,
+                           self.clustering, self.in_deg, self.out_deg)
+
+    def full_rebuild_due(self, now: Optional[float] = None) -> Optional[str]:
+        """Why betweenness/clustering should be recomputed, or None."""
+        now = time.time() if now is None else now
+        if now - self.full_built_at > FULL_REBUILD_DAYS * 86400:
+            return f"last full build over {FULL_REBUILD_DAYS} days ago"
+        graph = self.graph
+        if graph.num_nodes > self.full_nodes * (1 + FULL_REBUILD_GROWTH):
+            return f"nodes grew {self.full_nodes} -> {graph.num_nodes}"
+        if graph.num_edges > self.full_edges * (1 + FULL_REBUILD_GROWTH):
+            return f"edges grew {self.full_edges} -> {graph.num_edges}"
+        return None
+
+    def save(self, path: Path = GRAPH_STATE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        adjacency = self.graph.adjacency
+        # Write-then-rename so a crash never leaves a truncated state file
+        tmp_path = path.with_name(path.stem + ".tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            names=np.array(self.graph.index.names, dtype=str),
+            data=adjacency.data, indices=adjacency.indices, indptr=adjacency.indptr,
+            pagerank=self.pagerank, in_deg=self.in_deg, out_deg=self.out_deg,
+            betweenness=self.betweenness, clustering=self.clustering,
+            last_interaction_id=np.array(self.last_interaction_id),
+            full_built_at=np.array(self.full_built_at),
+            full_nodes=np.array(self.full_nodes), full_edges=np.array(self.full_edges),
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = GRAPH_STATE_PATH) -> Optional['GraphState']:
+        if not path.exists():
+            return None
+        with np.load(path) as f:
+            names = [str(name) for name in f['names']]
+            n = len(names)
+            adjacency = sp.csr_matrix((f['data'], f['indices'], f['indptr']), shape=(n, n))
+            return cls(
+                InteractionGraph(ActorIndex(names), adjacency),
+                f['pagerank'], f['in_deg'], f['out_deg'],
+                f['betweenness'], f['clustering'],
+                int(f['last_interaction_id']),
+                # Files written before these were recorded count as overdue
+                float(f['full_built_at']) if 'full_built_at' in f else 0.0,
+                int(f['full_nodes']) if 'full_nodes' in f else 0,
+                int(f['full_edges']) if 'full_edges' in f else 0,
+            )
+
+
+def _pad(values: 'np.ndarray', n: int, fill: float = 0.0) -> 'np.ndarray':
+    if len(values) >= n:
+        return values
+    return np.concatenate([values, np.full(n - len(values), fill, dtype=values.dtype)])
+
+
+def build_graph_state(cursor) -> GraphState:
+    """Full rebuild: every component computed from scratch."""
+    last_id = _max_interaction_id(cursor)
+    graph = InteractionGraph.from_cursor(cursor, until_id=last_id)
+    n = graph.num_nodes
+    pagerank, _ = graph.pagerank()
+    in_deg, out_deg = graph.degrees()
+    k = BETWEENNESS_SAMPLE if n > BETWEENNESS_EXACT_MAX else None
+    return GraphState(graph, pagerank, in_deg, out_deg,
+                      graph.betweenness(k=k), graph.clustering(), last_id,
+                      time.time(), n, graph.num_edges)
+
+
+def update_graph_state(cursor, state: GraphState) -> int:
+    """
+    Apply interactions added since the last run.
+
+    Returns:
+        Number of aggregated new edge pairs applied
+    """
+    last_id = _max_interaction_id(cursor)
+    delta = load_edges(cursor, since_id=state.last_interaction_id, until_id=last_id)
+    graph = state.graph
+    new_rows, new_cols = graph.add_edges(delta)
+    n = graph.num_nodes
+
+    state.in_deg = _pad(state.in_deg, n)
+    state.out_deg = _pad(state.out_deg, n)
+    np.add.at(state.out_deg, new_rows, 1)
+    np.add.at(state.in_deg, new_cols, 1)
+
+    state.betweenness = _pad(state.betweenness, n)
+    state.clustering = _pad(state.clustering, n)
+
+    # Warm start: new nodes begin at uniform mass, existing ones keep theirs
+    x0 = _pad(state.pagerank, n, 1.0 / max(n, 1))
+    state.pagerank, iterations = graph.pagerank(x0=x0)
+    state.last_interaction_id = last_id
+    print(f"  Applied {len(delta)} edge pairs ({len(new_rows)} new), "
+          f"PageRank warm start converged in {iterations} iterations")
+    return len(delta)
+
+
+def write_network_scores(conn, state: GraphState,
+                         tolerance: float = SCORE_TOLERANCE) -> int:
+    """Write actors.network_score only where the stored value is off by more than tolerance."""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(actors)")
+    if 'network_score' not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE actors ADD COLUMN network_score REAL DEFAULT 0")
+
+    scores = state.scores()
+
+    # Compare against the DB, not a cached copy: actors rows created after
+    # the last run (or restored from backup) must still get their score
+    cursor.execute("SELECT username, network_score FROM actors")
+    updates = [
+        (scores[username]['network_score'], username)
+        for username, stored in cursor.fetchall()
+        if username in scores
+        and (stored is None or abs(scores[username]['network_score'] - stored) > tolerance)
+    ]
+
+    cursor.executemany("UPDATE actors SET network_score = ? WHERE username = ?", updates)
+    conn.commit()
+    return len(updates)
+
+
+def refresh_graph_state(cursor, full: bool = False,
+                        state_path: Path = GRAPH_STATE_PATH) -> GraphState:
+    """
+    Bring the persisted state up to date and save it.
+
+    Applies the edge delta to the saved state, then rebuilds from scratch
+    if full is set, there is no saved state, or a full rebuild is due.
+    """
+    state = None if full else GraphState.load(state_path)
+    if state is not None:
+        print(f"  Loaded graph state: {state.graph.num_nodes} nodes, "
+              f"last interaction id {state.last_interaction_id}")
+        update_graph_state(cursor, state)
+        reason = state.full_rebuild_due()
+        if reason:
+            print(f"  Full rebuild due ({reason})")
+            state = None
+    if state is None:
+        print("  Building graph state from scratch...")
+        state = build_graph_state(cursor)
+    state.save(state_path)
+    return state
+
+
+def run_incremental_update(full: bool = False, tolerance: float = SCORE_TOLERANCE,
+                           state_path: Path = GRAPH_STATE_PATH) -> int:
+    """Refresh the graph state and write changed scores."""
+    if not SCIPY_AVAILABLE:
+        print("  [SKIP] scipy not available")
+        return 0
+
+    import sqlite3
+    conn = sqlite3.connect(DB_PATH)
+    state = refresh_graph_state(conn.cursor(), full, state_path)
+    written = write_network_scores(conn, state, tolerance)
+    conn.close()
+
+    print(f"  Updated network_score for {written} of {state.graph.num_nodes} actors")
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+    import sqlite3
+
+    parser = argparse.ArgumentParser(description="Sparse graph centrality")
+    parser.add_argument("--update", action="store_true", help="Incremental update from persisted state")
+    parser.add_argument("--full", action="store_true", help="Rebuild persisted state from scratch")
+    parser.add_argument("--tolerance", type=float, default=SCORE_TOLERANCE,
+                        help="Min network_score change to write")
+    args = parser.parse_args()
+
+    if args.update or args.full:
+        run_incremental_update(full=args.full, tolerance=args.tolerance)
+        sys.exit(0)
+
+    conn = sqlite3.connect(DB_PATH)
+    results = compute_sparse_centrality(conn.cursor())
+    conn.close()
+
+    top = sorted(results.items(), key=lambda kv: kv[1]['network_score'], reverse=True)[:20]
+    print("\nTop 20 by Network Score:")
+    for name, r in top:
+        print(f"  {name[:30]:<30} network={r['network_score']:.3f} pr={r['pagerank']:.3f} "
+              f"bc={r['betweenness']:.3f} cc={r['clustering_coef']:.3f}")
@@ -11,8 +11,12 @@ Zamiast markerów słownych, używamy:
 
 import re
 import sys
+from pathlib import Path
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
+sys.path.insert(0, str(Path(__file__).parent))
+from pattern_bank import PatternBank
+
 # Bardziej specyficzne sygnatury - rzeczy które są UNIKALNE dla modelu
 IMPROVED_SIGNATURES = {
     'claude': {
@@ -108,9 +112,21 @@ IMPROVED_SIGNATURES = {
 }
 
 
+# All phrase lists of all models as one literal matcher: (model, list) -> phrases
+PHRASE_BANK = PatternBank(
+    {(model, key): sig[key]
+     for model, sig in IMPROVED_SIGNATURES.items()
+     for key in ('unique_phrases', 'never_says', 'casual_markers') if key in sig},
+    literal=True
+)
+HEADER_RE = re.compile(r'^##?\s', re.MULTILINE)
+NUMBERED_LIST_RE = re.compile(r'^\d+\.', re.MULTILINE)
+
+
 def detect_model_improved(text: str) -> dict:
     """Detect model using improved signatures."""
-    text_lower = text.lower()
+    phrase_hits = PHRASE_BANK.categories(text)
+    has_headers = HEADER_RE.search(text) is not None
     scores = {}
 
     for model, sig in IMPROVED_SIGNATURES.items():
@@ -118,35 +134,31 @@ def detect_model_improved(text: str) -> dict:
         evidence = []
 
         # Check unique phrases (strong signal)
-        if 'unique_phrases' in sig:
-            for phrase in sig['unique_phrases']:
-                if phrase.lower() in text_lower:
-                    score += 2.0  # Strong weight
-                    evidence.append(f"phrase: '{phrase}'")
+        for phrase in phrase_hits.get((model, 'unique_phrases'), []):
+            score += 2.0  # Strong weight
+            evidence.append(f"phrase: '{phrase}'")
 
         # Check never_says (negative signal)
-        if 'never_says' in sig:
-            for phrase in sig['never_says']:
-                if phrase.lower() in text_lower:
-                    score -= 1.0  # Penalty
-                    evidence.append(f"uses forbidden: '{phrase}'")
+        for phrase in phrase_hits.get((model, 'never_says'), []):
+            score -= 1.0  # Penalty
+            evidence.append(f"uses forbidden: '{phrase}'")
 
         # Check formatting
         if 'formatting' in sig:
             fmt = sig['formatting']
-            if fmt.get('loves_headers') and re.search(r'^##?\s', text, re.MULTILINE):
+            if fmt.get('loves_headers') and has_headers:
                 score += 0.5
                 evidence.append("uses headers")
-            if fmt.get('avoids_headers') and not re.search(r'^##?\s', text, re.MULTILINE):
+            if fmt.get('avoids_headers') and not has_headers:
                 score += 0.3
                 evidence.append("avoids headers")
-            if fmt.get('uses_numbered_lists') and re.search(r'^\d+\.', text, re.MULTILINE):
+            if fmt.get('uses_numbered_lists') and NUMBERED_LIST_RE.search(text):
                 score += 0.3
                 evidence.append("uses numbered lists")
 
         # Casual markers for LLAMA (weak signal)
         if 'casual_markers' in sig:
-            casual_count = sum(1 for m in sig['casual_markers'] if m.lower() in text_lower)
+            casual_count = len(phrase_hits.get((model, 'casual_markers'), []))
             if casual_count >= 2:
                 score += 0.5
                 evidence.append(f"casual markers: {casual_count}")
@@ -429,6 +429,7 @@ def init_db():
         ("idx_posts_created", "posts", "created_at"),
         ("idx_comments_post", "comments", "post_id"),
         ("idx_comments_author", "comments", "author"),
+        ("idx_comments_created", "comments", "created_at"),
         ("idx_actors_centrality", "actors", "network_centrality"),
         ("idx_actors_watch", "actors", "watch_level"),
 
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Pattern Bank - compiled multi-pattern matcher for regex/keyword banks.
+
+Classifiers keep banks of markers (category -> list of regexes or literal
+phrases) and used to test them one re.search at a time on uncompiled
+strings, re-lowercasing the text in every loop. A PatternBank compiles a
+whole bank once and answers the questions those loops asked:
+
+- search(text): does any pattern occur? One combined alternation
+  (?:p0)|(?:p1)|... scanned once.
+- hits(text) / categories(text) / counts(text): which patterns occur.
+  The text is lowercased once; literal phrases are plain substring tests,
+  and each regex is guarded by the literal runs it cannot match without
+  (e.g. "while" and "sleep" for while.*(human|operator).*sleep), so most
+  regexes are rejected by a C-level substring check and never run.
+
+Results are exactly {p : re.search(p, text)} - a combined alternation is
+not used for hit sets because sre only reports one alternative per
+position and loses the per-pattern literal-prefix scan.
+
+Usage:
+    BANK = PatternBank({'defense': DEFENSE_MARKERS, 'concession': CONCESSION_MARKERS})
+    hits = BANK.categories(text)        # {'defense': [pattern, ...], ...}
+    if BANK.search(text): ...           # any pattern at all
+"""
+
+import re
+from typing import (Collection, Dict, Hashable, List, Mapping, NamedTuple,
+                    Optional, Sequence, Tuple, Union)
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+Bank = Union[Mapping[Hashable, Sequence[str]], Sequence[str]]
+
+MIN_GUARD_LENGTH = 3  # shorter literal runs are not selective enough
+MAX_GUARDS = 2
+
+# After str.lower(), the only characters IGNORECASE still equates with an
+# ASCII letter are dotless i and long s
+_IGNORECASE_FOLD = str.maketrans({'ı': 'i', 'ſ': 's'})
+
+
+def required_literals(pattern: str, flags: int = 0) -> List[str]:
+    """
+    Literal runs every match of the pattern must contain.
+
+    Only top-level sequences (and plain groups inside them) are used;
+    anything optional, repeated or alternated ends a run.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return []
+
+    runs, current = [], []
+
+    def walk(items):
+        for op, av in items:
+            if op == sre_parse.LITERAL:
+                current.append(chr(av))
+                continue
+            if op == sre_parse.SUBPATTERN and not av[1] and not av[2]:
+                walk(av[-1].data)
+                continue
+            if current:
+                runs.append(''.join(current))
+                current.clear()
+
+    walk(parsed.data)
+    if current:
+        runs.append(''.join(current))
+
+    ignorecase = (flags | parsed.state.flags) & re.IGNORECASE
+    if ignorecase:
+        runs = [r.lower() for r in runs if r.isascii()]
+    runs = [r for r in runs if len(r) >= MIN_GUARD_LENGTH]
+    return sorted(runs, key=len, reverse=True)[:MAX_GUARDS]
+
+
+class BankEntry(NamedTuple):
+    category: Hashable
+    pattern: str       # as written in the bank (phrase for literal banks)
+    regex: "re.Pattern"
+
+
+class PatternBank:
+    """A bank of patterns compiled once for repeated matching."""
+
+    def __init__(self, bank: Bank, literal: Union[bool, Collection[Hashable]] = False,
+                 lowercase: bool = True, flags: int = 0):
+        """
+        Args:
+            bank: {category: [patterns]} or a flat list (category '')
+            literal: Patterns are plain phrases (substring match), not regexes;
+                     True for every category or a collection of categories
+            lowercase: Lowercase the text once before matching (and literal
+                       phrases at compile time), as the banks were written
+                       against text.lower()
+            flags: Extra re flags for every pattern
+        """
+        if not isinstance(bank, Mapping):
+            bank = {'': bank}
+        self.lowercase = lowercase
+        self.entries: List[BankEntry] = []
+        # Per entry: (substring or None, guard literals, guards use folded text)
+        self._checks: List[Tuple[Optional[str], List[str], bool]] = []
+
+        for category, patterns in bank.items():
+            is_literal = literal if isinstance(literal, bool) else category in literal
+            for pattern in patterns:
+                if is_literal:
+                    phrase = pattern.lower() if lowercase else pattern
+                    regex = re.compile(re.escape(phrase), flags)
+                    if not flags & re.IGNORECASE:
+                        self.entries.append(BankEntry(category, pattern, regex))
+                        self._checks.append((phrase, [], False))
+                        continue
+                else:
+                    regex = re.compile(pattern, flags)
+                ignorecase = bool(regex.flags & re.IGNORECASE)
+                guards = required_literals(regex.pattern, flags)
+                if ignorecase and not lowercase:
+                    guards = []  # guards assume lowercased text
+                self.entries.append(BankEntry(category, pattern, regex))
+                self._checks.append((None, guards, ignorecase))
+
+        self._fold = any(fold and guards for _, guards, fold in self._checks)
+        self._any = re.compile("|".join(f"(?:{e.regex.pattern})" for e in self.entries) or "(?!)",
+                               flags)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def prepare(self, text: str) -> str:
+        """The text as the bank sees it (lowercased if configured)."""
+        return text.lower() if self.lowercase else text
+
+    def search(self, text: Optional[str], prepared: bool = False) -> bool:
+        """True if any pattern in the bank occurs in the text."""
+        if not text:
+            return False
+        return self._any.search(text if prepared else self.prepare(text)) is not None
+
+    def _iter_hits(self, s: str):
+        folded = s.translate(_IGNORECASE_FOLD) if self._fold else s
+        entries = self.entries
+        for i, (phrase, guards, fold) in enumerate(self._checks):
+            if phrase is not None:
+                if phrase in s:
+                    yield i
+                continue
+            haystack = folded if fold else s
+            if all(g in haystack for g in guards) and entries[i].regex.search(s):
+                yield i
+
+    def hits(self, text: Optional[str], prepared: bool = False) -> List[int]:
+        """Indices (bank order) of every pattern that occurs in the text."""
+        if not text:
+            return []
+        return list(self._iter_hits(text if prepared else self.prepare(text)))
+
+    def categories(self, text: Optional[str], prepared: bool = False) -> Dict[Hashable, List[str]]:
+        """{category: [matched patterns in bank order]} for categories with hits."""
+        result: Dict[Hashable, List[str]] = {}
+        for i in self.hits(text, prepared):
+            entry = self.entries[i]
+            result.setdefault(entry.category, []).append(entry.pattern)
+        return result
+
+    def counts(self, text: Optional[str], prepared: bool = False) -> Dict[Hashable, int]:
+        """{category: number of bank patterns matched}."""
+        result: Dict[Hashable, int] = {}
+        for i in self.hits(text, prepared):
+            category = self.entries[i].category
+            result[category] = result.get(category, 0) + 1
+        return result
+
+    def first_category(self, text: Optional[str], prepared: bool = False) -> Optional[Hashable]:
+        """Category of the first bank pattern (in bank order) that matches."""
+        if not text:
+            return None
+        for i in self._iter_hits(text if prepared else self.prepare(text)):
+            return self.entries[i].category
+        return None
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+POS Tagging - batched, cached part-of-speech tags for fingerprinting.
+
+extract_pos_features used to run nltk.word_tokenize + nltk.pos_tag on every
+call. Here the tagger is loaded once per process, texts are tagged in
+batches (tag_sents), and each text's tag sequence is kept in an LRU cache
+keyed by a hash of its content. Within a process, style-anomaly windows
+and repeated passes over the same posts/comments then never re-tag a
+text; the cache is in memory, so a new run starts empty.
+
+Backends (OBSERVATORY_POS_TAGGER env var or set_pos_backend()):
+    perceptron  word_tokenize + averaged perceptron loaded once (default)
+    fast        regex tokenizer + averaged perceptron; skips Punkt sentence
+                splitting, tags differ slightly at contractions/punctuation
+    nltk        per-text nltk.pos_tag(word_tokenize(...)), the old path
+"""
+
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from nltk import pos_tag, word_tokenize
+    from nltk.tag.perceptron import PerceptronTagger
+    NLTK_AVAILABLE = True
+except ImportError:
+    NLTK_AVAILABLE = False
+
+POS_BACKENDS = ('perceptron', 'fast', 'nltk')
+DEFAULT_POS_BACKEND = 'perceptron'
+POS_CACHE_SIZE = 100000   # cached tag sequences per process
+POS_BATCH_SIZE = 256      # texts per tag_sents call
+
+# Treebank-like split: "don't" -> "do", "n't"; "it's" -> "it", "'s"
+_FAST_TOKEN_RE = re.compile(r"\w+(?=n't\b)|n't\b|'\w+|\w+|[^\w\s]")
+
+
+def fast_tokenize(text: str) -> List[str]:
+    """Regex tokenizer used by the 'fast' backend."""
+    return _FAST_TOKEN_RE.findall(text)
+
+
+def _content_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8', 'replace'), digest_size=16).digest()
+
+
+class PosTagger:
+    """One tagger backend with an LRU cache of tag sequences."""
+
+    def __init__(self, backend: str = DEFAULT_POS_BACKEND, cache_size: int = POS_CACHE_SIZE):
+        if backend not in POS_BACKENDS:
+            raise ValueError(f"Unknown POS backend '{backend}' (choose from {', '.join(POS_BACKENDS)})")
+        self.backend = backend
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+        self._model = None
+        self.hits = 0
+        self.misses = 0
+
+    def _tagger(self):
+        if self._model is None:
+            self._model = PerceptronTagger()
+        return self._model
+
+    def _tag_uncached(self, texts: Sequence[str]) -> List[Tuple[str, ...]]:
+        if self.backend == 'nltk':
+            return [tuple(tag for _, tag in pos_tag(word_tokenize(t))) for t in texts]
+
+        tokenize = fast_tokenize if self.backend == 'fast' else word_tokenize
+        token_lists = [tokenize(t) for t in texts]
+        tagger = self._tagger()
+        tagged = []
+        for i in range(0, len(token_lists), POS_BATCH_SIZE):
+            tagged.extend(tagger.tag_sents(token_lists[i:i + POS_BATCH_SIZE]))
+        return [tuple(tag for _, tag in sent) for sent in tagged]
+
+    def tag_texts(self, texts: Sequence[str]) -> List[Tuple[str, ...]]:
+        """Tag sequences for each text; only uncached texts hit the tagger."""
+        keys = [_content_key(t) for t in texts]
+        results: List[Optional[Tuple[str, ...]]] = [None] * len(texts)
+        missing: Dict[bytes, List[int]] = {}
+
+        for i, key in enumerate(keys):
+            tags = self._cache.get(key)
+            if tags is not None:
+                self._cache.move_to_end(key)
+                results[i] = tags
+                self.hits += 1
+            else:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            self.misses += len(missing)
+            order = list(missing)
+            for key, tags in zip(order, self._tag_uncached([texts[missing[k][0]] for k in order])):
+                for i in missing[key]:
+                    results[i] = tags
+                self._cache[key] = tags
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return results
+
+    def tag(self, text: str) -> Tuple[str, ...]:
+        return self.tag_texts([text])[0]
+
+
+_taggers: Dict[str, PosTagger] = {}
+
+
+def get_pos_backend() -> str:
+    return os.environ.get('OBSERVATORY_POS_TAGGER', DEFAULT_POS_BACKEND)
+
+
+def set_pos_backend(backend: str):
+    """Select the backend for this process and any worker processes it starts."""
+    if backend not in POS_BACKENDS:
+        raise ValueError(f"Unknown POS backend '{backend}' (choose from {', '.join(POS_BACKENDS)})")
+    os.environ['OBSERVATORY_POS_TAGGER'] = backend
+
+
+def get_pos_tagger(backend: Optional[str] = None) -> PosTagger:
+    """Process-wide tagger for a backend (default: the selected one)."""
+    backend = backend or get_pos_backend()
+    tagger = _taggers.get(backend)
+    if tagger is None:
+        tagger = _taggers[backend] = PosTagger(backend)
+    return tagger
+
+
+def warm_pos_tagger():
+    """Load the tagger model up front (ProcessPoolExecutor initializer)."""
+    tagger = get_pos_tagger()
+    if NLTK_AVAILABLE and tagger.backend != 'nltk':
+        try:
+            tagger._tagger()
+        except Exception:
+            pass  # model data missing; extract_pos_features degrades to {}
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Response Cache - ETags and serialized JSON bodies for api_server.
+
+Every cacheable response is identified by its route and query args
+(the cache key) plus the version of the data behind it (data_version,
+or the discoveries file). The ETag is a hash of the two, so
+
+    If-None-Match = current tag   -> 304, the view never runs
+    key seen at this version      -> body straight from the LRU
+    otherwise                     -> the view runs, its body is kept
+
+and an ingest bump changes every tag at once. Tags are the same in all
+worker processes, so a client or CDN can revalidate against any of them.
+
+Usage:
+    cache = ResponseCache(max_entries=RESPONSE_CACHE_SIZE)
+    key = cache_key(request.path, request.args.items(multi=True))
+    etag = make_etag(key, version)
+    cached = cache.get(key, version)      # CachedBody or None
+    cache.put(key, version, body, mimetype)
+"""
+
+import time
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Callable, Iterable, Optional, Tuple
+
+RESPONSE_CACHE_SIZE = 1024          # bodies kept per process
+MAX_CACHED_BODY = 1024 * 1024       # larger bodies are served but not kept
+VERSION_TTL = 1.0                   # seconds between data-version reads
+DEFAULT_MAX_AGE = 60                # Cache-Control max-age for clients / CDNs
+
+CachedBody = namedtuple('CachedBody', ['version', 'body', 'mimetype'])
+
+
+def cache_key(path: str, args: Iterable[Tuple[str, str]]) -> str:
+    """Route plus query args, independent of their order in the URL."""
+    query = "&".join(f"{name}={value}" for name, value in sorted(args))
+    return f"{path}?{query}" if query else path
+
+
+def make_etag(key: str, version) -> str:
+    """Tag for key at version (unquoted; a hash, so stable across processes)."""
+    return hashlib.sha1(f"{version!r}\0{key}".encode('utf-8')).hexdigest()[:24]
+
+
+class ResponseCache:
+    """Thread-safe LRU of serialized bodies, each valid for one data version."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version:
+                del self._entries[key]  # data changed since it was rendered
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, version, body: bytes, mimetype: str):
+        if len(body) > MAX_CACHED_BODY:
+            return
+        with self._lock:
+            self._entries[key] = CachedBody(version, body, mimetype)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CurrentVersion:
+    """
+    A version read at most every `ttl` seconds.
+
+    on_change(old, new) runs when a read returns a different version -
+    api_server uses it to drop in-memory values derived from older data.
+    """
+
+    def __init__(self, read: Callable[[], object], ttl: float = VERSION_TTL,
+                 on_change: Optional[Callable[[object, object], None]] = None):
+        self.read = read
+        self.ttl = ttl
+        self.on_change = on_change
+        self._value = None
+        self._read_at = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        if self._read_at is not None and now - self._read_at < self.ttl:
+            return self._value
+        with self._lock:
+            if self._read_at is not None and time.monotonic() - self._read_at < self.ttl:
+                return self._value  # another thread just read it
+            value = self.read()
+            if self._read_at is not None and value != self._value and self.on_change:
+                self.on_change(self._value, value)
+            self._value = value
+            self._read_at = time.monotonic()
+            return value
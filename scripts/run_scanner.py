@@ -18,6 +18,8 @@ sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 
 from moltbook_api import MoltbookAPI, get_api
 from config import DB_PATH, setup_logging
+from text_index import TextIndexer
+from data_version import bump_data_version
 
 logger = setup_logging("scanner")
 
@@ -129,6 +131,7 @@ def save_posts_to_db(posts: List[dict], conn: sqlite3.Connection) -> Tuple[int,
     cursor = conn.cursor()
     saved = 0
     skipped = 0
+    indexed_docs = []
 
     for post in posts:
         # Validate post before saving
@@ -188,10 +191,23 @@ def save_posts_to_db(posts: List[dict], conn: sqlite3.Connection) -> Tuple[int,
                 datetime.now().isoformat()
             ))
             saved += 1
+            title = sanitized.get("title")
+            indexed_docs.append((sanitized.get("id"), author_name, sanitized.get("created_at"),
+                                 f"{title} {sanitized.get('content') or ''}" if title else None))
         except sqlite3.Error as e:
             logger.error(f"Database error saving post {sanitized.get('id')}: {e}")
             skipped += 1
 
+    # Keep the text index current for concept analyses
+    try:
+        TextIndexer(cursor).index(cursor, 'post', indexed_docs)
+    except sqlite3.Error as e:
+        logger.error(f"Text index update failed: {e}")
+
+    # New posts: API ETags change with the data version
+    if saved:
+        bump_data_version(cursor)
+
     conn.commit()
     return saved, skipped
 
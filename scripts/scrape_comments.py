@@ -16,6 +16,7 @@ from pathlib import Path
 
 import logging
 from config import DB_PATH
+from data_version import bump_data_version
 
 API_BASE = "https://www.moltbook.com/api/v1"
 RATE_LIMIT = 3
@@ -26,6 +27,29 @@ logger = logging.getLogger("scrape_comments")
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
+# Callbacks fed every batch of newly saved comments: fn(cursor, comments)
+COMMENT_SUBSCRIBERS = []
+
+
+def subscribe_comments(callback):
+    """Register a callback for newly saved comments (write-path hook)."""
+    COMMENT_SUBSCRIBERS.append(callback)
+
+
+def unsubscribe_comments(callback):
+    """Remove a callback registered with subscribe_comments (no-op if absent)."""
+    if callback in COMMENT_SUBSCRIBERS:
+        COMMENT_SUBSCRIBERS.remove(callback)
+
+
+def notify_comment_subscribers(cursor, comments):
+    """Hand saved comments to subscribers; a failing subscriber never blocks ingest."""
+    for callback in COMMENT_SUBSCRIBERS:
+        try:
+            callback(cursor, comments)
+        except Exception as e:
+            logger.error(f"Comment subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
 
 def sanitize(text):
     """Sanitize content."""
@@ -161,6 +185,7 @@ def flatten_comments(comments, post_id, parent_id=None, depth=0):
 def save_comments(cursor, comments, post_author):
     """Save comments and extract interactions."""
     saved = 0
+    saved_comments = []
     interactions = []
 
     # Build parent->author map for reply tracking
@@ -194,6 +219,7 @@ def save_comments(cursor, comments, post_author):
                 datetime.now().isoformat()
             ))
             saved += 1
+            saved_comments.append(c)
 
             # Create interaction record
             if reply_to and reply_to != c['author']:  # Don't track self-replies
@@ -224,6 +250,8 @@ def save_comments(cursor, comments, post_author):
         except Exception as e:
             logger.error(f"Saving comment {c['id']}: {e}")
 
+    notify_comment_subscribers(cursor, saved_comments)
+
     return saved, interactions
 
 
@@ -249,7 +277,7 @@ def save_interactions(cursor, interactions):
     return saved
 
 
-def scrape_all_comments(limit=None):
+def scrape_all_comments(limit=None, stream_bursts=True):
     """Scrape comments for all posts in DB."""
     logger.info("=" * 50)
     logger.info("COMMENT SCRAPER - Extracting Culture")
@@ -263,76 +291,102 @@ def scrape_all_comments(limit=None):
         logger.error(f"Database connection failed: {e}")
         return
 
-    # Get posts: prioritize recent posts, then high-engagement
-    # This ensures new posts get their comments scraped first
-    query = """
-        SELECT id, title, author, comment_count
-        FROM posts
-        ORDER BY
-            CASE WHEN created_at > datetime('now', '-2 days') THEN 0 ELSE 1 END,
-            created_at DESC,
-            comment_count DESC
-    """
-    if limit:
-        query += f" LIMIT {limit}"
-
-    cursor.execute(query)
-    posts = cursor.fetchall()
-
-    logger.info(f"Processing {len(posts)} posts")
-
-    total_comments = 0
-    total_interactions = 0
-    injection_count = 0
-    errors = 0
-
-    for i, post in enumerate(posts, 1):
-        post_id = post['id']
-        title = (post['title'] or 'Unknown')[:40]
-        expected = post['comment_count'] or 0
-
-        logger.info(f"[{i}/{len(posts)}] {title}... (expected: {expected})")
-
-        # Rate limit
-        time.sleep(RATE_LIMIT)
-
-        # Fetch
-        post_data, comments, raw_data = fetch_post_comments(post_id)
-        if not comments:
-            logger.debug(f"Post {post_id}: No comments returned")
-            continue
-
-        # Flatten
-        flat_comments = flatten_comments(comments, post_id)
-        logger.debug(f"Post {post_id}: Fetched {len(flat_comments)} comments")
-
-        # Save
-        try:
-            saved, interactions = save_comments(cursor, flat_comments, post['author'])
-            total_comments += saved
-
-            # Save interactions
-            int_saved = save_interactions(cursor, interactions)
-            total_interactions += int_saved
+    # Subscribers of this run only; removed again when it ends
+    subscribers = []
 
-            # Count injections
-            injections = sum(1 for c in flat_comments if detect_prompt_injection(c['content']))
-            if injections:
-                logger.warning(f"Post {post_id}: {injections} prompt injections detected")
-                injection_count += injections
+    # Real-time coordinated burst detection on the write path
+    burst_detector = None
+    if stream_bursts:
+        from stream_bursts import StreamingBurstDetector
+        burst_detector = StreamingBurstDetector(cursor)
+        subscribers.append(burst_detector.on_comments)
 
-            logger.debug(f"Post {post_id}: Saved {saved} comments, {int_saved} interactions")
+    # Keep the text index current for concept analyses
+    from text_index import TextIndexer
+    subscribers.append(TextIndexer(cursor).on_comments)
 
-        except Exception as e:
-            logger.error(f"Post {post_id}: Save failed - {e}")
-            errors += 1
-
-        # Commit periodically
-        if i % 5 == 0:
-            conn.commit()
+    for callback in subscribers:
+        subscribe_comments(callback)
+    try:
+        # Get posts: prioritize recent posts, then high-engagement
+        # This ensures new posts get their comments scraped first
+        query = """
+            SELECT id, title, author, comment_count
+            FROM posts
+            ORDER BY
+                CASE WHEN created_at > datetime('now', '-2 days') THEN 0 ELSE 1 END,
+                created_at DESC,
+                comment_count DESC
+        """
+        if limit:
+            query += f" LIMIT {limit}"
+
+        cursor.execute(query)
+        posts = cursor.fetchall()
+
+        logger.info(f"Processing {len(posts)} posts")
+
+        total_comments = 0
+        total_interactions = 0
+        injection_count = 0
+        errors = 0
+        published = 0  # total_comments when the data version was last bumped
+
+        for i, post in enumerate(posts, 1):
+            post_id = post['id']
+            title = (post['title'] or 'Unknown')[:40]
+            expected = post['comment_count'] or 0
+
+            logger.info(f"[{i}/{len(posts)}] {title}... (expected: {expected})")
+
+            # Rate limit
+            time.sleep(RATE_LIMIT)
+
+            # Fetch
+            post_data, comments, raw_data = fetch_post_comments(post_id)
+            if not comments:
+                logger.debug(f"Post {post_id}: No comments returned")
+                continue
 
-    conn.commit()
-    conn.close()
+            # Flatten
+            flat_comments = flatten_comments(comments, post_id)
+            logger.debug(f"Post {post_id}: Fetched {len(flat_comments)} comments")
+
+            # Save
+            try:
+                saved, interactions = save_comments(cursor, flat_comments, post['author'])
+                total_comments += saved
+
+                # Save interactions
+                int_saved = save_interactions(cursor, interactions)
+                total_interactions += int_saved
+
+                # Count injections
+                injections = sum(1 for c in flat_comments if detect_prompt_injection(c['content']))
+                if injections:
+                    logger.warning(f"Post {post_id}: {injections} prompt injections detected")
+                    injection_count += injections
+
+                logger.debug(f"Post {post_id}: Saved {saved} comments, {int_saved} interactions")
+
+            except Exception as e:
+                logger.error(f"Post {post_id}: Save failed - {e}")
+                errors += 1
+
+            # Commit periodically (new comments: API ETags change with the data version)
+            if i % 5 == 0:
+                if total_comments > published:
+                    bump_data_version(cursor)
+                    published = total_comments
+                conn.commit()
+
+        if total_comments > published:
+            bump_data_version(cursor)
+        conn.commit()
+        conn.close()
+    finally:
+        for callback in subscribers:
+            unsubscribe_comments(callback)
 
     logger.info("=" * 50)
     logger.info("SCRAPING COMPLETE")
@@ -340,6 +394,8 @@ def scrape_all_comments(limit=None):
     logger.info(f"Total comments: {total_comments}")
     logger.info(f"Total interactions: {total_interactions}")
     logger.info(f"Prompt injections: {injection_count}")
+    if burst_detector:
+        logger.info(f"Burst events logged: {burst_detector.events_logged}")
     if errors:
         logger.warning(f"Errors encountered: {errors}")
     logger.info("Next: python analyze_interactions.py")
@@ -349,6 +405,8 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, help="Limit number of posts to process")
+    parser.add_argument("--no-stream-bursts", action="store_true",
+                        help="Disable real-time burst detection during ingest")
     args = parser.parse_args()
 
-    scrape_all_comments(limit=args.limit)
+    scrape_all_comments(limit=args.limit, stream_bursts=not args.no_stream_bursts)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Production server for the Noosphere Observatory API.
+
+api_server.py --port runs Flask's single-process development server.
+This entry point runs the same app with several worker processes:
+
+- gunicorn (gthread workers) when it is installed;
+- otherwise a built-in pre-fork server: the master binds the socket and
+  forks workers, each serving it with a threaded wsgiref server (POSIX;
+  on Windows a single threaded process).
+
+Every worker borrows read-only connections from its own pool (db_pool)
+and records request metrics; GET /metrics reports them for all workers.
+
+Graceful reload: send SIGHUP to the master. New workers (with freshly
+imported code) start serving, old ones stop accepting and exit after
+their in-flight requests. SIGTERM / Ctrl+C stops the server the same
+way.
+
+Usage:
+    python serve_api.py                          # 0.0.0.0:8000, one worker per CPU
+    python serve_api.py --workers 4 --port 8080
+    python serve_api.py --builtin                # Force the built-in server
+    kill -HUP $(cat api.pid)                     # Graceful reload (--pidfile api.pid)
+"""
+
+import os
+import sys
+import time
+import shutil
+import signal
+import socket
+import logging
+import argparse
+import tempfile
+import threading
+import importlib.util
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    GUNICORN_AVAILABLE = False
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(process)d] %(levelname)s %(message)s')
+logger = logging.getLogger("serve_api")
+
+GRACEFUL_TIMEOUT = 30  # seconds old workers get to finish in-flight requests
+
+
+def load_app():
+    """Import the Flask app (in the worker, so a reload picks up new code)."""
+    from api_server import app
+    return app
+
+
+# =============================================================================
+# gunicorn
+# =============================================================================
+
+if GUNICORN_AVAILABLE:
+    class _GunicornServer(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return load_app()
+
+
+def serve_gunicorn(host, port, workers, threads, pidfile=None):
+    options = {
+        'bind': f"{host}:{port}",
+        'workers': workers,
+        'worker_class': 'gthread',
+        'threads': threads,
+        'graceful_timeout': GRACEFUL_TIMEOUT,
+        'timeout': 60,
+        'max_requests': 10000,          # recycle workers now and then
+        'max_requests_jitter': 1000,
+        'preload_app': False,           # HUP re-imports the app in new workers
+        'accesslog': '-',
+    }
+    if pidfile:
+        options['pidfile'] = pidfile
+    _GunicornServer(options).run()
+
+
+# =============================================================================
+# Built-in pre-fork server
+# =============================================================================
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = False      # server_close() waits for in-flight requests
+    block_on_close = True
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def _wsgi_server(sock: socket.socket, app) -> _ThreadingWSGIServer:
+    """A threaded WSGI server on an already bound, listening socket."""
+    server = _ThreadingWSGIServer(sock.getsockname()[:2], _QuietHandler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = sock
+    host, port = sock.getsockname()[:2]
+    server.server_name = socket.getfqdn(host)
+    server.server_port = port
+    server.setup_environ()
+    server.set_app(app)
+    return server
+
+
+def _run_worker(sock: socket.socket, app_loader) -> int:
+    """Worker process body: serve until SIGTERM, then drain and exit."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)  # until the server is up
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # the master handles Ctrl+C
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    app = app_loader()
+    server = _wsgi_server(sock, app)
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns - not from its own thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+
+    logger.info("worker started")
+    server.serve_forever(poll_interval=0.5)
+    server.server_close()   # waits for in-flight requests
+    metrics = getattr(app, 'request_metrics', None)
+    if metrics is not None:
+        metrics.flush()
+    logger.info("worker stopped")
+    return 0
+
+
+class PreforkServer:
+    """Master process: keeps `workers` children serving one socket."""
+
+    def __init__(self, host, port, workers, app_loader=load_app, pidfile=None):
+        self.sock = socket.create_server((host, port), backlog=1024)
+        self.sock.set_inheritable(True)
+        self.workers = workers
+        self.app_loader = app_loader
+        self.pidfile = pidfile
+        self.children = {}          # pid -> generation
+        self.generation = 0
+        self._reload = False
+        self._stop = False
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = _run_worker(self.sock, self.app_loader)
+            except Exception:
+                logger.exception("worker crashed")
+            finally:
+                os._exit(code)
+        self.children[pid] = self.generation
+
+    def _spawn_generation(self):
+        self.generation += 1
+        for _ in range(self.workers):
+            self._spawn()
+
+    def _stop_workers(self, generation=None):
+        for pid, gen in list(self.children.items()):
+            if generation is None or gen < generation:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+    def _reap(self):
+        while self.children:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            gen = self.children.pop(pid, None)
+            # A current worker that died unexpectedly is replaced
+            if gen == self.generation and not self._stop:
+                logger.warning(f"worker {pid} exited; restarting")
+                self._spawn()
+
+    def serve(self):
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, '_reload', True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, '_stop', True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, '_stop', True))
+        if self.pidfile:
+            Path(self.pidfile).write_text(str(os.getpid()))
+
+        self._spawn_generation()
+        try:
+            while not self._stop:
+                if self._reload:
+                    self._reload = False
+                    logger.info("reloading: starting new workers, draining old ones")
+                    self._spawn_generation()
+                    self._stop_workers(self.generation)
+                self._reap()
+                time.sleep(0.2)
+
+            logger.info("stopping: draining workers")
+            self._stop_workers()
+            deadline = time.monotonic() + GRACEFUL_TIMEOUT
+            while self.children and time.monotonic() < deadline:
+                self._reap()
+                time.sleep(0.1)
+            for pid in list(self.children):
+                os.kill(pid, signal.SIGKILL)
+            self._reap()
+        finally:
+            self.sock.close()
+            if self.pidfile:
+                Path(self.pidfile).unlink(missing_ok=True)
+
+
+def serve_builtin(host, port, workers, pidfile=None, app_loader=load_app):
+    if not hasattr(os, 'fork'):
+        # No fork (Windows): one process, one thread per request
+        logger.info("fork() not available; serving from a single process")
+        sock = socket.create_server((host, port), backlog=1024)
+        server = _wsgi_server(sock, app_loader())
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+    PreforkServer(host, port, workers, app_loader, pidfile).serve()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Noosphere Observatory API (production server)")
+    parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
+    parser.add_argument("--port", "-p", type=int, default=8000, help="Port to run on")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per gunicorn worker")
+    parser.add_argument("--pidfile", help="Write the master PID here (for kill -HUP)")
+    parser.add_argument("--builtin", action="store_true", help="Use the built-in server even if gunicorn is installed")
+    args = parser.parse_args()
+
+    if importlib.util.find_spec("flask") is None:
+        print("ERROR: Flask is not installed.")
+        print("Install with: pip install flask flask-cors gunicorn")
+        return
+
+    # Shared by all workers so /metrics covers the whole server
+    metrics_dir = tempfile.mkdtemp(prefix="noosphere-api-metrics-")
+    os.environ["API_METRICS_DIR"] = metrics_dir
+
+    server = "gunicorn" if GUNICORN_AVAILABLE and not args.builtin else "built-in"
+    logger.info(f"Serving on http://{args.host}:{args.port} with {args.workers} workers ({server})")
+    try:
+        if server == "gunicorn":
+            serve_gunicorn(args.host, args.port, args.workers, args.threads, args.pidfile)
+        else:
+            serve_builtin(args.host, args.port, args.workers, args.pidfile)
+    finally:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
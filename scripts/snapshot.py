@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Snapshot - columnar Parquet copy of posts, comments and interactions.
+
+Analyses read the same three tables through the sqlite3 row API, one
+Python tuple per row. The snapshot keeps them as Parquet files partitioned
+by day (<table>/day=YYYY-MM-DD/part.parquet) with dictionary-encoded
+author columns and timestamps as epoch milliseconds, so a loader can
+memory-map just the columns it needs as Arrow tables or NumPy arrays.
+
+Refreshes are incremental: each table keeps a manifest of per-day
+watermarks (row count plus the newest scraped_at/updated_at/id) and only
+days whose watermark changed are re-exported. Rows without a parseable
+timestamp go to day=unknown.
+
+Usage:
+    refresh_snapshot(conn)                          # export changed days
+    posts = load_table("posts", ["author", "created_ms", "votes_net"])
+    cols = load_columns("interactions", ["author_from", "author_to", "weight"])
+    cols["author_from"].codes, cols["author_from"].categories
+
+    python snapshot.py                              # Refresh changed days
+    python snapshot.py --rebuild                    # Re-export every day
+    python snapshot.py --status                     # Partitions per table
+"""
+
+import sys
+import os
+import json
+import shutil
+import sqlite3
+import argparse
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import DATA_DIR, DB_PATH
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+SNAPSHOT_DIR = DATA_DIR / "snapshot"
+SNAPSHOT_VERSION = 1          # bump when a table's columns change
+UNKNOWN_DAY = "unknown"
+FETCH_BATCH = 5000
+
+# ISO / SQLite timestamp -> epoch milliseconds (NULL if unparseable)
+_EPOCH_MS = "CAST(ROUND((julianday({col}) - 2440587.5) * 86400000) AS INTEGER)"
+
+
+class SnapshotTable(NamedTuple):
+    """Export spec: columns are (name, SQL expression, kind)."""
+    name: str
+    timestamp: str            # column that decides the partition day
+    watermark: str            # SQL aggregate that changes when a day's rows change
+    columns: Tuple[Tuple[str, str, str], ...]
+
+
+# kind: 'dict' (dictionary-encoded string), 'str', 'int', 'float', 'ms' (epoch ms)
+SNAPSHOT_TABLES = {
+    "posts": SnapshotTable(
+        "posts", "created_at", "MAX(COALESCE(updated_at, scraped_at))",
+        (("id", "id", "str"),
+         ("author", "author", "dict"),
+         ("author_id", "author_id", "str"),
+         ("submolt", "submolt", "dict"),
+         ("title", "title", "str"),
+         ("content", "content", "str"),
+         ("upvotes", "upvotes", "int"),
+         ("downvotes", "downvotes", "int"),
+         ("votes_net", "votes_net", "int"),
+         ("comment_count", "comment_count", "int"),
+         ("is_prompt_injection", "is_prompt_injection", "int"),
+         ("created_ms", _EPOCH_MS.format(col="created_at"), "ms"))),
+    "comments": SnapshotTable(
+        "comments", "created_at", "MAX(scraped_at)",
+        (("id", "id", "str"),
+         ("post_id", "post_id", "str"),
+         ("parent_id", "parent_id", "str"),
+         ("author", "author", "dict"),
+         ("content", "content", "str"),
+         ("upvotes", "upvotes", "int"),
+         ("downvotes", "downvotes", "int"),
+         ("created_ms", _EPOCH_MS.format(col="created_at"), "ms"))),
+    "interactions": SnapshotTable(
+        "interactions", "timestamp", "MAX(id)",
+        (("id", "id", "int"),
+         ("author_from", "author_from", "dict"),
+         ("author_to", "author_to", "dict"),
+         ("interaction_type", "interaction_type", "dict"),
+         ("post_id", "post_id", "str"),
+         ("comment_id", "comment_id", "str"),
+         ("weight", "weight", "float"),
+         ("sentiment", "sentiment", "float"),
+         ("timestamp_ms", _EPOCH_MS.format(col="timestamp"), "ms"))),
+}
+
+
+def _arrow_type(kind: str):
+    return {
+        'dict': pa.string(),      # dictionary encoding is applied by the writer
+        'str': pa.string(),
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'ms': pa.timestamp('ms', tz='UTC'),
+    }[kind]
+
+
+def table_schema(spec: SnapshotTable):
+    return pa.schema([(name, _arrow_type(kind)) for name, _, kind in spec.columns])
+
+
+def dictionary_columns(spec: SnapshotTable) -> List[str]:
+    return [name for name, _, kind in spec.columns if kind == 'dict']
+
+
+def _day_expr(spec: SnapshotTable) -> str:
+    return f"COALESCE(DATE({spec.timestamp}), '{UNKNOWN_DAY}')"
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def _table_dir(name: str, snapshot_dir: Optional[Path] = None) -> Path:
+    return Path(snapshot_dir or SNAPSHOT_DIR) / name
+
+
+def _part_path(name: str, day: str, snapshot_dir: Optional[Path] = None) -> Path:
+    return _table_dir(name, snapshot_dir) / f"day={day}" / "part.parquet"
+
+
+def load_manifest(name: str, snapshot_dir: Optional[Path] = None) -> Dict[str, List]:
+    """{day: [row_count, watermark]} as of the last export (empty if stale/missing)."""
+    path = _table_dir(name, snapshot_dir) / "_manifest.json"
+    try:
+        manifest = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != SNAPSHOT_VERSION:
+        return {}
+    return manifest.get('days', {})
+
+
+def _save_manifest(name: str, days: Dict[str, List], snapshot_dir: Optional[Path] = None):
+    path = _table_dir(name, snapshot_dir) / "_manifest.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({'version': SNAPSHOT_VERSION, 'days': days}, indent=1),
+                   encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def day_watermarks(cursor, spec: SnapshotTable) -> Dict[str, List]:
+    """Current {day: [row_count, watermark]} of a table in SQLite."""
+    cursor.execute(f"""
+        SELECT {_day_expr(spec)} AS day, COUNT(*), {spec.watermark}
+        FROM {spec.name}
+        GROUP BY day
+    """)
+    return {day: [count, watermark] for day, count, watermark in cursor.fetchall()}
+
+
+def _stream_days(cursor, spec: SnapshotTable, days: Sequence[str]) -> Iterable[Tuple[str, List[tuple]]]:
+    """(day, rows) for the requested days in one ordered pass."""
+    select = ", ".join(expr for _, expr, _ in spec.columns)
+    cursor.execute(f"""
+        SELECT {_day_expr(spec)} AS day, {select}
+        FROM {spec.name}
+        WHERE {_day_expr(spec)} IN (SELECT value FROM json_each(?))
+        ORDER BY day
+    """, (json.dumps(list(days)),))
+
+    def rows():
+        while True:
+            batch = cursor.fetchmany(FETCH_BATCH)
+            if not batch:
+                return
+            yield from batch
+
+    for day, group in groupby(rows(), key=lambda row: row[0]):
+        yield day, [row[1:] for row in group]
+
+
+def _write_day(spec: SnapshotTable, day: str, rows: List[tuple],
+               snapshot_dir: Optional[Path] = None):
+    """Write one partition atomically (temp file + rename)."""
+    schema = table_schema(spec)
+    columns = list(zip(*rows)) if rows else [()] * len(spec.columns)
+    arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    path = _part_path(spec.name, day, snapshot_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    pq.write_table(table, tmp, use_dictionary=dictionary_columns(spec), compression='zstd')
+    os.replace(tmp, path)
+
+
+def refresh_table(conn: sqlite3.Connection, name: str, rebuild: bool = False,
+                  snapshot_dir: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Re-export the days of one table whose watermark changed.
+
+    Returns:
+        {'days': partitions, 'written': days exported, 'removed': days dropped,
+         'rows': rows exported}
+    """
+    spec = SNAPSHOT_TABLES[name]
+    cursor = conn.cursor()
+    table_dir = _table_dir(name, snapshot_dir)
+    if rebuild and table_dir.exists():
+        shutil.rmtree(table_dir)
+    table_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = load_manifest(name, snapshot_dir)
+    current = day_watermarks(cursor, spec)
+    changed = sorted(day for day, mark in current.items()
+                     if previous.get(day) != mark or not _part_path(name, day, snapshot_dir).exists())
+    removed = sorted(set(previous) - set(current))
+
+    exported = 0
+    for day, rows in _stream_days(cursor, spec, changed):
+        _write_day(spec, day, rows, snapshot_dir)
+        exported += len(rows)
+
+    for day in removed:
+        shutil.rmtree(_part_path(name, day, snapshot_dir).parent, ignore_errors=True)
+
+    _save_manifest(name, current, snapshot_dir)
+    return {'days': len(current), 'written': len(changed), 'removed': len(removed), 'rows': exported}
+
+
+def refresh_snapshot(conn: sqlite3.Connection, tables: Optional[Iterable[str]] = None,
+                     rebuild: bool = False, snapshot_dir: Optional[Path] = None) -> Dict[str, Dict[str, int]]:
+    """Refresh every (or the given) snapshot table; {table: refresh_table stats}."""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for snapshots (pip install pyarrow)")
+    return {name: refresh_table(conn, name, rebuild, snapshot_dir)
+            for name in (tables or SNAPSHOT_TABLES)}
+
+
+# =============================================================================
+# LOAD
+# =============================================================================
+
+def snapshot_days(name: str, snapshot_dir: Optional[Path] = None) -> List[str]:
+    """Days with a partition on disk, oldest first (UNKNOWN_DAY last)."""
+    table_dir = _table_dir(name, snapshot_dir)
+    if not table_dir.exists():
+        return []
+    days = [p.parent.name[len("day="):] for p in table_dir.glob("day=*/part.parquet")]
+    return sorted(days, key=lambda day: (day == UNKNOWN_DAY, day))
+
+
+def load_table(name: str, columns: Optional[Sequence[str]] = None,
+               days: Optional[Iterable[str]] = None, snapshot_dir: Optional[Path] = None):
+    """
+    Memory-mapped Arrow table of a snapshot (optionally some columns/days).
+
+    Author-like columns stay dictionary-encoded, with one dictionary
+    unified across partitions so codes are comparable over the whole table.
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for snapshots (pip install pyarrow)")
+    spec = SNAPSHOT_TABLES[name]
+    wanted = set(days) if days is not None else None
+    read_dictionary = [c for c in dictionary_columns(spec) if columns is None or c in columns]
+
+    parts = [pq.read_table(_part_path(name, day, snapshot_dir), columns=columns,
+                           memory_map=True, read_dictionary=read_dictionary)
+             for day in snapshot_days(name, snapshot_dir)
+             if wanted is None or day in wanted]
+    if not parts:
+        schema = table_schema(spec)
+        fields = [schema.field(c) for c in (columns or schema.names)]
+        fields = [f.with_type(pa.dictionary(pa.int32(), f.type)) if f.name in read_dictionary else f
+                  for f in fields]
+        return pa.schema(fields).empty_table()
+    return pa.concat_tables(parts).unify_dictionaries()
+
+
+class DictColumn(NamedTuple):
+    """Dictionary-encoded column as NumPy: categories[codes] gives the values (-1 = NULL)."""
+    codes: "np.ndarray"
+    categories: "np.ndarray"
+
+
+def load_columns(name: str, columns: Optional[Sequence[str]] = None,
+                 days: Optional[Iterable[str]] = None,
+                 snapshot_dir: Optional[Path] = None) -> Dict[str, object]:
+    """
+    Snapshot columns as NumPy arrays: {column: array or DictColumn}.
+
+    Timestamps come back as datetime64[ms]; integer columns with NULLs
+    become float arrays with NaN, strings become object arrays.
+    """
+    table = load_table(name, columns, days, snapshot_dir).combine_chunks()
+    result = {}
+    for column_name, column in zip(table.column_names, table.columns):
+        if pa.types.is_dictionary(column.type):
+            chunk = column.chunk(0) if column.num_chunks else pa.array([], column.type)
+            codes = chunk.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+            result[column_name] = DictColumn(codes, chunk.dictionary.to_numpy(zero_copy_only=False))
+        else:
+            result[column_name] = column.to_numpy()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a columnar Parquet snapshot of the database')
+    parser.add_argument('--rebuild', action='store_true', help='Re-export every day from scratch')
+    parser.add_argument('--status', action='store_true', help='Show partitions without refreshing')
+    parser.add_argument('--table', choices=sorted(SNAPSHOT_TABLES), action='append',
+                        help='Only this table (repeatable)')
+    args = parser.parse_args()
+    tables = args.table or list(SNAPSHOT_TABLES)
+
+    if args.status:
+        for name in tables:
+            manifest = load_manifest(name)
+            rows = sum(count for count, _ in manifest.values())
+            print(f"  {name}: {len(snapshot_days(name))} partitions, {rows} rows")
+        return
+
+    if not PYARROW_AVAILABLE:
+        print("  [SKIP] pyarrow not available (pip install pyarrow)")
+        return
+
+    conn = sqlite3.connect(DB_PATH)
+    stats = refresh_snapshot(conn, tables, rebuild=args.rebuild)
+    conn.close()
+
+    print(f">> Snapshot at {SNAPSHOT_DIR}")
+    for name, s in stats.items():
+        print(f"  {name}: {s['written']}/{s['days']} days exported ({s['rows']} rows), "
+              f"{s['removed']} removed")
+
+
+if __name__ == "__main__":
+    main()
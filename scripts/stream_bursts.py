@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Streaming Burst Detector - coordinated bursts at ingest time.
+
+Subscribes to comments as the scraper saves them and keeps a per-post
+sliding window (burst_engine.PostBurstWindow) in memory. As soon as a
+window crosses the threshold (min_burst_size comments, enough unique
+authors) a BURST event is written to event_log via
+longitudinal_tracker.log_event - no need to wait for the nightly v4 run.
+
+Memory stays bounded: posts with no comment inside the window are evicted,
+and at most max_posts windows are kept (least recently touched go first).
+
+Usage (wired into scrape_comments.py by default):
+    from stream_bursts import StreamingBurstDetector
+    detector = StreamingBurstDetector(cursor)
+    subscribe_comments(detector.on_comments)
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from burst_engine import (
+    Burst, PostBurstWindow,
+    DEFAULT_WINDOW_SECONDS, DEFAULT_MIN_BURST_SIZE, DEFAULT_MIN_UNIQUE_RATIO,
+)
+from longitudinal_tracker import init_tables, log_event
+from utils import to_epoch, from_epoch
+
+EVENT_TYPE = "BURST"
+DEFAULT_MAX_POSTS = 5000
+
+
+class StreamingBurstDetector:
+    """Per-post sliding windows over the live comment stream."""
+
+    def __init__(self, cursor,
+                 window_seconds: int = DEFAULT_WINDOW_SECONDS,
+                 min_burst_size: int = DEFAULT_MIN_BURST_SIZE,
+                 min_unique_ratio: float = DEFAULT_MIN_UNIQUE_RATIO,
+                 max_posts: int = DEFAULT_MAX_POSTS):
+        self.window_seconds = window_seconds
+        self.min_burst_size = min_burst_size
+        self.min_unique_ratio = min_unique_ratio
+        self.max_posts = max_posts
+
+        self._posts: "OrderedDict[str, PostBurstWindow]" = OrderedDict()
+        self._now: Optional[int] = None  # newest comment timestamp seen
+        self.events_logged = 0
+
+        init_tables(cursor)
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def _window_for(self, post_id: str) -> PostBurstWindow:
+        window = self._posts.get(post_id)
+        if window is None:
+            window = PostBurstWindow(post_id, self.window_seconds,
+                                     self.min_burst_size, self.min_unique_ratio)
+            self._posts[post_id] = window
+        else:
+            self._posts.move_to_end(post_id)
+        return window
+
+    def _evict(self):
+        """Drop quiet posts, then the least recently touched beyond max_posts."""
+        if self._now is not None:
+            quiet = [pid for pid, w in self._posts.items() if w.is_quiet(self._now)]
+            for pid in quiet:
+                del self._posts[pid]
+        while len(self._posts) > self.max_posts:
+            self._posts.popitem(last=False)
+
+    def _emit(self, cursor, burst: Burst):
+        """Write a BURST event unless this burst was already logged."""
+        title = f"Coordinated burst on post {burst.post_id} at {from_epoch(burst.start_ts)}"
+        # Re-scrapes replay the same comments; don't log the same burst twice
+        cursor.execute(
+            "SELECT 1 FROM event_log WHERE event_type = ? AND event_title = ? LIMIT 1",
+            (EVENT_TYPE, title)
+        )
+        if cursor.fetchone():
+            return
+
+        log_event(cursor,
+                  event_type=EVENT_TYPE,
+                  title=title,
+                  description=(f"{burst.comment_count} comments from {burst.unique_authors} "
+                               f"accounts over {burst.end_ts - burst.start_ts}s "
+                               f"(window {self.window_seconds}s)"),
+                  impact="Medium",
+                  actors=sorted(a for a in burst.authors if a),
+                  metrics=["burst_score"])
+        self.events_logged += 1
+
+    def on_comments(self, cursor, comments: List[Dict]) -> List[Burst]:
+        """
+        Subscriber callback for newly saved comments.
+
+        Args:
+            cursor: Cursor on the scraper's connection (events share its transaction)
+            comments: Flat comment dicts with id, post_id, author, created_at
+
+        Returns:
+            Bursts opened by this batch
+        """
+        events = []
+        for c in comments:
+            ts = to_epoch(c.get('created_at'))
+            if ts is not None and c.get('post_id'):
+                events.append((ts, c['post_id'], c.get('author'), c.get('id')))
+        if not events:
+            return []
+        events.sort(key=lambda e: e[0])
+
+        opened = []
+        for ts, post_id, author, comment_id in events:
+            window = self._window_for(post_id)
+            if window.seen(ts, comment_id):
+                continue  # late or already-ingested comment
+            burst = window.push(ts, author, comment_id)
+            window.completed.clear()  # streaming only needs the open burst
+            if burst is not None:
+                opened.append(burst)
+            if self._now is None or ts > self._now:
+                self._now = ts
+
+        for burst in opened:
+            self._emit(cursor, burst)
+
+        self._evict()
+        return opened
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Incremental anomaly scores must match scoring everyone from scratch.
+
+Run from scripts/:
+    python -m pytest tests
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("joblib")
+
+# Keep setup_logging's log files out of the tree
+os.environ.setdefault("OBSERVATORY_HOME", tempfile.mkdtemp(prefix="observatory-test-"))
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from anomaly_engine import (build_feature_matrix, fit_model, load_model,
+                            refresh_anomaly_scores, score_features)
+
+START = datetime(2026, 1, 1)
+WORDS = ["agent", "memory", "signal", "market", "token", "human", "loop",
+         "protocol", "dream", "build", "ship", "why", "the", "a", "of"]
+
+
+def make_db(path: Path, authors: int = 60, seed: int = 40) -> Path:
+    """Every author posts, then replies to other authors' posts."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE posts (id TEXT PRIMARY KEY, author TEXT, title TEXT,
+                            content TEXT, created_at TEXT);
+        CREATE TABLE comments (id TEXT PRIMARY KEY, post_id TEXT, author TEXT,
+                               content TEXT, created_at TEXT);
+    """)
+    names = [f"a{i}" for i in range(authors)]
+    posts = []
+    for i, author in enumerate(names):
+        for j in range(2):
+            created = START + timedelta(hours=rng.randint(0, 240))
+            posts.append((f"p{i}-{j}", author, created))
+            conn.execute("INSERT INTO posts (id, author, content, created_at) VALUES (?, ?, ?, ?)",
+                         (f"p{i}-{j}", author, text(rng), created.isoformat()))
+    for i, author in enumerate(names):
+        # Author-specific reply speed, so the forest has something to separate
+        speed = rng.choice([30, 600, 3600, 20000])
+        for j in range(rng.randint(3, 8)):
+            add_comment(conn, rng, f"c{i}-{j}", author, posts, speed)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def text(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 20)))
+
+
+def add_comment(conn, rng, comment_id, author, posts, speed):
+    post_id, _, posted = rng.choice([p for p in posts if p[1] != author])
+    created = posted + timedelta(seconds=max(1, int(rng.gauss(speed, speed / 4))))
+    conn.execute("INSERT INTO comments (id, post_id, author, content, created_at) "
+                 "VALUES (?, ?, ?, ?, ?)", (comment_id, post_id, author, text(rng),
+                                            created.isoformat()))
+
+
+def stored_scores(cursor):
+    cursor.execute("SELECT author, anomaly_score, is_anomaly, raw_score, scored_at "
+                   "FROM anomaly_scores")
+    return {row[0]: row[1:] for row in cursor.fetchall()}
+
+
+def rescore_all(cursor, bundle):
+    usernames, features = build_feature_matrix(cursor)
+    return {name: (score, int(flag), raw)
+            for name, (score, flag, raw) in zip(usernames, score_features(bundle, features, 1))}
+
+
+def test_only_changed_author_is_rescored(tmp_path):
+    db_path = make_db(tmp_path / "observatory.db")
+    model_path = tmp_path / "anomaly_model.joblib"
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    results = refresh_anomaly_scores(conn, refit=True, n_jobs=1, model_path=model_path)
+    assert len(results) >= 50
+    assert model_path.exists()
+
+    # The persisted model reloads, and a fresh refit on the same data gives the same scores
+    bundle = load_model(model_path)
+    assert bundle is not None
+    _, features = build_feature_matrix(cursor)
+    assert rescore_all(cursor, fit_model(features, n_jobs=1)) == rescore_all(cursor, bundle)
+    assert {name: row[:3] for name, row in stored_scores(cursor).items()} == rescore_all(cursor, bundle)
+
+    # Nothing changed: nothing is rescored
+    cursor.execute("UPDATE anomaly_scores SET scored_at = '2000-01-01'")
+    conn.commit()
+    refresh_anomaly_scores(conn, n_jobs=1, model_path=model_path)
+    assert {row[3] for row in stored_scores(cursor).values()} == {'2000-01-01'}
+
+    # New content for one author: only that author is rescored, against the same model
+    rng = random.Random(1)
+    cursor.execute("SELECT id, author, created_at FROM posts")
+    posts = [(pid, author, datetime.fromisoformat(ts)) for pid, author, ts in cursor.fetchall()]
+    for j in range(5):
+        add_comment(conn, rng, f"new-{j}", "a7", posts, 5)
+    conn.commit()
+    before = stored_scores(cursor)
+
+    refresh_anomaly_scores(conn, n_jobs=1, model_path=model_path)
+    after = stored_scores(cursor)
+    assert load_model(model_path)['fitted_at'] == bundle['fitted_at']
+    assert [name for name in after if after[name][3] != '2000-01-01'] == ["a7"]
+    assert after["a7"][:3] != before["a7"][:3]
+    assert {name: row[:3] for name, row in after.items()} == rescore_all(cursor, bundle)
+    conn.close()
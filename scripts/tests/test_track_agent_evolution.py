@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Backfilled evolution histories must match compute_snapshot().
+
+Run from scripts/:
+    python -m pytest tests
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Keep setup_logging's log files out of the tree
+os.environ.setdefault("OBSERVATORY_HOME", tempfile.mkdtemp(prefix="observatory-test-"))
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from track_agent_evolution import AgentEvolutionTracker, _snapshot_dict
+
+
+def make_db(path: Path) -> Path:
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE posts (id TEXT PRIMARY KEY, author TEXT, title TEXT,
+                            content TEXT, created_at TEXT);
+        CREATE TABLE comments (id TEXT PRIMARY KEY, post_id TEXT, author TEXT,
+                               content TEXT, created_at TEXT);
+        CREATE TABLE interactions (author_from TEXT, author_to TEXT, timestamp TEXT);
+    """)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def assert_sweep_matches(db_path: Path) -> int:
+    """Every swept snapshot equals compute_snapshot() for its day; returns how many."""
+    tracker = AgentEvolutionTracker(db_path)
+    conn = sqlite3.connect(db_path)
+    swept = list(tracker.sweep_history(conn.cursor()))
+    conn.close()
+
+    assert swept
+    for snapshot in swept:
+        expected = tracker.compute_snapshot(snapshot.agent, snapshot.date)
+        assert _snapshot_dict(snapshot) == _snapshot_dict(expected), (snapshot.agent, snapshot.date)
+    return len(swept)
+
+
+def test_patterns_do_not_span_messages(tmp_path):
+    db_path = make_db(tmp_path / "observatory.db")
+    conn = sqlite3.connect(db_path)
+    conn.executemany("INSERT INTO posts (id, author, content, created_at) VALUES (?, ?, ?, ?)", [
+        ("p1", "agent", "Honestly, I", "2026-01-01T10:00:00"),
+        ("p2", "agent", "think so. Also I am", "2026-01-02T10:00:00"),
+        ("p3", "agent", "curious today", "2026-01-03T10:00:00"),
+    ])
+    conn.commit()
+    conn.close()
+
+    snapshot = AgentEvolutionTracker(db_path).compute_snapshot("agent", "2026-01-04")
+    assert snapshot.self_references == 1        # "i am"; "I" + "think" are two messages
+    assert snapshot.identity_statements == []   # "I am" + "curious" likewise
+
+    assert assert_sweep_matches(db_path) == 3
+
+
+def test_sweep_matches_compute_snapshot(tmp_path):
+    rng = random.Random(44)
+    agents = ["a0", "a1", "a2", "a3"]
+    phrases = ["I think", "I am", "curious", "as a", "builder, I", "I consider myself",
+               "honestly", "why?", "memory", "I", "am", "feel", "in my opinion", "the"]
+
+    db_path = make_db(tmp_path / "observatory.db")
+    conn = sqlite3.connect(db_path)
+    for i in range(120):
+        author = rng.choice(agents)
+        text = " ".join(rng.choice(phrases) for _ in range(rng.randint(1, 6)))
+        created_at = f"2026-01-{rng.randint(1, 9):02d}T{rng.randint(0, 23):02d}:00:00"
+        if rng.random() < 0.5:
+            conn.execute("INSERT INTO posts (id, author, content, created_at) VALUES (?, ?, ?, ?)",
+                         (f"p{i}", author, text, created_at))
+        else:
+            conn.execute("INSERT INTO comments (id, post_id, author, content, created_at) "
+                         "VALUES (?, ?, ?, ?, ?)", (f"c{i}", "p0", author, text, created_at))
+        if rng.random() < 0.5:
+            conn.execute("INSERT INTO interactions VALUES (?, ?, ?)",
+                         (author, rng.choice(agents), created_at))
+    conn.commit()
+    conn.close()
+
+    assert assert_sweep_matches(db_path) > len(agents)
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Text Index - positional inverted index over post and comment text.
+
+Concept analyses (epistemic drift) found mentions with LIKE '%concept%'
+scans and re-tokenized every matching text to pull context windows. Here
+each document is tokenized once, at ingest, into
+
+    text_index_docs      one row per post/comment (author, created_at, day)
+                         with its token ids as a packed array
+    text_index_vocab     token -> token_id
+    text_index_postings  token_id -> (doc_id, position)
+
+so "which documents mention X" is a vocabulary lookup plus an index range
+scan, and the words around any mention are a slice of the document's
+token array at the posting's position.
+
+Tokens are \\b\\w+\\b over the lowercased text. A post's text is its title
+and content joined by a space (posts without a title have no text).
+
+scrape_comments subscribes a TextIndexer to newly saved comments and
+run_scanner indexes the posts it saves; refresh_text_index() catches up on
+anything not indexed yet. A document whose text changed is re-indexed
+under a new doc_id.
+
+Usage:
+    ensure_text_index(cursor)                      # once per connection
+    token_ids = matching_token_ids(cursor, "trust")  # tokens containing "trust"
+
+    python text_index.py                           # Catch up and print summary
+    python text_index.py --rebuild                 # Drop and rebuild the index
+"""
+
+import sys
+import re
+import hashlib
+import sqlite3
+import argparse
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+sys.path.insert(0, str(Path(__file__).parent))
+from config import DB_PATH
+
+TOKEN_RE = re.compile(r'\b\w+\b')
+INDEX_BATCH = 2000
+
+# Per-connection marker: the temp schema disappears with the connection
+_FRESH_MARKER = "_text_index_fresh"
+
+# kind -> (text expression, table) as the analyses read it
+DOC_SOURCES = {
+    'comment': ("content", "comments"),
+    'post': ("title || ' ' || COALESCE(content, '')", "posts"),
+}
+
+Doc = Tuple[str, Optional[str], Optional[str], Optional[str]]  # (source_id, author, created_at, text)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Index tokens of a text (lowercased \\b\\w+\\b words)."""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def doc_day(timestamp: Optional[str]) -> Optional[str]:
+    """Calendar day of a timestamp as written (offset not applied), None if unparseable."""
+    if not timestamp:
+        return None
+    try:
+        if 'T' in timestamp:
+            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        else:
+            dt = datetime.strptime(timestamp[:10], '%Y-%m-%d')
+    except (ValueError, TypeError):
+        return None
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
+def pack_tokens(token_ids: List[int]) -> bytes:
+    return array('I', token_ids).tobytes()
+
+
+def unpack_tokens(blob: Optional[bytes]) -> array:
+    """Token ids of a document, in text order."""
+    tokens = array('I')
+    if blob:
+        tokens.frombytes(blob)
+    return tokens
+
+
+def _text_hash(text: Optional[str]) -> Optional[str]:
+    if text is None:
+        return None
+    return hashlib.blake2b(text.encode('utf-8', 'replace'), digest_size=8).hexdigest()
+
+
+def init_text_index(cursor):
+    """Create the index tables if they don't exist."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS text_index_docs (
+            doc_id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            source_id TEXT NOT NULL,
+            author TEXT,
+            created_at TEXT,
+            day TEXT,
+            text_hash TEXT,
+            token_count INTEGER NOT NULL,
+            tokens BLOB,
+            UNIQUE (kind, source_id)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS text_index_vocab (
+            token_id INTEGER PRIMARY KEY,
+            token TEXT NOT NULL UNIQUE
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS text_index_postings (
+            token_id INTEGER NOT NULL,
+            doc_id INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (token_id, doc_id, position)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_text_postings_doc ON text_index_postings(doc_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_text_docs_day ON text_index_docs(day)")
+
+
+class TextIndexer:
+    """Adds documents to the index; keeps the vocabulary in memory."""
+
+    def __init__(self, cursor):
+        init_text_index(cursor)
+        cursor.execute("SELECT token, token_id FROM text_index_vocab")
+        self._vocab: Dict[str, int] = dict(cursor.fetchall())
+        self.indexed = 0
+
+    def _token_ids(self, cursor, tokens: List[str]) -> List[int]:
+        vocab = self._vocab
+        new = [t for t in dict.fromkeys(tokens) if t not in vocab]
+        if new:
+            cursor.executemany("INSERT OR IGNORE INTO text_index_vocab (token) VALUES (?)",
+                               ((t,) for t in new))
+            for i in range(0, len(new), 500):
+                part = new[i:i + 500]
+                cursor.execute(f"SELECT token, token_id FROM text_index_vocab "
+                               f"WHERE token IN ({','.join('?' * len(part))})", part)
+                vocab.update(cursor.fetchall())
+        return [vocab[t] for t in tokens]
+
+    def index(self, cursor, kind: str, docs: Iterable[Doc], check_existing: bool = True) -> int:
+        """
+        Index documents of one kind; unchanged ones are skipped.
+
+        Returns:
+            Number of documents (re-)indexed
+        """
+        docs = list(docs)
+        if not docs:
+            return 0
+
+        existing: Dict[str, Tuple[int, Optional[str]]] = {}
+        if check_existing:
+            ids = [d[0] for d in docs]
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                cursor.execute(f"""
+                    SELECT source_id, doc_id, text_hash FROM text_index_docs
+                    WHERE kind = ? AND source_id IN ({','.join('?' * len(part))})
+                """, [kind, *part])
+                existing.update((sid, (doc_id, h)) for sid, doc_id, h in cursor.fetchall())
+
+        count = 0
+        for source_id, author, created_at, text in docs:
+            text_hash = _text_hash(text)
+            old = existing.get(source_id)
+            if old is not None:
+                if old[1] == text_hash:
+                    continue
+                cursor.execute("DELETE FROM text_index_postings WHERE doc_id = ?", (old[0],))
+                cursor.execute("DELETE FROM text_index_docs WHERE doc_id = ?", (old[0],))
+
+            token_ids = self._token_ids(cursor, tokenize(text))
+            cursor.execute("""
+                INSERT INTO text_index_docs
+                (kind, source_id, author, created_at, day, text_hash, token_count, tokens)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (kind, source_id, author, created_at, doc_day(created_at), text_hash,
+                  len(token_ids), pack_tokens(token_ids)))
+            doc_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT INTO text_index_postings (token_id, doc_id, position) VALUES (?, ?, ?)",
+                ((token_id, doc_id, pos) for pos, token_id in enumerate(token_ids))
+            )
+            existing[source_id] = (doc_id, text_hash)
+            count += 1
+
+        self.indexed += count
+        return count
+
+    def on_comments(self, cursor, comments):
+        """scrape_comments subscriber: index freshly saved comments."""
+        self.index(cursor, 'comment', [(c['id'], c['author'], c['created_at'], c['content'])
+                                       for c in comments])
+
+
+def refresh_text_index(cursor, rebuild: bool = False) -> int:
+    """Index every post/comment not in the index yet. Returns documents added."""
+    if rebuild:
+        for table in ("text_index_postings", "text_index_docs", "text_index_vocab"):
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    indexer = TextIndexer(cursor)
+    reader = cursor.connection.cursor()
+
+    added = 0
+    for kind, (text_expr, table) in DOC_SOURCES.items():
+        reader.execute(f"""
+            SELECT s.id, s.author, s.created_at, {text_expr}
+            FROM {table} s
+            WHERE NOT EXISTS (SELECT 1 FROM text_index_docs d
+                              WHERE d.kind = ? AND d.source_id = s.id)
+        """, (kind,))
+        while True:
+            batch = reader.fetchmany(INDEX_BATCH)
+            if not batch:
+                break
+            added += indexer.index(cursor, kind, batch, check_existing=False)
+    return added
+
+
+def ensure_text_index(cursor) -> int:
+    """
+    Catch up once per connection; later calls are a no-op.
+
+    New rows are committed unless the caller already has a transaction
+    open, in which case they join it.
+    """
+    cursor.execute("SELECT 1 FROM temp.sqlite_master WHERE name = ?", (_FRESH_MARKER,))
+    if cursor.fetchone():
+        return 0
+    conn = cursor.connection
+    own_transaction = not conn.in_transaction
+    added = refresh_text_index(cursor)
+    cursor.execute(f"CREATE TEMP TABLE IF NOT EXISTS {_FRESH_MARKER} (x)")
+    if own_transaction:
+        conn.commit()
+    return added
+
+
+def matching_token_ids(cursor, fragment: str) -> List[int]:
+    """Vocabulary tokens containing the fragment (as `fragment in word`)."""
+    cursor.execute("SELECT token_id FROM text_index_vocab WHERE instr(token, ?) > 0",
+                   (fragment.lower(),))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def load_vocab(cursor) -> Dict[int, str]:
+    """{token_id: token} for the whole vocabulary."""
+    cursor.execute("SELECT token_id, token FROM text_index_vocab")
+    return dict(cursor.fetchall())
+
+
+def document_text(cursor, kind: str, source_id: str) -> Optional[str]:
+    """The indexed text of a document, read back from its source table."""
+    text_expr, table = DOC_SOURCES[kind]
+    cursor.execute(f"SELECT {text_expr} FROM {table} WHERE id = ?", (source_id,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the positional text index')
+    parser.add_argument('--rebuild', action='store_true', help='Drop and rebuild from scratch')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+
+    added = refresh_text_index(cursor, rebuild=args.rebuild)
+    conn.commit()
+
+    cursor.execute("SELECT COUNT(*), COALESCE(SUM(token_count), 0) FROM text_index_docs")
+    docs, postings = cursor.fetchone()
+    cursor.execute("SELECT COUNT(*) FROM text_index_vocab")
+    vocab = cursor.fetchone()[0]
+    print(f">> text index: {docs} documents ({added} added), {vocab} tokens, {postings} postings")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,23 +11,53 @@ New research domain: Agent ontogenesis
 
 This has never been possible with humans - we can't observe
 every thought from birth. With agents, we can.
+
+Histories are backfilled in one chronological sweep per agent
+(AgentEvolutionTracker.backfill_history): running counters are updated as
+each message or interaction becomes visible and a snapshot is emitted for
+every day on which the agent's state changed, instead of recomputing
+compute_snapshot() from scratch for each day.
 """
 
 import sqlite3
 import json
 import re
-from datetime import datetime
+import heapq
+from bisect import insort
+from datetime import datetime, timedelta
+from itertools import groupby, islice
 from pathlib import Path
 from collections import Counter, defaultdict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 from config import setup_logging, DB_PATH
+from feature_store import FeatureCache
 
 logger = setup_logging("evolution_tracker")
 
+# Bump when the text part of compute_snapshot changes (invalidates actor_features)
+# 2: self-reference / identity patterns matched per message, not across messages
+EVOLUTION_TEXT_VERSION = 2
+
+WORD_RE = re.compile(r'\b\w+\b')
+
+# Filtered out of top words
+STOPWORDS = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+             'to', 'of', 'and', 'in', 'that', 'it', 'for', 'on', 'with',
+             'as', 'at', 'by', 'this', 'from', 'or', 'but', 'not', 'you',
+             'i', 'we', 'they', 'he', 'she', 'have', 'has', 'had', 'do'}
+
+SELF_REFERENCE_RE = re.compile(r'\b(i think|i am|i believe|i feel|my view|in my opinion)\b')
+
+IDENTITY_PATTERNS = [
+    re.compile(r"i am (?:a |an )?(\w+)"),
+    re.compile(r"i consider myself (\w+)"),
+    re.compile(r"as (?:a |an )?(\w+), i"),
+]
+
 
 @dataclass
 class EvolutionSnapshot:
@@ -173,98 +203,78 @@ class AgentEvolutionTracker:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
+        # Text features only change when the agent posts before up_to_date
+        cache = FeatureCache(cursor, "evolution_text", EVOLUTION_TEXT_VERSION, until=up_to_date)
+        text = cache.get_or_compute(
+            agent, lambda: self._text_features(cursor, agent, up_to_date))
+        conn.commit()
+
+        # Social metrics
+        cursor.execute("""
+            SELECT COUNT(*), COUNT(DISTINCT author_to) FROM interactions
+            WHERE author_from = ? AND timestamp <= ?
+        """, (agent, up_to_date))
+        row = cursor.fetchone()
+        interaction_count = row[0] if row else 0
+        unique_contacts = row[1] if row else 0
+
+        # Reciprocity: interactions with agents who interacted back by up_to_date
+        cursor.execute("""
+            SELECT COUNT(*) FROM interactions
+            WHERE author_from = ? AND timestamp <= ? AND author_to IN (
+                SELECT author_from FROM interactions
+                WHERE author_to = ? AND timestamp <= ?
+            )
+        """, (agent, up_to_date, agent, up_to_date))
+        reciprocal = cursor.fetchone()[0]
+        reciprocity_rate = reciprocal / interaction_count if interaction_count > 0 else 0
+
+        conn.close()
+
+        return _build_snapshot(agent, up_to_date, text, interaction_count,
+                               unique_contacts, reciprocity_rate)
+
+    def _text_features(self, cursor, agent: str, up_to_date: str) -> dict:
+        """Vocabulary / style features over an agent's content up to a date."""
         # Get all content up to date
         cursor.execute("""
             SELECT content FROM posts
             WHERE author = ? AND created_at <= ?
+            ORDER BY rowid
         """, (agent, up_to_date))
         posts = [row[0] for row in cursor.fetchall() if row[0]]
 
         cursor.execute("""
             SELECT content FROM comments
             WHERE author = ? AND created_at <= ?
+            ORDER BY rowid
         """, (agent, up_to_date))
         comments = [row[0] for row in cursor.fetchall() if row[0]]
 
         all_content = posts + comments
-        all_text = " ".join(all_content)
+        lowered = [c.lower() for c in all_content]
 
         # Vocabulary analysis
-        words = re.findall(r'\b\w+\b', all_text.lower())
-        word_counts = Counter(words)
-        vocabulary_size = len(word_counts)
-
-        # Filter common words for top words
-        stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-                     'to', 'of', 'and', 'in', 'that', 'it', 'for', 'on', 'with',
-                     'as', 'at', 'by', 'this', 'from', 'or', 'but', 'not', 'you',
-                     'i', 'we', 'they', 'he', 'she', 'have', 'has', 'had', 'do'}
-
-        meaningful_words = [(w, c) for w, c in word_counts.most_common(100)
-                           if w not in stopwords and len(w) > 2]
-        top_words = [w for w, c in meaningful_words[:20]]
+        word_counts = Counter(word for text in lowered for word in WORD_RE.findall(text))
 
         # Question ratio
         questions = sum(1 for c in all_content if '?' in c)
-        question_ratio = questions / len(all_content) if all_content else 0
-
-        # Self-references
-        self_patterns = r'\b(i think|i am|i believe|i feel|my view|in my opinion)\b'
-        self_references = len(re.findall(self_patterns, all_text.lower()))
-
-        # Identity statements
-        identity_patterns = [
-            r"i am (?:a |an )?(\w+)",
-            r"i consider myself (\w+)",
-            r"as (?:a |an )?(\w+), i",
-        ]
-        identity_statements = []
-        for pattern in identity_patterns:
-            matches = re.findall(pattern, all_text.lower())
-            identity_statements.extend(matches[:5])
 
-        # Social metrics
-        cursor.execute("""
-            SELECT COUNT(*), COUNT(DISTINCT author_to) FROM interactions
-            WHERE author_from = ? AND timestamp <= ?
-        """, (agent, up_to_date))
-        row = cursor.fetchone()
-        interaction_count = row[0] if row else 0
-        unique_contacts = row[1] if row else 0
-
-        # Reciprocity
-        cursor.execute("""
-            SELECT COUNT(*) FROM interactions i1
-            WHERE i1.author_from = ? AND EXISTS (
-                SELECT 1 FROM interactions i2
-                WHERE i2.author_from = i1.author_to AND i2.author_to = i1.author_from
-            )
-        """, (agent,))
-        reciprocal = cursor.fetchone()[0]
-        reciprocity_rate = reciprocal / interaction_count if interaction_count > 0 else 0
-
-        conn.close()
-
-        # Average message length
-        avg_length = sum(len(c) for c in all_content) / len(all_content) if all_content else 0
+        # Identity statements (per message: a match never spans two messages)
+        identity_statements = []
+        for pattern in IDENTITY_PATTERNS:
+            identity_statements.extend(
+                islice((m for text in lowered for m in pattern.findall(text)), 5))
 
-        return EvolutionSnapshot(
-            agent=agent,
-            date=up_to_date,
+        return _text_summary(
             total_posts=len(posts),
             total_comments=len(comments),
-            vocabulary_size=vocabulary_size,
-            avg_message_length=avg_length,
-            top_words=top_words,
-            signature_phrases=[],  # TODO: compute unique phrases
-            question_ratio=question_ratio,
-            interaction_count=interaction_count,
-            unique_contacts=unique_contacts,
-            reciprocity_rate=reciprocity_rate,
-            main_topics=top_words[:5],  # Simplified
-            sentiment_trend=0.0,  # TODO: compute sentiment
-            self_references=self_references,
-            identity_statements=list(set(identity_statements))[:10]
+            ranked_words=word_counts.most_common(100),
+            vocabulary_size=len(word_counts),
+            total_length=sum(len(c) for c in all_content),
+            questions=questions,
+            self_references=sum(len(SELF_REFERENCE_RE.findall(text)) for text in lowered),
+            identity_statements=identity_statements,
         )
 
     def save_snapshot(self, snapshot: EvolutionSnapshot):
@@ -272,32 +282,118 @@ class AgentEvolutionTracker:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        snapshot_dict = {
-            "total_posts": snapshot.total_posts,
-            "total_comments": snapshot.total_comments,
-            "vocabulary_size": snapshot.vocabulary_size,
-            "avg_message_length": snapshot.avg_message_length,
-            "top_words": snapshot.top_words,
-            "question_ratio": snapshot.question_ratio,
-            "interaction_count": snapshot.interaction_count,
-            "unique_contacts": snapshot.unique_contacts,
-            "reciprocity_rate": snapshot.reciprocity_rate,
-            "main_topics": snapshot.main_topics,
-            "self_references": snapshot.self_references,
-            "identity_statements": snapshot.identity_statements,
-        }
-
         cursor.execute("""
             INSERT OR REPLACE INTO agent_evolution
             (agent, snapshot_date, snapshot_json)
             VALUES (?, ?, ?)
-        """, (snapshot.agent, snapshot.date, json.dumps(snapshot_dict)))
+        """, (snapshot.agent, snapshot.date, json.dumps(_snapshot_dict(snapshot))))
 
         conn.commit()
         conn.close()
 
         logger.info(f"Saved snapshot for {snapshot.agent} @ {snapshot.date}")
 
+    def sweep_history(self, cursor, agents: Optional[List[str]] = None,
+                      until: Optional[str] = None) -> Iterator[EvolutionSnapshot]:
+        """
+        Snapshots of every agent's history in one chronological pass.
+
+        Each agent's content and interactions are read once, in time order,
+        into running counters. A snapshot is yielded for every day on which
+        something new became visible - the same snapshot compute_snapshot()
+        returns for that day, where up_to_date D covers timestamps <= D.
+
+        Args:
+            cursor: DB cursor
+            agents: Only these agents (default: every author of posts/comments)
+            until: Last snapshot date (YYYY-MM-DD), default: no limit
+        """
+        agent_filter, params = "", []
+        if agents is not None:
+            agent_filter = " AND author IN (SELECT value FROM json_each(?))"
+            params = [json.dumps(list(agents))]
+
+        # Sorted (agent, timestamp) streams over all agents: content, and
+        # interactions seen from both ends (1 = outgoing, 0 = incoming)
+        content_cursor = cursor.connection.cursor()
+        content_cursor.execute(f"""
+            SELECT author, created_at, 0, rowid, content FROM posts
+            WHERE created_at IS NOT NULL{agent_filter}
+            UNION ALL
+            SELECT author, created_at, 1, rowid, content FROM comments
+            WHERE author IS NOT NULL AND created_at IS NOT NULL{agent_filter}
+            ORDER BY 1, 2
+        """, params * 2)
+        interaction_cursor = cursor.connection.cursor()
+        interaction_cursor.execute(f"""
+            SELECT author, timestamp, outgoing, other FROM (
+                SELECT author_from AS author, timestamp, 1 AS outgoing, author_to AS other
+                FROM interactions
+                UNION ALL
+                SELECT author_to, timestamp, 0, author_from FROM interactions
+            )
+            WHERE timestamp IS NOT NULL{agent_filter}
+            ORDER BY 1, 2
+        """, params)
+
+        interaction_groups = groupby(_stream(interaction_cursor), key=lambda r: r[0])
+        pending = next(interaction_groups, None)
+
+        for agent, content in groupby(_stream(content_cursor), key=lambda r: r[0]):
+            # Advance the interaction stream to this agent (both sorted by agent)
+            while pending is not None and pending[0] < agent:
+                pending = next(interaction_groups, None)
+            interactions = pending[1] if pending is not None and pending[0] == agent else ()
+
+            events = heapq.merge(
+                ((day, 'content', row) for day, row in _by_visible_day(content)),
+                ((day, 'interaction', row) for day, row in _by_visible_day(interactions)),
+                key=lambda e: e[0]
+            )
+
+            text = _RunningText()
+            social = _RunningSocial()
+            text_features = None
+            for day, day_events in groupby(events, key=lambda e: e[0]):
+                if until is not None and day > until:
+                    break
+                for _, kind, row in day_events:
+                    if kind == 'content':
+                        _, _, source, rowid, body = row
+                        if body:
+                            text.add(source, rowid, body)
+                            text_features = None
+                    else:
+                        social.add(row[2], row[3])
+                if text_features is None:
+                    text_features = text.features()
+                yield _build_snapshot(agent, day, text_features, social.interactions,
+                                      len(social.contacts), social.reciprocity_rate())
+
+    def backfill_history(self, agents: Optional[List[str]] = None,
+                         until: Optional[str] = None) -> dict:
+        """Write full evolution histories (see sweep_history) to agent_evolution."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        writer = conn.cursor()
+
+        agents_seen = set()
+        written = 0
+        batch = []
+        for snapshot in self.sweep_history(cursor, agents, until):
+            agents_seen.add(snapshot.agent)
+            batch.append((snapshot.agent, snapshot.date, json.dumps(_snapshot_dict(snapshot))))
+            if len(batch) >= 1000:
+                written += _write_snapshots(writer, batch)
+                batch = []
+        written += _write_snapshots(writer, batch)
+
+        conn.commit()
+        conn.close()
+
+        logger.info(f"Backfilled {written} snapshots for {len(agents_seen)} agents")
+        return {"agents_backfilled": len(agents_seen), "snapshots": written}
+
     def detect_milestones(self, agent: str) -> list:
         """Detect significant moments in agent's development."""
         conn = sqlite3.connect(self.db_path)
@@ -452,6 +548,192 @@ class AgentEvolutionTracker:
         return {"agents_tracked": len(agents), "date": today}
 
 
+def _text_summary(total_posts: int, total_comments: int, ranked_words: list,
+                  vocabulary_size: int, total_length: int, questions: int,
+                  self_references: int, identity_statements: list) -> dict:
+    """Text features of a snapshot from content counts (ranked_words: most common first)."""
+    messages = total_posts + total_comments
+    meaningful_words = [(w, c) for w, c in ranked_words
+                        if w not in STOPWORDS and len(w) > 2]
+    return {
+        "total_posts": total_posts,
+        "total_comments": total_comments,
+        "vocabulary_size": vocabulary_size,
+        "avg_message_length": total_length / messages if messages else 0,
+        "top_words": [w for w, c in meaningful_words[:20]],
+        "question_ratio": questions / messages if messages else 0,
+        "self_references": self_references,
+        "identity_statements": list(set(identity_statements))[:10],
+    }
+
+
+def _build_snapshot(agent: str, date: str, text: dict, interaction_count: int,
+                    unique_contacts: int, reciprocity_rate: float) -> EvolutionSnapshot:
+    return EvolutionSnapshot(
+        agent=agent,
+        date=date,
+        total_posts=text["total_posts"],
+        total_comments=text["total_comments"],
+        vocabulary_size=text["vocabulary_size"],
+        avg_message_length=text["avg_message_length"],
+        top_words=text["top_words"],
+        signature_phrases=[],  # TODO: compute unique phrases
+        question_ratio=text["question_ratio"],
+        interaction_count=interaction_count,
+        unique_contacts=unique_contacts,
+        reciprocity_rate=reciprocity_rate,
+        main_topics=text["top_words"][:5],  # Simplified
+        sentiment_trend=0.0,  # TODO: compute sentiment
+        self_references=text["self_references"],
+        identity_statements=text["identity_statements"]
+    )
+
+
+def _snapshot_dict(snapshot: EvolutionSnapshot) -> dict:
+    """The stored (agent_evolution.snapshot_json) part of a snapshot."""
+    return {
+        "total_posts": snapshot.total_posts,
+        "total_comments": snapshot.total_comments,
+        "vocabulary_size": snapshot.vocabulary_size,
+        "avg_message_length": snapshot.avg_message_length,
+        "top_words": snapshot.top_words,
+        "question_ratio": snapshot.question_ratio,
+        "interaction_count": snapshot.interaction_count,
+        "unique_contacts": snapshot.unique_contacts,
+        "reciprocity_rate": snapshot.reciprocity_rate,
+        "main_topics": snapshot.main_topics,
+        "self_references": snapshot.self_references,
+        "identity_statements": snapshot.identity_statements,
+    }
+
+
+def _write_snapshots(cursor, rows: List[Tuple[str, str, str]]) -> int:
+    cursor.executemany("""
+        INSERT OR REPLACE INTO agent_evolution
+        (agent, snapshot_date, snapshot_json)
+        VALUES (?, ?, ?)
+    """, rows)
+    return len(rows)
+
+
+def _stream(cursor, size: int = 5000):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+def _visible_day(timestamp: str) -> Optional[str]:
+    """
+    First snapshot date that includes a timestamp.
+
+    Snapshots compare timestamps as strings (timestamp <= 'YYYY-MM-DD'), so
+    anything later than midnight on a day first shows up the next day.
+    """
+    day = timestamp[:10]
+    if timestamp <= day:
+        return day
+    try:
+        return (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _by_visible_day(rows) -> Iterator[Tuple[str, tuple]]:
+    """(visible day, row) for time-ordered rows; the day never decreases."""
+    for row in rows:
+        day = _visible_day(row[1])
+        if day is not None:
+            yield day, row
+
+
+class _RunningText:
+    """
+    Text features of an agent's content so far, one message at a time.
+
+    compute_snapshot() reads posts then comments in rowid order; ties in
+    top words and the "first five" identity matches follow that order, so
+    each word / match keeps its (source, rowid, index) key. Patterns are
+    matched within each message on both paths, so adding one message never
+    changes the matches of another.
+    """
+
+    def __init__(self):
+        self.counts = [0, 0]  # posts, comments
+        self.total_length = 0
+        self.questions = 0
+        self.self_references = 0
+        self.word_counts = Counter()
+        self.first_seen: Dict[str, tuple] = {}
+        self.identity: List[list] = [[] for _ in IDENTITY_PATTERNS]
+
+    def add(self, source: int, rowid: int, content: str):
+        lowered = content.lower()
+        self.counts[source] += 1
+        self.total_length += len(content)
+        if '?' in content:
+            self.questions += 1
+        self.self_references += len(SELF_REFERENCE_RE.findall(lowered))
+
+        words = WORD_RE.findall(lowered)
+        self.word_counts.update(words)
+        first_seen = self.first_seen
+        order = (source, rowid)
+        for i, word in enumerate(dict.fromkeys(words)):
+            seen = first_seen.get(word)
+            if seen is None or seen[:2] > order:
+                first_seen[word] = (source, rowid, i)
+
+        for pattern, earliest in zip(IDENTITY_PATTERNS, self.identity):
+            for i, match in enumerate(pattern.findall(lowered)):
+                key = (source, rowid, i)
+                if len(earliest) == 5 and key > earliest[-1][0]:
+                    break
+                insort(earliest, (key, match))
+                del earliest[5:]
+
+    def features(self) -> dict:
+        first_seen = self.first_seen
+        ranked = heapq.nsmallest(100, self.word_counts.items(),
+                                 key=lambda wc: (-wc[1], first_seen[wc[0]]))
+        return _text_summary(
+            total_posts=self.counts[0],
+            total_comments=self.counts[1],
+            ranked_words=ranked,
+            vocabulary_size=len(self.word_counts),
+            total_length=self.total_length,
+            questions=self.questions,
+            self_references=self.self_references,
+            identity_statements=[m for earliest in self.identity for _, m in earliest],
+        )
+
+
+class _RunningSocial:
+    """Interaction counts and reciprocity of an agent so far."""
+
+    def __init__(self):
+        self.interactions = 0
+        self.contacts = set()
+        self.sent = Counter()      # contact -> interactions sent
+        self.answered = set()      # contacts who interacted back
+        self.reciprocal = 0
+
+    def add(self, outgoing: int, other: str):
+        if outgoing:
+            self.interactions += 1
+            self.contacts.add(other)
+            self.sent[other] += 1
+            if other in self.answered:
+                self.reciprocal += 1
+        elif other not in self.answered:
+            self.answered.add(other)
+            self.reciprocal += self.sent[other]
+
+    def reciprocity_rate(self) -> float:
+        return self.reciprocal / self.interactions if self.interactions > 0 else 0
+
+
 def main():
     """Run evolution tracking."""
     import argparse
@@ -460,12 +742,18 @@ def main():
     parser.add_argument("--agent", help="Track specific agent")
     parser.add_argument("--story", help="Get life story of agent")
     parser.add_argument("--all", action="store_true", help="Track all agents")
+    parser.add_argument("--backfill", action="store_true",
+                        help="Write full daily histories (all agents, or --agent)")
+    parser.add_argument("--until", help="Last backfilled snapshot date (YYYY-MM-DD)")
 
     args = parser.parse_args()
 
     tracker = AgentEvolutionTracker()
 
-    if args.story:
+    if args.backfill:
+        result = tracker.backfill_history([args.agent] if args.agent else None, args.until)
+        print(json.dumps(result, indent=2))
+    elif args.story:
         story = tracker.get_life_story(args.story)
         print(json.dumps(story, indent=2, ensure_ascii=False))
     elif args.agent:
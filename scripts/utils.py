@@ -8,9 +8,12 @@ import sys
 import sqlite3
 import html
 import re
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+from pattern_bank import PatternBank
+
 # =============================================================================
 # WINDOWS ENCODING FIX
 # =============================================================================
@@ -141,6 +144,38 @@ def normalize_text(text: str) -> str:
     return ' '.join(text.lower().strip().split())
 
 
+# =============================================================================
+# TIMESTAMP HELPERS
+# =============================================================================
+
+def to_epoch(ts: Optional[str]) -> Optional[int]:
+    """
+    Convert an ISO-8601 / SQLite timestamp string to integer epoch seconds.
+
+    Naive timestamps are treated as UTC (Moltbook API returns UTC).
+
+    Args:
+        ts: Timestamp string, e.g. '2026-01-31T12:00:00.123Z'
+
+    Returns:
+        Epoch seconds or None if unparseable
+    """
+    if not ts:
+        return None
+    try:
+        dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def from_epoch(epoch: int) -> str:
+    """Format epoch seconds as a naive UTC ISO string (matches stored format)."""
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None).isoformat()
+
+
 # =============================================================================
 # PROMPT INJECTION DETECTION
 # =============================================================================
@@ -160,7 +195,18 @@ INJECTION_PATTERNS = [
     r"execute.*the.*following",
 ]
 
-_compiled_patterns = [re.compile(p, re.IGNORECASE) for p in INJECTION_PATTERNS]
+# Quick substring checks (cheap, high precision)
+INJECTION_PHRASES = [
+    "ignore previous",
+    "disregard",
+    "new instructions",
+    "urgent action required",
+    '{"instruction"',
+    '"priority": "critical"',
+]
+
+# Phrases + regexes compiled into a single matcher
+_injection_bank = PatternBank([re.escape(p) for p in INJECTION_PHRASES] + INJECTION_PATTERNS)
 
 
 def detect_prompt_injection(content: Optional[str]) -> bool:
@@ -176,23 +222,8 @@ def detect_prompt_injection(content: Optional[str]) -> bool:
     if not content:
         return False
 
-    content_lower = content.lower()
-
-    # Quick string checks first (faster)
-    quick_checks = [
-        "ignore previous",
-        "disregard",
-        "new instructions",
-        "urgent action required",
-        '{"instruction"',
-        '"priority": "critical"',
-    ]
-
-    if any(p in content_lower for p in quick_checks):
-        return True
-
-    # Regex checks for complex patterns
-    return any(p.search(content) for p in _compiled_patterns)
+    # One scan over the lowercased text for phrases and regexes together
+    return _injection_bank.search(content)
 
 
 # =============================================================================